@@ -0,0 +1,31 @@
+from contextlib import asynccontextmanager
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from src.core.routes.async_routes import async_routes
+from src.core.services.async_data_service import dispose_async_engine, get_async_engine
+
+
+@asynccontextmanager
+async def lifespan(app):
+    get_async_engine()
+    yield
+    await dispose_async_engine()
+
+
+def create_asgi_app():
+    """
+    Async read API (indicators, time-series, related visualizations, timeline and
+    scenario series) on asyncpg. Serves the same payloads as the Flask app;
+    writes, loading and everything else stay on manage.py.
+
+    uvicorn asgi:app --workers 2
+    """
+    middleware = [
+        Middleware(CORSMiddleware, allow_origins=["http://localhost:3000"], allow_credentials=True,
+                   allow_methods=["*"], allow_headers=["*"])
+    ]
+    return Starlette(routes=async_routes, middleware=middleware, lifespan=lifespan)
+
+
+app = create_asgi_app()
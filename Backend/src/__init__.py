@@ -1,7 +1,2 @@
-from flask import Flask
-app = Flask(__name__)
-
-# Registering blueprints
-from .core.routes.views import core_bp
-
-app.register_blueprint(core_bp)
\ No newline at end of file
+# Package marker only. The app is built by manage.create_app; importing src
+# must stay free of side effects so SOM job worker processes load fast.
@@ -0,0 +1,3 @@
+from .response_cache import ResponseCache
+
+response_cache = ResponseCache()
@@ -0,0 +1,201 @@
+from collections import OrderedDict
+from functools import wraps
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from flask import current_app, request
+from sqlalchemy import text
+from src.core.db import db
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """
+    Caches successful GET/POST responses keyed by route, arguments and the
+    data generation. The loader bumps the generation after every ingest, so
+    entries never outlive the data they were built from.
+
+    Tiers: a size-bounded in-memory LRU per process, plus an optional on-disk
+    tier (RESPONSE_CACHE_DIR) shared by every worker on the host.
+    """
+
+    def __init__(self):
+        self.max_entries = 512
+        self.max_bytes = 64 * 1024 * 1024
+        self.disk_path = None
+        self.generation_check_interval = 1.0
+
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._generation_checked_at = 0.0
+        self._stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+    def init_app(self, app):
+        self.max_entries = app.config.get('RESPONSE_CACHE_SIZE', self.max_entries)
+        self.max_bytes = app.config.get('RESPONSE_CACHE_MAX_BYTES', self.max_bytes)
+        self.disk_path = app.config.get('RESPONSE_CACHE_DIR') or None
+        self.generation_check_interval = app.config.get('RESPONSE_CACHE_GENERATION_CHECK', self.generation_check_interval)
+        if self.disk_path:
+            os.makedirs(self.disk_path, exist_ok=True)
+        app.extensions['response_cache'] = self
+
+    def current_generation(self, force: bool = False) -> int:
+        """Data generation, re-read from the database at most once per check interval"""
+        now = time.monotonic()
+        if not force and now - self._generation_checked_at < self.generation_check_interval:
+            return self._generation
+
+        try:
+            with db.engine.connect() as connection:
+                row = connection.execute(text("SELECT generation FROM data_generation WHERE id = 1")).fetchone()
+            generation = int(row.generation) if row else 0
+        except Exception as e:
+            logger.warning(f"Could not read data generation: {e}")
+            generation = self._generation
+
+        with self._lock:
+            self._generation_checked_at = now
+            if generation != self._generation:
+                self._generation = generation
+                self._entries.clear()
+                self._bytes = 0
+                self._prune_disk(generation)
+        return generation
+
+    def _disk_file(self, generation: int, digest: str) -> str:
+        return os.path.join(self.disk_path, f"{generation}-{digest}.cache")
+
+    def _prune_disk(self, generation: int):
+        if not self.disk_path:
+            return
+        prefix = f"{generation}-"
+        for name in os.listdir(self.disk_path):
+            if name.endswith('.cache') and not name.startswith(prefix):
+                try:
+                    os.remove(os.path.join(self.disk_path, name))
+                except OSError:
+                    pass
+
+    def _read_disk(self, generation: int, digest: str):
+        try:
+            with open(self._disk_file(generation, digest), 'rb') as f:
+                header = json.loads(f.readline())
+                return header['status'], header['mimetype'], f.read()
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _write_disk(self, generation: int, digest: str, entry):
+        status, mimetype, body = entry
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.disk_path, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(json.dumps({'status': status, 'mimetype': mimetype}).encode() + b'\n')
+                f.write(body)
+            # Atomic rename so other workers never read a partial file
+            os.replace(tmp_path, self._disk_file(generation, digest))
+        except OSError as e:
+            logger.warning(f"Could not write response cache file: {e}")
+
+    def _remember(self, digest: str, entry):
+        size = len(entry[2])
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if digest in self._entries:
+                self._bytes -= len(self._entries.pop(digest)[2])
+            self._entries[digest] = entry
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted[2])
+                self._stats['evictions'] += 1
+
+    def get(self, key: str, generation: int):
+        digest = hashlib.sha256(key.encode()).hexdigest()
+
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None:
+                self._entries.move_to_end(digest)
+                self._stats['memory_hits'] += 1
+                return entry
+
+        if self.disk_path:
+            entry = self._read_disk(generation, digest)
+            if entry is not None:
+                self._remember(digest, entry)
+                with self._lock:
+                    self._stats['disk_hits'] += 1
+                return entry
+
+        with self._lock:
+            self._stats['misses'] += 1
+        return None
+
+    def set(self, key: str, entry, generation: int):
+        # A response built before a reload must not be stored under the new generation
+        if generation != self._generation:
+            return
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        self._remember(digest, entry)
+        if self.disk_path:
+            self._write_disk(generation, digest, entry)
+        with self._lock:
+            self._stats['stores'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        self._prune_disk(-1)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._stats['memory_hits'] + self._stats['disk_hits'] + self._stats['misses']
+            hits = lookups - self._stats['misses']
+            return {
+                **self._stats,
+                'hit_ratio': round(hits / lookups, 4) if lookups else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'generation': self._generation,
+                'disk_tier': bool(self.disk_path),
+                'pid': os.getpid()
+            }
+
+    @staticmethod
+    def request_key() -> str:
+        key = f"{request.method} {request.path}?{'&'.join(sorted(request.query_string.decode().split('&')))}"
+        body = request.get_data(cache=True)
+        if body:
+            key += '#' + hashlib.sha256(body).hexdigest()
+        return key
+
+    def cached(self, view):
+        """Serve a view from the cache; only 200 responses are stored"""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            key = self.request_key()
+            generation = self.current_generation()
+            entry = self.get(key, generation)
+            if entry is not None:
+                status, mimetype, body = entry
+                response = current_app.response_class(body, status=status, mimetype=mimetype)
+                response.headers['X-Cache'] = 'HIT'
+                return response
+
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code == 200 and not response.is_streamed:
+                self.set(key, (response.status_code, response.mimetype, response.get_data()), generation)
+            response.headers['X-Cache'] = 'MISS'
+            return response
+        return wrapper
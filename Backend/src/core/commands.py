@@ -0,0 +1,81 @@
+import click
+from src.util.data_loader import (
+    load_csv_data, migrate_value_columns, get_connection, create_indexes, DISABLE_STATEMENT_TIMEOUT
+)
+
+@click.command("load-data")
+@click.option("--full", is_flag=True, help="Rebuild every table instead of only changed CSV chunks.")
+def load_data_command(full):
+    """Reload the tables from the CSV files and swap them in atomically"""
+    load_csv_data(incremental=not full)
+
+@click.command("migrate-values")
+def migrate_values_command():
+    """Backfill observations.value_num and value_status on an existing database"""
+    migrate_value_columns()
+
+@click.command("create-indexes")
+def create_indexes_command():
+    """Create the read-path indexes on an existing database"""
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(DISABLE_STATEMENT_TIMEOUT)
+        create_indexes(cursor)
+        conn.commit()
+    finally:
+        conn.close()
+    click.echo("✅ Indexes created")
+
+@click.command("check-query-plans")
+@click.option("--sqlite", is_flag=True, help="Check against an in-memory SQLite stand-in instead of Postgres.")
+@click.option("--allow-skipped", is_flag=True,
+              help="Do not fail on statements the SQLite stand-in cannot EXPLAIN for reasons other than Postgres-only syntax.")
+def check_query_plans_command(sqlite, allow_skipped):
+    """EXPLAIN every DataService query and fail if any seq-scans observations or cannot be planned"""
+    from src.util.query_plan_check import build_sqlite_standin, check_query_plans
+
+    if sqlite:
+        with build_sqlite_standin().app_context():
+            results = check_query_plans()
+    else:
+        results = check_query_plans()
+
+    for result in results:
+        click.echo(f"[{result['status']:>8}] {result['method']}: {result['statement'][:100]}")
+        for line in result['detail']:
+            click.echo(f"           {line}")
+
+    failing = {'seq_scan', 'error'} if allow_skipped else {'seq_scan', 'error', 'skipped'}
+    failures = [r for r in results if r['status'] in failing]
+    skipped = sum(r['status'] in ('skipped', 'exempt') for r in results)
+    if failures:
+        counts = {status: sum(r['status'] == status for r in failures) for status in sorted(failing)}
+        raise click.ClickException(
+            f"{len(failures)} of {len(results)} queries failed: "
+            + ", ".join(f"{count} {status}" for status, count in counts.items() if count)
+        )
+    checked = len(results) - skipped
+    click.echo(f"✅ {checked} queries checked, no sequential scans on observations"
+               + (f" ({skipped} not planned on this dialect)" if skipped else ""))
+
+# Tokenizer and stop-word data used by the PDF analysis tools
+NLTK_RESOURCES = ('punkt', 'stopwords')
+
+@click.command("setup-nltk")
+@click.option("--download-dir", default=None, help="Target directory (defaults to NLTK's own search path).")
+def setup_nltk_command(download_dir):
+    """Download the NLTK data the PDF tools need (run once per environment)"""
+    import nltk
+
+    failed = [name for name in NLTK_RESOURCES if not nltk.download(name, download_dir=download_dir, quiet=True)]
+    if failed:
+        raise click.ClickException(f"Could not download NLTK resources: {', '.join(failed)}")
+    click.echo(f"✅ NLTK resources ready: {', '.join(NLTK_RESOURCES)}")
+
+def register_commands(app):
+    app.cli.add_command(load_data_command)
+    app.cli.add_command(migrate_values_command)
+    app.cli.add_command(create_indexes_command)
+    app.cli.add_command(check_query_plans_command)
+    app.cli.add_command(setup_nltk_command)
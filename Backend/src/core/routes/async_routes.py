@@ -0,0 +1,104 @@
+import logging
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from src.core.db.engine import pool_stats
+from src.core.services.async_data_service import AsyncDataService, get_async_engine
+from src.util.json_serializer import dumps_bytes
+
+logger = logging.getLogger(__name__)
+
+
+class JsonResponse(JSONResponse):
+    """JSONResponse that encodes with the same serializer as the Flask app's JSON provider"""
+
+    def render(self, content) -> bytes:
+        return dumps_bytes(content, sort_keys=True)
+
+
+def error_response(message: str, e: Exception, status_code: int = 500) -> JsonResponse:
+    return JsonResponse({
+        "status": "error",
+        "message": message,
+        "details": str(e)
+    }, status_code=status_code)
+
+
+async def get_time_series(request):
+    """Get time series data for visualization; ?raw_data=true adds the raw observations"""
+    indicator_id = request.path_params["indicator_id"]
+    try:
+        include_raw = request.query_params.get("raw_data", "false").lower() in ("1", "true", "yes")
+        data = await AsyncDataService.get_time_series_data(indicator_id, include_raw=include_raw)
+        return JsonResponse({"status": "success", "data": data})
+    except ValueError as e:
+        logger.error(f"Value error in time series endpoint: {str(e)}")
+        return JsonResponse({
+            "status": "error",
+            "message": f"Invalid indicator: {str(e)}"
+        }, status_code=404)
+    except Exception as e:
+        logger.error(f"Unexpected error in time series endpoint: {str(e)}")
+        return error_response("Internal server error occurred while fetching time series data", e)
+
+
+async def get_indicators(request):
+    """Get all unique indicators"""
+    try:
+        indicators = await AsyncDataService.get_all_indicators()
+        return JsonResponse({"status": "success", "data": indicators, "count": len(indicators)})
+    except Exception as e:
+        logger.error(f"Error in indicators endpoint: {str(e)}")
+        return error_response("Failed to fetch indicators", e)
+
+
+async def get_related_visualizations(request):
+    """Get all visual entities related to a specific indicator"""
+    try:
+        visuals = await AsyncDataService.get_related_visualizations(request.path_params["indicator_id"])
+        return JsonResponse({"status": "success", "data": visuals, "count": len(visuals)})
+    except Exception as e:
+        logger.error(f"Error in related visualizations endpoint: {str(e)}")
+        return error_response("Failed to fetch related visualizations", e)
+
+
+async def get_timeline_series(request):
+    indicator_id = request.path_params["indicator_id"]
+    try:
+        series = await AsyncDataService.get_timeline_series_by_indicator(indicator_id)
+        return JsonResponse({"status": "success", "indicator_id": indicator_id, "timeline_series": series})
+    except Exception as e:
+        logger.error(f"Error in timeline series endpoint: {str(e)}")
+        return error_response("Failed to fetch timeline series", e)
+
+
+async def get_scenario_series(request):
+    document_id = request.query_params.get("document_id")
+    if not document_id:
+        return JsonResponse({"status": "error", "message": "Missing document_id"}, status_code=400)
+    try:
+        scenario_series = await AsyncDataService.get_scenario_series_by_document(document_id)
+        return JsonResponse({"document_id": document_id, "scenario_series": scenario_series, "status": "success"})
+    except Exception as e:
+        logger.error(f"Error in scenario series endpoint: {str(e)}")
+        return error_response("Failed to fetch scenario series", e)
+
+
+async def health_check(request):
+    """API health check"""
+    return JsonResponse({"status": "success", "message": "API is running", "version": "1.0.0"})
+
+
+async def get_pool_stats(request):
+    """asyncpg pool occupancy, checkout counts and wait times for this process"""
+    return JsonResponse({"status": "success", "data": pool_stats(get_async_engine().sync_engine)})
+
+
+async_routes = [
+    Route("/api/time-series/{indicator_id}", get_time_series),
+    Route("/api/indicators", get_indicators),
+    Route("/api/related-visualizations/{indicator_id}", get_related_visualizations),
+    Route("/api/timeline-series/{indicator_id}", get_timeline_series),
+    Route("/api/scenario-series", get_scenario_series),
+    Route("/api/health", health_check),
+    Route("/api/pool-stats", get_pool_stats),
+]
@@ -1,5 +1,5 @@
-
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
+from src.core.cache import response_cache
 from src.util.data_loader import load_csv_data
 
 data_loader_bp = Blueprint("data_loader_bp", __name__)
@@ -7,7 +7,11 @@ data_loader_bp = Blueprint("data_loader_bp", __name__)
 @data_loader_bp.route("/api/load-data", methods=["GET", "POST"])
 def load_data_route():
     try:
-        load_csv_data()
-        return jsonify({"message": "✅ Data loaded successfully!"}), 200
+        # ?mode=full rebuilds every table; the default only reloads changed CSV chunks
+        incremental = request.args.get("mode", "incremental") != "full"
+        tables = load_csv_data(incremental=incremental)
+        # Pick up the new data generation now instead of after the check interval
+        response_cache.current_generation(force=True)
+        return jsonify({"message": "✅ Data loaded successfully!", "tables": tables}), 200
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
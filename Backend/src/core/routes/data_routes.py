@@ -1,18 +1,33 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
 from src.core.services.data_service import DataService
-from sqlalchemy import text
+from src.core.cache import response_cache
 import logging
 import random
 from src.core.db import db
+from src.core.db.engine import pool_stats
+from src.util.keyset import MAX_PAGE_SIZE
 logger = logging.getLogger(__name__)
 data_routes = Blueprint('data_routes', __name__)
 
 @data_routes.route("/api/time-series/<string:indicator_id>")
+@response_cache.cached
 def get_time_series(indicator_id):
-    """Get time series data for visualization"""
+    """
+    Get time series data for visualization.
+    With ?stream=ndjson the rows are streamed one JSON record per line,
+    followed by a summary record holding the chart payloads.
+    Only the precomputed charts are returned unless ?raw_data=true asks for
+    the raw observations as well.
+    """
     try:
         logger.info(f"API request for time series data: indicator_id={indicator_id}")
-        data = DataService.get_time_series_data(indicator_id)
+        if request.args.get("stream") == "ndjson":
+            records = DataService.stream_time_series_data(indicator_id)
+            lines = (current_app.json.dumps(record) + "\n" for record in records)
+            return Response(stream_with_context(lines), mimetype="application/x-ndjson")
+        
+        include_raw = request.args.get("raw_data", "false").lower() in ("1", "true", "yes")
+        data = DataService.get_time_series_data(indicator_id, include_raw=include_raw)
         return jsonify({
             "status": "success",
             "data": data
@@ -31,16 +46,101 @@ def get_time_series(indicator_id):
             "details": str(e)
         }), 500
 
-@data_routes.route("/api/indicators")
-def get_indicators():
-    """Get all unique indicators"""
+# Upper bound on ids per batch request
+MAX_BATCH_INDICATORS = 100
+
+@data_routes.route("/api/time-series/batch", methods=["POST"])
+@response_cache.cached
+def get_time_series_batch():
+    """
+    Get time series data for several indicators in one request.
+    Body: {"indicator_ids": [...], "raw_data": false}; raw_data is optional.
+    """
     try:
-        indicators = DataService.get_all_indicators()
+        payload = request.get_json(silent=True)
+        if not isinstance(payload, dict):
+            return jsonify({
+                "status": "error",
+                "message": "Request body must be a JSON object"
+            }), 400
+        indicator_ids = payload.get("indicator_ids")
+        if (not isinstance(indicator_ids, list) or not indicator_ids
+                or not all(isinstance(i, str) for i in indicator_ids)):
+            return jsonify({
+                "status": "error",
+                "message": "indicator_ids must be a non-empty list of strings"
+            }), 400
+        if len(indicator_ids) > MAX_BATCH_INDICATORS:
+            return jsonify({
+                "status": "error",
+                "message": f"At most {MAX_BATCH_INDICATORS} indicator_ids per request"
+            }), 400
+        include_raw = payload.get("raw_data", False)
+        if not isinstance(include_raw, bool):
+            return jsonify({
+                "status": "error",
+                "message": "raw_data must be a boolean"
+            }), 400
+        
+        logger.info(f"API request for batch time series data: {len(indicator_ids)} indicators")
+        batch = DataService.get_time_series_batch(indicator_ids, include_raw=include_raw)
         return jsonify({
             "status": "success",
-            "data": indicators,
-            "count": len(indicators)
+            "data": batch['series'],
+            "missing": batch['missing']
         })
+    except Exception as e:
+        logger.error(f"Unexpected error in batch time series endpoint: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": "Internal server error occurred while fetching time series data",
+            "details": str(e)
+        }), 500
+
+def page_arguments():
+    """
+    Validated (limit, after) from the query string. Without either the full list
+    is returned, as existing clients expect. Raises ValueError on a bad limit;
+    malformed cursors raise ValueError in the service.
+    """
+    limit = request.args.get("limit")
+    after = request.args.get("after")
+    if limit is not None:
+        if not limit.isdigit() or not 1 <= int(limit) <= MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be an integer between 1 and {MAX_PAGE_SIZE}")
+        limit = int(limit)
+    elif after is not None:
+        limit = MAX_PAGE_SIZE
+    return limit, after
+
+def page_response(page):
+    return jsonify({
+        "status": "success",
+        "data": page["data"],
+        "count": len(page["data"]),
+        "next_cursor": page["next_cursor"]
+    })
+
+def bad_page_request(e):
+    return jsonify({"status": "error", "message": str(e)}), 400
+
+@data_routes.route("/api/indicators")
+@response_cache.cached
+def get_indicators():
+    """
+    Get unique indicators. Optional filters: document_id, domain.
+    Keyset pagination: ?limit=N, then ?after=<next_cursor> for the next page.
+    """
+    try:
+        limit, after = page_arguments()
+        page = DataService.list_indicators(
+            limit, after,
+            document_id=request.args.get("document_id"),
+            domain=request.args.get("domain")
+        )
+        return page_response(page)
+    except ValueError as e:
+        return bad_page_request(e)
     except Exception as e:
         logger.error(f"Error in indicators endpoint: {str(e)}")
         return jsonify({
@@ -50,6 +150,7 @@ def get_indicators():
         }), 500
 
 @data_routes.route("/api/related-visualizations/<string:indicator_id>")
+@response_cache.cached
 def get_related_visualizations(indicator_id):
     """Get all visual entities related to a specific indicator"""
     try:
@@ -71,11 +172,24 @@ def get_related_visualizations(indicator_id):
 def get_dashboard_summary():
     """Get dashboard summary statistics"""
     try:
-        summary = DataService.get_dashboard_summary()
-        return jsonify({
+        summary = DataService.get_dashboard_summary(debug=current_app.debug)
+        # Content-based ETag: unchanged summaries revalidate with 304 Not Modified.
+        # Debug timings change on every request, so they are left out of the hash.
+        timings = summary.pop("timings", None)
+        response = jsonify({
             "status": "success",
             "data": summary
         })
+        response.add_etag()
+        if timings is not None:
+            etag, _ = response.get_etag()
+            response = jsonify({
+                "status": "success",
+                "data": {**summary, "timings": timings}
+            })
+            response.set_etag(etag)
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
     except Exception as e:
         logger.error(f"Error in dashboard summary endpoint: {str(e)}")
         return jsonify({
@@ -93,23 +207,35 @@ def health_check():
         "version": "1.0.0"
     })
 
+@data_routes.route("/api/cache-stats")
+def get_cache_stats():
+    """Response cache hit/miss counters for this worker"""
+    return jsonify({
+        "status": "success",
+        "data": response_cache.stats()
+    })
+
+@data_routes.route("/api/pool-stats")
+def get_pool_stats():
+    """Connection pool occupancy, checkout counts and wait times for this worker"""
+    return jsonify({
+        "status": "success",
+        "data": pool_stats(db.engine)
+    })
+
 @data_routes.route("/api/documents")
+@response_cache.cached
 def get_documents():
-    """Get all documents"""
+    """
+    Get documents ordered by title. Optional filter: domain.
+    Keyset pagination: ?limit=N, then ?after=<next_cursor> for the next page.
+    """
     try:
-        query = """
-        SELECT document_id, title, domain, source 
-        FROM documents
-        ORDER BY title
-        """
-        with db.engine.connect() as connection:
-            result = connection.execute(text(query))
-            documents = [dict(row._mapping) for row in result]
-            return jsonify({
-                "status": "success",
-                "data": documents,
-                "count": len(documents)
-            })
+        limit, after = page_arguments()
+        page = DataService.list_documents(limit, after, domain=request.args.get("domain"))
+        return page_response(page)
+    except ValueError as e:
+        return bad_page_request(e)
     except Exception as e:
         logger.error(f"Error fetching documents: {str(e)}")
         return jsonify({
@@ -119,23 +245,23 @@ def get_documents():
         }), 500
 
 @data_routes.route("/api/visual-entities")
+@response_cache.cached
 def get_visual_entities():
-    """Get all visual entities"""
+    """
+    Get visual entities ordered by type. Optional filters: type, document_id, domain.
+    Keyset pagination: ?limit=N, then ?after=<next_cursor> for the next page.
+    """
     try:
-        query = """
-        SELECT v.visual_id, v.type, v.document_id, d.title as document_title
-        FROM visual_entities v
-        JOIN documents d ON v.document_id = d.document_id
-        ORDER BY v.type
-        """
-        with db.engine.connect() as connection:
-            result = connection.execute(text(query))
-            visuals = [dict(row._mapping) for row in result]
-            return jsonify({
-                "status": "success",
-                "data": visuals,
-                "count": len(visuals)
-            })
+        limit, after = page_arguments()
+        page = DataService.list_visual_entities(
+            limit, after,
+            visual_type=request.args.get("type"),
+            document_id=request.args.get("document_id"),
+            domain=request.args.get("domain")
+        )
+        return page_response(page)
+    except ValueError as e:
+        return bad_page_request(e)
     except Exception as e:
         logger.error(f"Error fetching visual entities: {str(e)}")
         return jsonify({
@@ -172,6 +298,7 @@ def get_story_data(story):
     
 
 @data_routes.route("/api/timeline-series/<indicator_id>", methods=["GET"])
+@response_cache.cached
 def get_timeline_series(indicator_id):
     try:
         series = DataService.get_timeline_series_by_indicator(indicator_id)
@@ -188,6 +315,7 @@ def get_timeline_series(indicator_id):
             "details": str(e)
         }), 500
 @data_routes.route("/api/scenario-series", methods=["GET"])
+@response_cache.cached
 def get_scenario_series():
     try:
         document_id = request.args.get("document_id")
@@ -0,0 +1,224 @@
+from flask import Blueprint, Response, jsonify, request
+from src.core.services.kohonen_service import (
+    KohonenService, DEFAULT_MAP_SIZE, DEFAULT_ITERATIONS, DEFAULT_ENGINE, SOM_ENGINES, DEFAULT_ENSEMBLE_SIZE,
+    DEFAULT_IMAGE_SIZE, MAP_COLORMAPS
+)
+from src.core.services.som_image import IMAGE_FORMATS, image_cache
+from src.core.services.som_registry import som_registry
+from src.core.services.som_jobs import som_jobs
+import logging
+logger = logging.getLogger(__name__)
+kohonen_routes = Blueprint('kohonen_routes', __name__)
+
+# Upper bounds on request-supplied map parameters
+MAX_MAP_SIDE = 50
+MAX_ITERATIONS = 100000
+MAX_ENSEMBLE_SIZE = 16
+MAX_IMAGE_SIZE = 2048
+
+def som_arguments(source):
+    """
+    Validated (map_size, iterations, engine) from query args or a JSON body.
+    map_size is [rows, cols] in a body, or rows= / cols= in the query string.
+    Raises ValueError on anything out of range.
+    """
+    map_size = source.get("map_size") or [source.get("rows", DEFAULT_MAP_SIZE[0]), source.get("cols", DEFAULT_MAP_SIZE[1])]
+    iterations = source.get("iterations", DEFAULT_ITERATIONS)
+    engine = source.get("engine", DEFAULT_ENGINE)
+    try:
+        rows, cols = (int(side) for side in map_size)
+        iterations = int(iterations)
+    except (TypeError, ValueError):
+        raise ValueError("map_size and iterations must be integers")
+    if not (2 <= rows <= MAX_MAP_SIDE and 2 <= cols <= MAX_MAP_SIDE):
+        raise ValueError(f"map sides must be between 2 and {MAX_MAP_SIDE}")
+    if not 1 <= iterations <= MAX_ITERATIONS:
+        raise ValueError(f"iterations must be between 1 and {MAX_ITERATIONS}")
+    if engine not in SOM_ENGINES:
+        raise ValueError(f"engine must be one of {', '.join(SOM_ENGINES)}")
+    return (rows, cols), iterations, engine
+
+# HTTP status for service results other than success (anything else is a 500)
+SOM_ERROR_STATUS = {"pending": 202, "busy": 429}
+
+def som_response(result):
+    if result.get("status") == "success":
+        return jsonify(result), 200
+    return jsonify(result), SOM_ERROR_STATUS.get(result.get("status"), 500)
+
+@kohonen_routes.route("/api/kohonen/analysis")
+def get_kohonen_analysis():
+    """SOM analysis of countries × indicators; optional rows, cols, iterations, engine"""
+    try:
+        map_size, iterations, engine = som_arguments(request.args)
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    return som_response(KohonenService.get_kohonen_analysis(map_size, iterations, engine))
+
+@kohonen_routes.route("/api/kohonen/ensemble")
+def get_kohonen_ensemble():
+    """
+    Multi-seed SOM analysis: the best of ?models=K maps (default 4) plus
+    co-clustering and per-country stability; same map parameters as /analysis.
+    Untrained maps are queued as background jobs and the response is 202
+    with those jobs; repeat the request once they have finished.
+    """
+    try:
+        map_size, iterations, engine = som_arguments(request.args)
+        ensemble_size = request.args.get("models", str(DEFAULT_ENSEMBLE_SIZE))
+        if not ensemble_size.isdigit() or not 2 <= int(ensemble_size) <= MAX_ENSEMBLE_SIZE:
+            raise ValueError(f"models must be an integer between 2 and {MAX_ENSEMBLE_SIZE}")
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    return som_response(KohonenService.get_kohonen_ensemble(map_size, iterations, engine, int(ensemble_size)))
+
+@kohonen_routes.route("/api/kohonen/visualization")
+def get_kohonen_visualization():
+    """
+    U-matrix (map_type=distance) or hit map (map_type=hit) as a base64 PNG in
+    JSON; /api/kohonen/map/<map_type>.png serves the same image as binary
+    """
+    map_type = request.args.get("map_type", "distance")
+    if map_type not in ("distance", "hit"):
+        return jsonify({"status": "error", "message": "map_type must be 'distance' or 'hit'"}), 400
+    try:
+        map_size, iterations, engine = som_arguments(request.args)
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+
+    image = KohonenService.generate_som_visualization(map_type, map_size, iterations, engine)
+    if image is None:
+        return jsonify({
+            "status": "error",
+            "message": "Failed to generate SOM visualization"
+        }), 500
+    return jsonify({
+        "status": "success",
+        "map_type": map_type,
+        "image": image
+    })
+
+@kohonen_routes.route("/api/kohonen/map/<string:map_type>.<string:image_format>")
+def get_kohonen_map_image(map_type, image_format):
+    """
+    U-matrix (/map/distance.png) or hit map (/map/hit.png) as a binary image;
+    .webp works when Pillow is installed. Optional size (longer side in
+    pixels) plus the /analysis map parameters. The ETag names the trained
+    model, so clients revalidate with If-None-Match and get 304 until the
+    data is reloaded.
+    """
+    if map_type not in MAP_COLORMAPS:
+        return jsonify({"status": "error", "message": "map_type must be 'distance' or 'hit'"}), 400
+    if image_format not in IMAGE_FORMATS:
+        return jsonify({"status": "error", "message": f"format must be one of {', '.join(IMAGE_FORMATS)}"}), 400
+    try:
+        map_size, iterations, engine = som_arguments(request.args)
+        size = request.args.get("size", str(DEFAULT_IMAGE_SIZE))
+        if not size.isdigit() or not 16 <= int(size) <= MAX_IMAGE_SIZE:
+            raise ValueError(f"size must be an integer between 16 and {MAX_IMAGE_SIZE}")
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+
+    try:
+        rendered = KohonenService.render_som_map(map_type, map_size, iterations, engine, int(size), image_format)
+    except ImportError:
+        return jsonify({"status": "error", "message": "WebP output needs Pillow; request .png instead"}), 501
+    except Exception as e:
+        logger.error(f"Error rendering SOM {map_type} map: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": "Failed to render SOM map",
+            "details": str(e)
+        }), 500
+    if rendered is None:
+        return jsonify({"status": "error", "message": "Insufficient data for SOM analysis"}), 404
+
+    body, etag = rendered
+    response = Response(body, mimetype=f"image/{image_format}")
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    response.cache_control.public = True
+    return response.make_conditional(request)
+
+@kohonen_routes.route("/api/kohonen/retrain", methods=["POST"])
+def retrain_som():
+    """Train (or reuse) the SOM for {"map_size": [rows, cols], "iterations": n, "engine": "online"|"batch"}"""
+    try:
+        map_size, iterations, engine = som_arguments(request.get_json(silent=True) or {})
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    return som_response(KohonenService.retrain_som(map_size, iterations, engine))
+
+@kohonen_routes.route("/api/kohonen/refresh", methods=["POST"])
+def refresh_som():
+    """
+    Update the map for these parameters after a reload by fine-tuning the
+    previous generation's map on the changed countries; same body as /retrain
+    """
+    try:
+        map_size, iterations, engine = som_arguments(request.get_json(silent=True) or {})
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    return som_response(KohonenService.refresh_som(map_size, iterations, engine))
+
+@kohonen_routes.route("/api/kohonen/registry-stats")
+def get_registry_stats():
+    """SOM model registry and rendered-image cache counters for this worker"""
+    return jsonify({
+        "status": "success",
+        "data": som_registry.stats(),
+        "images": image_cache.stats()
+    })
+
+@kohonen_routes.route("/api/kohonen/jobs", methods=["POST"])
+def submit_som_job():
+    """
+    Queue SOM training in the background; same body as /api/kohonen/retrain.
+    Returns 202 with the job; poll /api/kohonen/jobs/<job_id> for progress.
+    """
+    try:
+        map_size, iterations, engine = som_arguments(request.get_json(silent=True) or {})
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+
+    result = KohonenService.submit_training_job(map_size, iterations, engine)
+    if result["status"] == "busy":
+        return jsonify({"status": "error", "message": result["message"]}), 429
+    if result["status"] != "success":
+        return jsonify(result), 500
+    return jsonify(result), 202
+
+@kohonen_routes.route("/api/kohonen/jobs")
+def list_som_jobs():
+    """Recent SOM jobs on this host, whichever worker accepted them, newest first"""
+    return jsonify({
+        "status": "success",
+        "data": som_jobs.list_jobs(),
+        "stats": som_jobs.stats()
+    })
+
+@kohonen_routes.route("/api/kohonen/jobs/<string:job_id>")
+def get_som_job(job_id):
+    """Job status and progress (iterations, or epochs for the batch engine)"""
+    job = som_jobs.get(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": f"Unknown job: {job_id}"}), 404
+    return jsonify({"status": "success", "job": job})
+
+@kohonen_routes.route("/api/kohonen/jobs/<string:job_id>/result")
+def get_som_job_result(job_id):
+    """Kohonen analysis for a finished job; 409 while it is pending or if it did not succeed"""
+    result = KohonenService.get_training_job_result(job_id)
+    if result is None:
+        return jsonify({"status": "error", "message": f"Unknown job: {job_id}"}), 404
+    if result["status"] in ("pending", "stale", "cancelled", "cancelling", "failed"):
+        return jsonify(result), 409
+    return som_response(result)
+
+@kohonen_routes.route("/api/kohonen/jobs/<string:job_id>", methods=["DELETE"])
+def cancel_som_job(job_id):
+    """Cancel a queued job, or ask a running one to stop at its next progress step"""
+    job = som_jobs.cancel(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": f"Unknown job: {job_id}"}), 404
+    return jsonify({"status": "success", "job": job})
@@ -3,22 +3,10 @@ import os
 import uuid
 import json
 import numpy as np
-import pandas as pd
 from datetime import datetime
-import PyPDF2
 import re
-import nltk
-from nltk.tokenize import sent_tokenize, word_tokenize
-from nltk.corpus import stopwords
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 
-# Download NLTK resources (only needed first time)
-try:
-    nltk.download('punkt')
-    nltk.download('stopwords')
-except:
-    pass
+# PyPDF2 is imported on first upload; NLTK data comes from `flask --app manage setup-nltk`
 
 # Create blueprint for PDF routes
 pdf_bp = Blueprint('pdf', __name__, url_prefix='/api/pdf')
@@ -137,6 +125,8 @@ def generate_cross_pdf_story():
 
 def extract_pdf_content(filepath):
     """Extract text and metadata from PDF"""
+    import PyPDF2
+
     text = ""
     metadata = {}
     
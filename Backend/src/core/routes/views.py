@@ -2,8 +2,6 @@ from flask import Flask, Blueprint, request, jsonify
 from flask_cors import CORS
 import os
 import uuid
-from gtts import gTTS
-import requests
 import re
 import json
 
@@ -37,6 +35,8 @@ PDF_SOURCE_IDS = {
 }
 
 def get_source_id(file_path):
+    import requests
+
     url = "https://api.chatpdf.com/v1/sources/add-file"
     try:
         with open(file_path, 'rb') as f:
@@ -58,6 +58,8 @@ def get_chatwithpdf_by_topic(topic, query):
     return get_chatwithpdf(source_id, query)
 
 def get_chatwithpdf(source_id, query):
+    import requests
+
     url = "https://api.chatpdf.com/v1/chats/message"
     headers = {
         'x-api-key': CHATWITHPDF_API_KEY,
@@ -224,6 +226,7 @@ def generate_podcast():
         cleaned_summary = clean_text(summary)
         filename = f"{uuid.uuid4().hex}.mp3"
         filepath = os.path.join('static', 'audio', filename)
+        from gtts import gTTS
         tts = gTTS(text=cleaned_summary, lang='en', slow=False)
         tts.save(filepath)
 
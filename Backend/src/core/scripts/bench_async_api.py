@@ -0,0 +1,95 @@
+"""
+Load test: the Flask (WSGI) read path vs the asyncpg (ASGI) read path.
+
+Start both servers against the same database, e.g.
+    gunicorn -w 2 --threads 8 -b :5000 "manage:create_app()"
+    uvicorn asgi:app --workers 2 --port 8000
+
+Run from Backend/:
+    python -m src.core.scripts.bench_async_api \
+        --target wsgi=http://localhost:5000 --target asgi=http://localhost:8000 \
+        --concurrency 64 --requests 4000
+
+Every request carries a unique query parameter by default so the WSGI response
+cache does not hide the database work; pass --allow-cache to measure cached reads.
+"""
+import argparse
+import itertools
+import json
+import statistics
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ENDPOINTS = [
+    "/api/time-series/{indicator_id}",
+    "/api/related-visualizations/{indicator_id}",
+    "/api/timeline-series/{indicator_id}",
+    "/api/indicators",
+]
+
+
+def fetch_json(url, timeout=30):
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+def request_paths(base_url, count, allow_cache):
+    """A fixed, reproducible mix of read requests over every known indicator"""
+    indicators = [item["indicator_id"] for item in fetch_json(base_url + "/api/indicators")["data"]]
+    paths = itertools.cycle(
+        endpoint.format(indicator_id=indicator_id)
+        for indicator_id in indicators
+        for endpoint in ENDPOINTS
+    )
+    for n, path in zip(range(count), paths):
+        yield path if allow_cache else f"{path}?bench={n}"
+
+
+def timed_get(url):
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=60) as response:
+            response.read()
+            ok = response.status == 200
+    except Exception:
+        ok = False
+    return time.perf_counter() - started, ok
+
+
+def run(label, base_url, paths, concurrency):
+    urls = [base_url + path for path in paths]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(timed_get, urls))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency * 1000 for latency, _ in results)
+    errors = sum(1 for _, ok in results if not ok)
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"{label:<8} {len(urls) / elapsed:9.1f} req/s   p50 {quantiles[49]:8.1f}ms   "
+          f"p95 {quantiles[94]:8.1f}ms   p99 {quantiles[98]:8.1f}ms   errors {errors}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", action="append", required=True, metavar="LABEL=URL",
+                        help="server to load, e.g. asgi=http://localhost:8000 (repeatable)")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--allow-cache", action="store_true")
+    args = parser.parse_args()
+
+    targets = [target.split("=", 1) for target in args.target]
+    print(f"{args.requests} requests per target, {args.concurrency} concurrent clients")
+    for label, base_url in targets:
+        base_url = base_url.rstrip("/")
+        paths = list(request_paths(base_url, args.requests, args.allow_cache))
+        # Warm the pools so connection setup is not part of the measurement
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            list(pool.map(timed_get, [base_url + path for path in paths[:args.concurrency]]))
+        run(label, base_url, paths, args.concurrency)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Benchmark: multi-pass JSON serialization vs the single-pass response encoder.
+
+Run from Backend/ (no database needed; payloads are synthetic):
+    python -m src.core.scripts.bench_json --map-size 20 --countries 80 --indicators 40 --years 30
+
+The legacy path is what the Kohonen endpoints used before json_serializer:
+convert_for_json walked the payload into plain Python types, json.dumps
+encoded it once as a serialization test, and jsonify encoded it again with
+sorted keys. The single-pass path is dumps_bytes with sorted keys, as used
+by FastJSONProvider, timed with orjson and with the stdlib fallback. All
+outputs must decode to the same document before timings are printed.
+"""
+import argparse
+import json
+import time
+import numpy as np
+import pandas as pd
+import src.util.json_serializer as json_serializer
+from src.core.services.kohonen_service import KohonenService
+from src.core.services.som_registry import SomModelKey
+from src.core.services.som_training import train_som_model
+
+
+def legacy_clean(obj):
+    if obj is None:
+        return None
+    elif isinstance(obj, (np.integer, np.int64, np.int32)):
+        return int(obj)
+    elif isinstance(obj, (np.floating, np.float64, np.float32)):
+        if np.isnan(obj) or np.isinf(obj):
+            return None
+        return float(obj)
+    elif isinstance(obj, np.bool_):
+        return bool(obj)
+    elif isinstance(obj, np.ndarray):
+        return [legacy_clean(item) for item in obj.tolist()]
+    elif isinstance(obj, (pd.Series, pd.Index)):
+        return [legacy_clean(item) for item in obj.tolist()]
+    elif isinstance(obj, pd.DataFrame):
+        return [legacy_clean(row) for row in obj.to_dict('records')]
+    elif isinstance(obj, dict):
+        return {str(key): legacy_clean(value) for key, value in obj.items()}
+    elif isinstance(obj, (list, tuple)):
+        return [legacy_clean(item) for item in obj]
+    elif pd.isna(obj):
+        return None
+    else:
+        return obj
+
+
+def legacy_encode(payload) -> bytes:
+    clean = legacy_clean(payload)
+    json.dumps(clean)
+    return json.dumps(clean, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+
+def som_payload(map_size: int, countries: int, indicators: int) -> dict:
+    """Kohonen analysis + ensemble payload built by the service from a synthetic matrix"""
+    rng = np.random.default_rng(42)
+    centres = np.repeat(rng.normal(size=(5, indicators)) * 2, -(-countries // 5), axis=0)[:countries]
+    matrix = pd.DataFrame((centres + rng.normal(size=(countries, indicators))).astype(np.float32),
+                          index=[f"Country {i}" for i in range(countries)],
+                          columns=[f"Indicator {j}" for j in range(indicators)])
+    normalized_data, names, columns, pivot_df = KohonenService.prepare_som_matrix(matrix)
+    key = SomModelKey(1, map_size, map_size, 1000, 1.0, 0.5, 42, 'batch')
+    som = train_som_model(normalized_data, (map_size, map_size), 50, 1.0, 0.5, 42, 'batch')
+    data = KohonenService.build_analysis_data(som, (normalized_data, names, columns, pivot_df), key, True)
+    together = (rng.random((countries, countries)) > 0.5).astype(np.float64)
+    data['ensemble'] = {
+        'co_clustering': np.round(together, 4),
+        'country_stability': dict(zip(names, rng.random(countries))),
+        'mean_stability': np.float64(together.mean())
+    }
+    return {'status': 'success', 'data': data}
+
+
+def time_series_payload(countries: int, years: int) -> dict:
+    """Time-series response with pandas-built line data, as ChartBuilder produces"""
+    rng = np.random.default_rng(7)
+    values = rng.normal(size=(years, countries))
+    values[rng.random(values.shape) < 0.1] = np.nan
+    frame = pd.DataFrame(values, columns=[f"Country {i}" for i in range(countries)])
+    frame.insert(0, 'year', [str(2000 + y) for y in range(years)])
+    raw = frame.melt(id_vars='year', var_name='country', value_name='value')
+    return {
+        'status': 'success',
+        'data': {
+            'line_data': frame.to_dict('records'),
+            'bar_data': [{'name': c, 'country': c, 'value': v} for c, v in frame.iloc[:, 1:].mean().items()],
+            'raw_data': raw.assign(indicator_id='ind01001', unit='percent').to_dict('records'),
+            'countries': frame.columns[1:]
+        }
+    }
+
+
+def timed(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def compare(name, payload, repeat):
+    orjson = json_serializer.orjson
+    legacy_seconds, expected = timed(lambda: legacy_encode(payload), repeat)
+    rows = [('legacy', legacy_seconds, len(expected))]
+    if orjson is not None:
+        seconds, body = timed(lambda: json_serializer.dumps_bytes(payload, sort_keys=True), repeat)
+        assert json.loads(body) == json.loads(expected), "orjson output differs"
+        rows.append(('orjson', seconds, len(body)))
+    json_serializer.orjson = None
+    try:
+        seconds, body = timed(lambda: json_serializer.dumps_bytes(payload, sort_keys=True), repeat)
+    finally:
+        json_serializer.orjson = orjson
+    assert json.loads(body) == json.loads(expected), "stdlib output differs"
+    rows.append(('stdlib', seconds, len(body)))
+
+    print(name)
+    for label, seconds, size in rows:
+        print(f"  {label:<8} {seconds * 1000:10.2f}ms  {size / 1024:9.1f}KB   ({legacy_seconds / seconds:.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--map-size", type=int, default=20)
+    parser.add_argument("--countries", type=int, default=80)
+    parser.add_argument("--indicators", type=int, default=40)
+    parser.add_argument("--years", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    compare(f"SOM analysis + ensemble ({args.map_size}x{args.map_size} map, "
+            f"{args.countries} countries x {args.indicators} indicators)",
+            som_payload(args.map_size, args.countries, args.indicators), args.repeat)
+    compare(f"time series ({args.countries} countries x {args.years} years)",
+            time_series_payload(args.countries, args.years), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Microbenchmark: legacy DataService.is_numeric / safe_float_convert vs numeric_classifier.
+
+Run from Backend/:  python -m src.core.scripts.bench_numeric_classifier [count]
+"""
+import re
+import sys
+import time
+import numpy as np
+from src.util.numeric_classifier import classify_many, parse_float
+
+
+def legacy_is_numeric(value):
+    """Verbatim copy of the original DataService.is_numeric"""
+    if value is None or value == '':
+        return False
+
+    str_value = str(value).strip()
+    non_numeric_patterns = [
+        r'^other$', r'^n/a$', r'^na$', r'^null$', r'^none$',
+        r'^unknown$', r'^not available$', r'^not applicable$',
+        r'^[a-zA-Z]+$'
+    ]
+
+    for pattern in non_numeric_patterns:
+        if re.match(pattern, str_value, re.IGNORECASE):
+            return False
+
+    try:
+        float(str_value)
+        return True
+    except (ValueError, TypeError):
+        return False
+
+
+def legacy_safe_float_convert(value, default=0.0):
+    if legacy_is_numeric(value):
+        try:
+            return float(value)
+        except (ValueError, TypeError):
+            return default
+    return default
+
+
+def synthetic_values(count, seed=42):
+    """Mix of decimals, integers, placeholders and blanks resembling observations.csv"""
+    rng = np.random.default_rng(seed)
+    numbers = np.round(rng.normal(50, 30, count), 2).astype(str)
+    labels = np.array(['n/a', 'other', '', 'not available', 'Germany', '12', '-3.5'], dtype=object)
+    values = numbers.astype(object)
+    swap = rng.random(count) < 0.15
+    values[swap] = labels[rng.integers(0, len(labels), swap.sum())]
+    return values.tolist()
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed:8.3f}s")
+    return result, elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    values = synthetic_values(count)
+    print(f"Classifying {count:,} synthetic values")
+
+    legacy, legacy_time = timed(
+        "legacy is_numeric + safe_float_convert",
+        lambda: [legacy_safe_float_convert(v, None) for v in values]
+    )
+    scalar, scalar_time = timed(
+        "numeric_classifier.parse_float",
+        lambda: [parse_float(v) for v in values]
+    )
+    (floats, mask), batch_time = timed(
+        "numeric_classifier.classify_many",
+        lambda: classify_many(values)
+    )
+
+    expected = np.array([np.nan if v is None else v for v in legacy], dtype=float)
+    assert scalar == legacy, "parse_float disagrees with the legacy implementation"
+    assert np.array_equal(mask, ~np.isnan(expected)), "classify_many mask disagrees"
+    assert np.allclose(floats[mask], expected[mask]), "classify_many values disagree"
+
+    print(f"\nparse_float speedup:   {legacy_time / scalar_time:6.1f}x")
+    print(f"classify_many speedup: {legacy_time / batch_time:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark: per-sample SOM metrics loops vs the single distance-matrix version.
+
+Run from Backend/ (no database needed; maps and samples are synthetic):
+    python -m src.core.scripts.bench_som_metrics --map-size 50 --samples 200 --features 40
+
+The loop version is the one KohonenService used before som_metrics: som.winner
+per sample for BMUs and hits, and a Python double loop over every neuron with
+np.linalg.norm per cell for the second BMU. Both versions must agree on every
+output before timings are printed.
+"""
+import argparse
+import time
+import numpy as np
+from minisom import MiniSom
+from src.core.services.som_metrics import som_metrics
+
+
+def loop_metrics(som, data):
+    rows, cols = som._weights.shape[0], som._weights.shape[1]
+    hit_map = np.zeros((rows, cols))
+    bmu = []
+    for data_point in data:
+        winner = som.winner(data_point)
+        hit_map[winner] += 1
+        bmu.append(winner)
+
+    quantization_error = som.quantization_error(data)
+
+    topographic_error = 0.0
+    for data_point in data:
+        winner = som.winner(data_point)
+        distances = []
+        for i in range(rows):
+            for j in range(cols):
+                if (i, j) != winner:
+                    dist = np.linalg.norm(data_point - som._weights[i, j])
+                    distances.append(((i, j), dist))
+        second_winner = min(distances, key=lambda x: x[1])[0]
+        if abs(winner[0] - second_winner[0]) + abs(winner[1] - second_winner[1]) > 1:
+            topographic_error += 1
+    topographic_error /= len(data)
+
+    return {
+        'bmu': np.array(bmu),
+        'hit_map': hit_map,
+        'quantization_error': float(quantization_error),
+        'topographic_error': float(topographic_error)
+    }
+
+
+def timed(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--map-size", type=int, default=50)
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--features", type=int, default=40)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    data = rng.standard_normal((args.samples, args.features))
+    som = MiniSom(args.map_size, args.map_size, args.features, sigma=1.0, learning_rate=0.5, random_seed=42)
+    som.train(data, args.iterations)
+
+    loop_seconds, expected = timed(lambda: loop_metrics(som, data), 1)
+    vector_seconds, actual = timed(lambda: som_metrics(som._weights, data), args.repeat)
+
+    assert np.array_equal(expected['bmu'], actual['bmu']), "BMUs differ"
+    assert np.array_equal(expected['hit_map'], actual['hit_map']), "hit maps differ"
+    assert np.isclose(expected['quantization_error'], actual['quantization_error']), "quantization errors differ"
+    assert np.isclose(expected['topographic_error'], actual['topographic_error']), "topographic errors differ"
+
+    print(f"{args.map_size}x{args.map_size} map, {args.samples} samples x {args.features} features")
+    print(f"loops       {loop_seconds * 1000:10.1f}ms")
+    print(f"vectorized  {vector_seconds * 1000:10.1f}ms   ({loop_seconds / vector_seconds:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Startup benchmark: import cost of `from manage import create_app; create_app()`.
+
+Run from Backend/ (no database needed; nothing connects during create_app):
+    python -m src.core.scripts.bench_startup --runs 5 --top 15
+
+Each run is a fresh interpreter under `python -X importtime`. The report shows
+the median import total, the slowest modules by cumulative time, and which of
+the lazily imported heavy dependencies were loaded at startup. The exit status
+is non-zero when the median total is over --budget-ms or a lazy dependency is
+imported at startup, so the script can guard cold start in CI.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+STARTUP_CODE = "from manage import create_app; create_app()"
+
+# Median import total allowed for create_app(), in milliseconds
+IMPORT_BUDGET_MS = 1500
+
+# Loaded on first use only; any of these at startup is a regression
+LAZY_MODULES = ('matplotlib', 'seaborn', 'sklearn', 'scipy', 'nltk', 'minisom', 'PyPDF2', 'gtts', 'PIL')
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+
+def import_profile():
+    """
+    One cold start: (wall seconds, {module: (self_us, cumulative_us)}) parsed
+    from the -X importtime report on stderr
+    """
+    env = dict(os.environ, PYTHONPATH=BACKEND_DIR)
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', STARTUP_CODE],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    wall = time.perf_counter() - started
+    if completed.returncode != 0:
+        raise RuntimeError(f"create_app() failed:\n{completed.stderr[-2000:]}")
+
+    modules = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return wall, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    args = parser.parse_args()
+
+    profiles = [import_profile() for _ in range(args.runs)]
+    totals = [sum(self_us for self_us, _ in modules.values()) / 1000 for _, modules in profiles]
+    walls = [wall * 1000 for wall, _ in profiles]
+    total_ms = statistics.median(totals)
+
+    # Slowest modules from the median run
+    _, modules = profiles[totals.index(sorted(totals)[len(totals) // 2])]
+    print(f"create_app() cold start over {args.runs} runs: {len(modules)} modules")
+    print(f"import total  {total_ms:10.1f}ms median   (min {min(totals):.1f}, max {max(totals):.1f})")
+    print(f"process wall  {statistics.median(walls):10.1f}ms median")
+    print(f"\n{'cumulative':>12} {'self':>10}  module")
+    for name, (self_us, cumulative_us) in sorted(modules.items(), key=lambda item: -item[1][1])[:args.top]:
+        print(f"{cumulative_us / 1000:10.1f}ms {self_us / 1000:8.1f}ms  {name}")
+
+    loaded = [name for name in LAZY_MODULES if name in modules]
+    print(f"\nlazy dependencies loaded at startup: {', '.join(loaded) or 'none'}")
+
+    failures = []
+    if total_ms > args.budget_ms:
+        failures.append(f"import total {total_ms:.1f}ms is over the {args.budget_ms:.0f}ms budget")
+    if loaded:
+        failures.append(f"imported at startup: {', '.join(loaded)}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
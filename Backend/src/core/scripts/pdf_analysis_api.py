@@ -4,19 +4,10 @@ import os
 import uuid
 import json
 import numpy as np
-import pandas as pd
 from datetime import datetime
-import PyPDF2
 import re
-import nltk
-from nltk.tokenize import sent_tokenize, word_tokenize
-from nltk.corpus import stopwords
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 
-# Download NLTK resources
-nltk.download('punkt')
-nltk.download('stopwords')
+# NLTK data is fetched once with `flask --app manage setup-nltk`, not on import
 
 app = Flask(__name__)
 CORS(app, resources={r"/*": {"origins": "*"}})
@@ -135,6 +126,8 @@ def generate_cross_pdf_story():
 
 def extract_pdf_content(filepath):
     """Extract text and metadata from PDF"""
+    import PyPDF2
+
     text = ""
     metadata = {}
     
@@ -0,0 +1,142 @@
+from typing import List, Dict
+import asyncio
+import logging
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine
+from src.core.db.engine import async_database_url, async_engine_options
+from src.core.services.data_service import (
+    DataService, ALL_INDICATORS_QUERY, INDICATOR_INFO_QUERY, TIME_SERIES_QUERY, SKIPPED_VALUES_QUERY,
+    SERIES_SUMMARY_QUERY, PERIOD_COUNTRY_MEANS_QUERY, COUNTRY_MEANS_QUERY, PIN_TIME_SERIES_TABLES,
+    RELATED_VISUALIZATIONS_QUERY, TIMELINE_SERIES_QUERY, SCENARIO_SERIES_QUERY
+)
+
+logger = logging.getLogger(__name__)
+
+_engine = None
+
+
+def get_async_engine() -> AsyncEngine:
+    """Process-wide asyncpg engine, created on first use"""
+    global _engine
+    if _engine is None:
+        _engine = create_async_engine(async_database_url(), **async_engine_options())
+    return _engine
+
+
+async def dispose_async_engine():
+    global _engine
+    if _engine is not None:
+        await _engine.dispose()
+        _engine = None
+
+
+class AsyncDataService:
+    """
+    asyncio counterpart of the DataService read path. Runs the same SQL and
+    shapes rows with the same helpers, so both APIs return identical payloads;
+    a slow query only parks a coroutine instead of a worker thread.
+    """
+
+    @staticmethod
+    async def get_all_indicators() -> List[Dict]:
+        """Get unique indicators without duplicates"""
+        try:
+            async with get_async_engine().connect() as connection:
+                result = await connection.execute(text(ALL_INDICATORS_QUERY))
+                indicators = [dict(row._mapping) for row in result]
+
+            logger.info(f"Retrieved {len(indicators)} unique indicators")
+            return indicators
+        except Exception as e:
+            logger.error(f"Error fetching indicators: {str(e)}")
+            raise
+
+    @staticmethod
+    async def get_time_series_data(indicator_id: str, include_raw: bool = False) -> Dict:
+        """
+        Get time series data for specific indicator; rollup-first like
+        DataService.get_time_series_data, with the same SQL, assembly and
+        single pinned transaction
+        """
+        try:
+            params = {'indicator_id': indicator_id}
+            async with get_async_engine().connect() as connection, connection.begin():
+                await AsyncDataService.pin_time_series_tables(connection)
+                indicator_row = (await connection.execute(text(INDICATOR_INFO_QUERY), params)).fetchone()
+                if not indicator_row:
+                    raise ValueError(f"Indicator with ID {indicator_id} not found")
+
+                indicator_info = dict(indicator_row._mapping)
+                rollup = (await AsyncDataService.read_rollups(connection, params)).get(indicator_id)
+                raw_rows, skipped_values = [], []
+                if include_raw or rollup is None:
+                    result = await connection.execute(text(TIME_SERIES_QUERY), params)
+                    raw_rows = [DataService.time_series_row(row) for row in result]
+                if rollup is None:
+                    skipped_result = await connection.execute(text(SKIPPED_VALUES_QUERY), params)
+                    skipped_values = [row.value for row in skipped_result]
+
+            # Chart building is CPU-bound pandas work; keep it off the event loop
+            return await asyncio.to_thread(
+                DataService.assemble_time_series, indicator_info, rollup, raw_rows, skipped_values, include_raw
+            )
+        except Exception as e:
+            logger.error(f"Error fetching time series data: {str(e)}")
+            raise
+
+    @staticmethod
+    async def pin_time_series_tables(connection):
+        """Awaitable DataService.pin_time_series_tables"""
+        try:
+            async with connection.begin_nested():
+                await connection.execute(text(PIN_TIME_SERIES_TABLES))
+        except SQLAlchemyError as e:
+            logger.warning(f"Time-series tables not pinned: {e}")
+
+    @staticmethod
+    async def read_rollups(connection, params: Dict) -> Dict[str, Dict]:
+        """Awaitable DataService.read_rollups for one indicator"""
+        try:
+            async with connection.begin_nested():
+                rows = []
+                for query in (SERIES_SUMMARY_QUERY, PERIOD_COUNTRY_MEANS_QUERY, COUNTRY_MEANS_QUERY):
+                    result = await connection.execute(text(query), params)
+                    rows.append([dict(row._mapping) for row in result])
+        except SQLAlchemyError as e:
+            logger.warning(f"Indicator aggregates unavailable, computing live: {e}")
+            return {}
+        return DataService.group_rollups(*rows)
+
+    @staticmethod
+    async def get_related_visualizations(indicator_id: str) -> List[Dict]:
+        """Get visual entities related to an indicator"""
+        try:
+            async with get_async_engine().connect() as connection:
+                result = await connection.execute(text(RELATED_VISUALIZATIONS_QUERY), {'indicator_id': indicator_id})
+                return [dict(row._mapping) for row in result]
+        except Exception as e:
+            logger.error(f"Error fetching related visuals: {str(e)}")
+            raise
+
+    @staticmethod
+    async def get_timeline_series_by_indicator(indicator_id: str) -> List[Dict]:
+        """Get timeline or scenario series for a specific indicator"""
+        try:
+            async with get_async_engine().connect() as connection:
+                result = await connection.execute(text(TIMELINE_SERIES_QUERY), {'indicator_id': indicator_id})
+                return DataService.build_timeline_series(result.fetchall())
+        except Exception as e:
+            logger.error(f"Error fetching timeline series: {str(e)}")
+            raise
+
+    @staticmethod
+    async def get_scenario_series_by_document(document_id: str) -> Dict[str, List[Dict]]:
+        """Get scenario-series grouped by past, present, future based on country label"""
+        try:
+            async with get_async_engine().connect() as connection:
+                result = await connection.execute(text(SCENARIO_SERIES_QUERY), {'document_id': document_id})
+                return DataService.build_scenario_series(result.fetchall())
+        except Exception as e:
+            logger.error(f"Error fetching scenario series: {str(e)}")
+            raise
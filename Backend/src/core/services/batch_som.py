@@ -0,0 +1,95 @@
+from typing import Callable, Dict, Optional, Tuple
+import logging
+import numpy as np
+from src.core.services.som_metrics import neuron_distances
+
+logger = logging.getLogger(__name__)
+
+# Epochs spent shrinking the neighbourhood before fine-tuning at the final sigma
+ORDERING_EPOCHS = 20
+# Fine-tuning stops once the best quantization error so far has not improved
+# by more than this (relative) for PLATEAU_PATIENCE epochs in a row
+PLATEAU_TOLERANCE = 1e-4
+PLATEAU_PATIENCE = 3
+
+
+def grid_coordinates(rows: int, cols: int) -> np.ndarray:
+    """(row, col) of every neuron in row-major order"""
+    return np.indices((rows, cols)).reshape(2, -1).T.astype(np.float64)
+
+
+def train_batch_som(data: np.ndarray, map_size: Tuple[int, int], max_epochs: int,
+                    sigma: float = 1.0, random_seed: int = 42,
+                    progress: Optional[Callable[[int, int], None]] = None) -> Tuple[np.ndarray, Dict]:
+    """
+    Batch SOM: each epoch finds the BMU of every sample at once, then sets each
+    neuron to the neighbourhood-weighted mean of all samples,
+        w_j = sum_i h(bmu_i, j) x_i / sum_i h(bmu_i, j)
+    with a Gaussian h on the map grid. There is no learning rate.
+
+    The neighbourhood shrinks from half the map's longer side to sigma over
+    ORDERING_EPOCHS, then training continues at sigma until the quantization
+    error plateaus or max_epochs is reached. progress(epoch, max_epochs) is
+    called after every epoch.
+    Returns (weights of shape (rows, cols, n_features), history).
+    """
+    rows, cols = map_size
+    data = np.asarray(data, dtype=np.float64)
+    rng = np.random.default_rng(random_seed)
+
+    # Start from randomly chosen samples so every neuron begins inside the data
+    picks = rng.choice(len(data), size=rows * cols, replace=len(data) < rows * cols)
+    weights = data[picks].copy()
+
+    grid = grid_coordinates(rows, cols)
+    sigma_start = max(float(sigma), max(rows, cols) / 2.0)
+    ordering_epochs = max(1, min(ORDERING_EPOCHS, max_epochs))
+
+    errors = []
+    best = np.inf
+    stalled = 0
+    converged = False
+    for epoch in range(max_epochs):
+        decay = min(epoch / ordering_epochs, 1.0)
+        current_sigma = sigma_start * (sigma / sigma_start) ** decay
+
+        distances = neuron_distances(weights, data)
+        bmu = distances.argmin(axis=1)
+        errors.append(float(distances[np.arange(len(data)), bmu].mean()))
+
+        # Compared against the best error, not the previous one, because at a
+        # fixed sigma the map can settle into a short cycle of BMU assignments
+        if epoch >= ordering_epochs:
+            if errors[-1] < best * (1.0 - PLATEAU_TOLERANCE):
+                best = errors[-1]
+                stalled = 0
+            else:
+                stalled += 1
+            if stalled >= PLATEAU_PATIENCE:
+                converged = True
+                break
+
+        # Sample sums and counts for the neurons that won at least one sample;
+        # only those columns of the neighbourhood matrix contribute
+        winners, slot = np.unique(bmu, return_inverse=True)
+        sums = np.zeros((len(winners), data.shape[1]))
+        np.add.at(sums, slot, data)
+        counts = np.bincount(slot).astype(np.float64)
+
+        squared_grid = ((grid[:, None, :] - grid[None, winners, :]) ** 2).sum(axis=-1)
+        neighbourhood = np.exp(-squared_grid / (2.0 * current_sigma ** 2))
+        numerator = neighbourhood @ sums
+        denominator = neighbourhood @ counts
+        filled = denominator > 1e-12
+        weights[filled] = numerator[filled] / denominator[filled, None]
+        if progress is not None:
+            progress(epoch + 1, max_epochs)
+
+    history = {
+        'epochs': len(errors),
+        'converged': converged,
+        'quantization_errors': errors
+    }
+    logger.info(f"Batch SOM {rows}x{cols}: {history['epochs']} epochs, "
+                f"converged={converged}, quantization error {errors[-1] if errors else 0.0:.4f}")
+    return weights.reshape(rows, cols, data.shape[1]), history
@@ -0,0 +1,213 @@
+from typing import List, Dict
+import logging
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+CHART_COLUMNS = ['period', 'country', 'value', 'visual_id', 'visual_type', 'document_title', 'domain']
+PIE_SLICES = 10
+
+
+class ChartBuilder:
+    """
+    Assembles line, bar and pie chart payloads from observation rows.
+    Every aggregate is computed with grouped pandas operations, so the cost
+    grows linearly with the number of observations.
+    """
+
+    @staticmethod
+    def _present(series: pd.Series) -> pd.Series:
+        """Mask of values that are neither null nor empty strings"""
+        return series.notna() & series.ne('')
+
+    @staticmethod
+    def build_line_data(frame: pd.DataFrame) -> List[Dict]:
+        """One entry per period holding the mean value of every country"""
+        keyed = frame[ChartBuilder._present(frame['period']) & ChartBuilder._present(frame['country'])]
+        if keyed.empty:
+            return []
+
+        means = keyed.groupby(['period', 'country'], sort=True)['value'].mean()
+        return ChartBuilder.line_data_from_means(means)
+
+    @staticmethod
+    def line_data_from_means(means) -> List[Dict]:
+        """Line entries from mean values (Series or dict) keyed and sorted by (period, country)"""
+        line_data = []
+        current = None
+        for (period, country), value in means.items():
+            if current is None or current['year'] != period:
+                current = {'year': period}
+                line_data.append(current)
+            current[country] = float(value)
+        return line_data
+
+    @staticmethod
+    def build_bar_data(frame: pd.DataFrame) -> List[Dict]:
+        """Mean value per country, ordered by country name"""
+        keyed = frame[ChartBuilder._present(frame['country']) & frame['value'].notna()]
+        if keyed.empty:
+            return []
+
+        means = keyed.groupby('country', sort=True)['value'].mean()
+        return ChartBuilder.bar_data_from_means(means)
+
+    @staticmethod
+    def bar_data_from_means(means) -> List[Dict]:
+        """Bar entries from mean values (Series or dict) keyed and sorted by country"""
+        return [
+            {'country': country, 'value': round(float(value), 2), 'name': country}
+            for country, value in means.items()
+        ]
+
+    @staticmethod
+    def build_pie_data(bar_data: List[Dict]) -> List[Dict]:
+        """Largest countries by absolute mean value, zero slices dropped"""
+        if not bar_data:
+            return []
+
+        magnitudes = np.abs(np.fromiter((item['value'] for item in bar_data), dtype=float, count=len(bar_data)))
+        order = np.argsort(-magnitudes, kind='stable')[:PIE_SLICES]
+        return [
+            {'name': bar_data[i]['country'], 'value': float(magnitudes[i])}
+            for i in order
+            if magnitudes[i] != 0
+        ]
+
+    @staticmethod
+    def build_context(frame: pd.DataFrame) -> List[Dict]:
+        """First seen visual context for every distinct visual"""
+        visuals = frame[ChartBuilder._present(frame['visual_id'])].drop_duplicates('visual_id')
+        return [
+            {
+                'visual_type': row.visual_type,
+                'document_title': row.document_title,
+                'domain': row.domain
+            }
+            for row in visuals.itertuples(index=False)
+        ]
+
+    @staticmethod
+    def build(data: List[Dict]) -> Dict:
+        """
+        Build every chart payload for a list of numeric observation rows.
+        Rows must carry float 'value' plus the keys listed in CHART_COLUMNS.
+        """
+        if not data:
+            return {
+                'line_data': [],
+                'bar_data': [],
+                'pie_data': [],
+                'years': [],
+                'countries': [],
+                'context': []
+            }
+
+        frame = pd.DataFrame.from_records(data, columns=CHART_COLUMNS)
+        frame['value'] = frame['value'].astype(float)
+
+        periods = frame.loc[ChartBuilder._present(frame['period']), 'period']
+        years = sorted(periods.unique().tolist())
+
+        bar_data = ChartBuilder.build_bar_data(frame)
+        countries = [item['country'] for item in bar_data]
+
+        return {
+            'line_data': ChartBuilder.build_line_data(frame),
+            'bar_data': bar_data,
+            'pie_data': ChartBuilder.build_pie_data(bar_data) if years else [],
+            'years': years,
+            'countries': countries,
+            'context': ChartBuilder.build_context(frame)
+        }
+
+    @staticmethod
+    def build_from_aggregates(line_means: Dict, bar_means: Dict, years: List, context: List[Dict]) -> Dict:
+        """
+        Build every chart payload from ingest-time rollups instead of raw rows.
+        line_means maps (period, country) and bar_means maps country to the mean
+        value, both in sorted key order.
+        """
+        years = sorted(years)
+        bar_data = ChartBuilder.bar_data_from_means(bar_means)
+        return {
+            'line_data': ChartBuilder.line_data_from_means(line_means),
+            'bar_data': bar_data,
+            'pie_data': ChartBuilder.build_pie_data(bar_data) if years else [],
+            'years': years,
+            'countries': [item['country'] for item in bar_data],
+            'context': context
+        }
+
+
+class ChartAccumulator:
+    """
+    Incremental counterpart of ChartBuilder.build for streamed rows.
+    Each batch is reduced to grouped sums and counts, so memory grows with
+    the number of (period, country) groups rather than with the row count.
+    """
+
+    def __init__(self):
+        self.row_count = 0
+        self.years = set()
+        self.context = {}
+        self.line_totals = None
+        self.bar_totals = None
+
+    @staticmethod
+    def _merge(totals, grouped):
+        """Add one batch of grouped sums and counts to the running totals"""
+        if totals is None or totals.empty:
+            return grouped
+        if grouped.empty:
+            return totals
+        return totals.add(grouped, fill_value=0)
+
+    def add(self, rows: List[Dict]):
+        if not rows:
+            return
+        self.row_count += len(rows)
+
+        frame = pd.DataFrame.from_records(rows, columns=CHART_COLUMNS)
+        frame['value'] = frame['value'].astype(float)
+        has_period = ChartBuilder._present(frame['period'])
+        has_country = ChartBuilder._present(frame['country'])
+
+        self.years.update(frame.loc[has_period, 'period'].unique().tolist())
+
+        line = frame[has_period & has_country].groupby(['period', 'country'])['value'].agg(['sum', 'count'])
+        self.line_totals = self._merge(self.line_totals, line)
+
+        bar = frame[has_country & frame['value'].notna()].groupby('country')['value'].agg(['sum', 'count'])
+        self.bar_totals = self._merge(self.bar_totals, bar)
+
+        visuals = frame[ChartBuilder._present(frame['visual_id'])].drop_duplicates('visual_id')
+        for row in visuals.itertuples(index=False):
+            if row.visual_id not in self.context:
+                self.context[row.visual_id] = {
+                    'visual_type': row.visual_type,
+                    'document_title': row.document_title,
+                    'domain': row.domain
+                }
+
+    @staticmethod
+    def _means(totals) -> pd.Series:
+        if totals is None or totals.empty:
+            return pd.Series(dtype=float)
+        totals = totals[totals['count'] > 0].sort_index()
+        return totals['sum'] / totals['count']
+
+    def result(self) -> Dict:
+        """Chart payloads in the same shape as ChartBuilder.build"""
+        line_means = self._means(self.line_totals)
+        bar_data = ChartBuilder.bar_data_from_means(self._means(self.bar_totals))
+        years = sorted(self.years)
+        return {
+            'line_data': ChartBuilder.line_data_from_means(line_means),
+            'bar_data': bar_data,
+            'pie_data': ChartBuilder.build_pie_data(bar_data) if years else [],
+            'years': years,
+            'countries': [item['country'] for item in bar_data],
+            'context': list(self.context.values())
+        }
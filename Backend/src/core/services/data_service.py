@@ -1,65 +1,208 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterator
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from src.core.db import db
-from sqlalchemy import text
+from src.core.db.engine import pool_capacity
+from src.core.services.chart_builder import ChartBuilder, ChartAccumulator
+from src.util import numeric_classifier
+from src.util.keyset import keyset_query, page_rows
+from sqlalchemy import text, bindparam
+from sqlalchemy.exc import SQLAlchemyError
 import logging
-import re
+import time
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Rows fetched per server-side cursor round trip when streaming
+STREAM_BATCH_SIZE = 2000
+
+# Independent live-summary queries; each runs on its own pooled connection
+SUMMARY_QUERIES = {
+    'total_indicators': "SELECT COUNT(DISTINCT indicator_id) as count FROM indicators",
+    'total_documents': "SELECT COUNT(DISTINCT document_id) as count FROM documents",
+    'total_visuals': "SELECT COUNT(DISTINCT visual_id) as count FROM visual_entities",
+    'total_observations': "SELECT COUNT(DISTINCT observation_id) as count FROM observations",
+    'domains': "SELECT domain, COUNT(*) as count FROM documents GROUP BY domain",
+    'visual_types': "SELECT type, COUNT(*) as count FROM visual_entities GROUP BY type"
+}
+SUMMARY_LIST_KEYS = ('domains', 'visual_types')
+
+# Shared by every request, so sized to the connection pool rather than to one
+# fan-out: concurrent summaries then run side by side instead of queueing
+_summary_executor = ThreadPoolExecutor(
+    max_workers=max(len(SUMMARY_QUERIES), pool_capacity()), thread_name_prefix='dashboard-summary'
+)
+
+# Listing queries: keyset_query appends filters, the cursor condition and ORDER BY.
+# Sort keys are COALESCEd so the cursor comparison never meets a NULL.
+INDICATOR_LIST_SELECT = """
+SELECT DISTINCT ON (COALESCE(i.name, '')) i.indicator_id, i.name, i.unit, i.document_id
+FROM indicators i
+"""
+INDICATOR_LIST_KEYS = ["COALESCE(i.name, '')"]
+
+DOCUMENT_LIST_SELECT = """
+SELECT d.document_id, d.title, d.domain, d.source
+FROM documents d
+"""
+DOCUMENT_LIST_KEYS = ["COALESCE(d.title, '')", "d.document_id"]
+
+VISUAL_LIST_SELECT = """
+SELECT v.visual_id, v.type, v.document_id, d.title as document_title
+FROM visual_entities v
+JOIN documents d ON v.document_id = d.document_id
+"""
+VISUAL_LIST_KEYS = ["COALESCE(v.type, '')", "v.visual_id"]
+
+# Domains are matched ignoring the stray whitespace in the source data
+DOMAIN_FILTER = "document_id IN (SELECT document_id FROM documents WHERE TRIM(domain) = :domain)"
+
+# Read queries shared by DataService and AsyncDataService
+# One row per indicator name (lowest indicator_id), deduplicated in SQL
+ALL_INDICATORS_QUERY = INDICATOR_LIST_SELECT + "ORDER BY COALESCE(i.name, ''), i.indicator_id"
+
+# Time-series queries are templates over the indicator filter: {match} is
+# ONE_INDICATOR for a single id or MANY_INDICATORS for a batch, so both paths
+# run the same SQL. Rows carry indicator_id for partitioning batch results.
+ONE_INDICATOR = "= :indicator_id"
+MANY_INDICATORS = "= ANY(:indicator_ids)"
+
+INDICATOR_INFO_TEMPLATE = """
+SELECT i.indicator_id, i.name, i.unit, d.title as document_title
+FROM indicators i
+LEFT JOIN documents d ON i.document_id = d.document_id
+WHERE i.indicator_id {match}
+"""
+
+TIME_SERIES_TEMPLATE = """
+SELECT 
+    o.observation_id, o.indicator_id, o.visual_id, 
+    o.value_num as value, o.value as original_value,
+    o.period, o.country, o.unit,
+    o.metric_type, o.name as observation_name,
+    i.name as indicator_name, i.unit as indicator_unit,
+    ve.type as visual_type,
+    d.title as document_title, d.domain
+FROM observations o
+JOIN indicators i ON o.indicator_id = i.indicator_id
+LEFT JOIN visual_entities ve ON o.visual_id = ve.visual_id
+LEFT JOIN documents d ON o.document_id = d.document_id
+WHERE o.indicator_id {match}
+AND o.value_num IS NOT NULL
+ORDER BY o.indicator_id, o.period, o.country, o.observation_id
+"""
+
+# Ingest-time rollups (see REFRESH_INDICATOR_AGGREGATES in data_loader).
+# COLLATE "C" sorts by code point, matching the Python sort of the raw path.
+SERIES_SUMMARY_TEMPLATE = """
+SELECT indicator_id, years, context, skipped_values
+FROM indicator_series_summary
+WHERE indicator_id {match}
+"""
+
+PERIOD_COUNTRY_MEANS_TEMPLATE = """
+SELECT indicator_id, period, country, value_mean AS mean
+FROM indicator_period_country
+WHERE indicator_id {match}
+ORDER BY indicator_id, period COLLATE "C", country COLLATE "C"
+"""
+
+COUNTRY_MEANS_TEMPLATE = """
+SELECT indicator_id, country, value_mean AS mean
+FROM indicator_country_stats
+WHERE indicator_id {match}
+ORDER BY indicator_id, country COLLATE "C"
+"""
+
+# Values that failed parsing at ingest are reported, not re-parsed
+SKIPPED_VALUES_TEMPLATE = """
+SELECT DISTINCT indicator_id, value
+FROM observations
+WHERE indicator_id {match}
+AND value_status = 'non_numeric'
+"""
+
+INDICATOR_INFO_QUERY = INDICATOR_INFO_TEMPLATE.format(match=ONE_INDICATOR)
+TIME_SERIES_QUERY = TIME_SERIES_TEMPLATE.format(match=ONE_INDICATOR)
+SERIES_SUMMARY_QUERY = SERIES_SUMMARY_TEMPLATE.format(match=ONE_INDICATOR)
+PERIOD_COUNTRY_MEANS_QUERY = PERIOD_COUNTRY_MEANS_TEMPLATE.format(match=ONE_INDICATOR)
+COUNTRY_MEANS_QUERY = COUNTRY_MEANS_TEMPLATE.format(match=ONE_INDICATOR)
+SKIPPED_VALUES_QUERY = SKIPPED_VALUES_TEMPLATE.format(match=ONE_INDICATOR)
+
+INDICATOR_INFO_BATCH_QUERY = INDICATOR_INFO_TEMPLATE.format(match=MANY_INDICATORS)
+TIME_SERIES_BATCH_QUERY = TIME_SERIES_TEMPLATE.format(match=MANY_INDICATORS)
+SERIES_SUMMARY_BATCH_QUERY = SERIES_SUMMARY_TEMPLATE.format(match=MANY_INDICATORS)
+PERIOD_COUNTRY_MEANS_BATCH_QUERY = PERIOD_COUNTRY_MEANS_TEMPLATE.format(match=MANY_INDICATORS)
+COUNTRY_MEANS_BATCH_QUERY = COUNTRY_MEANS_TEMPLATE.format(match=MANY_INDICATORS)
+SKIPPED_VALUES_BATCH_QUERY = SKIPPED_VALUES_TEMPLATE.format(match=MANY_INDICATORS)
+
+# Taken first in every time-series read transaction, in the loader's lock order
+# (source tables in CSV_FILES order, then the rollups). The loader's swap needs
+# ACCESS EXCLUSIVE on these, so a reload either waits for the read to finish or
+# the read waits for the reload to commit: one read never mixes two generations.
+PIN_TIME_SERIES_TABLES = """
+LOCK TABLE documents, indicators, visual_entities, observations,
+    indicator_series_summary, indicator_period_country, indicator_country_stats
+IN ACCESS SHARE MODE
+"""
+
+RELATED_VISUALIZATIONS_QUERY = """
+SELECT DISTINCT
+    ve.visual_id, ve.type, ve.document_id,
+    d.title as document_title, d.domain,
+    COUNT(o.observation_id) as observation_count
+FROM visual_entities ve
+JOIN observations o ON ve.visual_id = o.visual_id
+JOIN documents d ON ve.document_id = d.document_id
+WHERE o.indicator_id = :indicator_id
+GROUP BY ve.visual_id, ve.type, ve.document_id, d.title, d.domain
+"""
+
+TIMELINE_SERIES_QUERY = """
+SELECT 
+    o.period as year, 
+    o.value_num as value, 
+    o.name as observation_name,
+    o.country
+FROM observations o
+WHERE o.indicator_id = :indicator_id
+AND o.value_num IS NOT NULL
+ORDER BY o.period
+"""
+
+SCENARIO_SERIES_QUERY = """
+SELECT 
+    o.value_num AS value,
+    o.country AS scenario,  -- label like 'with_dividend'
+    i.name AS indicator_name,
+    o.visual_id
+FROM observations o
+JOIN indicators i ON o.indicator_id = i.indicator_id
+WHERE i.document_id = :document_id
+AND o.value_num IS NOT NULL
+ORDER BY o.visual_id, scenario;
+"""
+
 class DataService:
     @staticmethod
     def is_numeric(value):
         """Check if a value can be converted to float"""
-        if value is None or value == '':
-            return False
-        
-        str_value = str(value).strip()
-        non_numeric_patterns = [
-            r'^other$', r'^n/a$', r'^na$', r'^null$', r'^none$',
-            r'^unknown$', r'^not available$', r'^not applicable$',
-            r'^[a-zA-Z]+$'
-        ]
-        
-        for pattern in non_numeric_patterns:
-            if re.match(pattern, str_value, re.IGNORECASE):
-                return False
-        
-        try:
-            float(str_value)
-            return True
-        except (ValueError, TypeError):
-            return False
+        return numeric_classifier.is_numeric(value)
 
     @staticmethod
     def safe_float_convert(value, default=0.0):
         """Safely convert value to float with fallback"""
-        if DataService.is_numeric(value):
-            try:
-                return float(value)
-            except (ValueError, TypeError):
-                return default
-        return default
+        return numeric_classifier.parse_float(value, default)
 
     @staticmethod
     def get_all_indicators() -> List[Dict]:
         """Get unique indicators without duplicates"""
         try:
-            query = """
-SELECT DISTINCT indicator_id, name, unit, document_id FROM indicators ORDER BY name;
-
-"""
             with db.engine.connect() as connection:
-                result = connection.execute(text(query))
-                indicators = []
-                seen_names = set()
-                
-                for row in result:
-                    row_dict = dict(row._mapping)
-                    if row_dict['name'] not in seen_names:
-                        seen_names.add(row_dict['name'])
-                        indicators.append(row_dict)
+                result = connection.execute(text(ALL_INDICATORS_QUERY))
+                indicators = [dict(row._mapping) for row in result]
                 
                 logger.info(f"Retrieved {len(indicators)} unique indicators")
                 return indicators
@@ -68,187 +211,414 @@ SELECT DISTINCT indicator_id, name, unit, document_id FROM indicators ORDER BY n
             raise
 
     @staticmethod
-    def get_time_series_data(indicator_id: str) -> Dict:
-        """Get time series data for specific indicator"""
+    def _list_page(select_sql: str, keys: List[str], key_columns: List[str], conditions: List[str],
+                   params: Dict, limit: Optional[int], after: Optional[str], tiebreak=()) -> Dict:
+        """Run one keyset page; returns {'data': rows, 'next_cursor': cursor or None}"""
+        query, params = keyset_query(select_sql, keys, conditions, params, limit, after, tiebreak)
+        with db.engine.connect() as connection:
+            rows = [dict(row._mapping) for row in connection.execute(text(query), params)]
+        rows, next_cursor = page_rows(rows, key_columns, limit)
+        return {'data': rows, 'next_cursor': next_cursor}
+
+    @staticmethod
+    def list_indicators(limit: Optional[int] = None, after: Optional[str] = None,
+                        document_id: Optional[str] = None, domain: Optional[str] = None) -> Dict:
+        """
+        Unique indicators by name, optionally filtered by document or domain.
+        Pass limit to page through them; next_cursor feeds the following call's after.
+        """
+        conditions, params = [], {}
+        if document_id:
+            conditions.append("i.document_id = :document_id")
+            params['document_id'] = document_id
+        if domain:
+            conditions.append("i." + DOMAIN_FILTER)
+            params['domain'] = domain.strip()
+        try:
+            return DataService._list_page(
+                INDICATOR_LIST_SELECT, INDICATOR_LIST_KEYS, ['name'], conditions, params,
+                limit, after, tiebreak=['i.indicator_id']
+            )
+        except Exception as e:
+            logger.error(f"Error listing indicators: {str(e)}")
+            raise
+
+    @staticmethod
+    def list_documents(limit: Optional[int] = None, after: Optional[str] = None,
+                       domain: Optional[str] = None) -> Dict:
+        """Documents ordered by title, optionally filtered by domain and keyset-paginated"""
+        conditions, params = [], {}
+        if domain:
+            conditions.append("d." + DOMAIN_FILTER)
+            params['domain'] = domain.strip()
+        try:
+            return DataService._list_page(
+                DOCUMENT_LIST_SELECT, DOCUMENT_LIST_KEYS, ['title', 'document_id'], conditions, params, limit, after
+            )
+        except Exception as e:
+            logger.error(f"Error listing documents: {str(e)}")
+            raise
+
+    @staticmethod
+    def list_visual_entities(limit: Optional[int] = None, after: Optional[str] = None,
+                             visual_type: Optional[str] = None, document_id: Optional[str] = None,
+                             domain: Optional[str] = None) -> Dict:
+        """Visual entities ordered by type, optionally filtered and keyset-paginated"""
+        conditions, params = [], {}
+        if visual_type:
+            conditions.append("v.type = :visual_type")
+            params['visual_type'] = visual_type
+        if document_id:
+            conditions.append("v.document_id = :document_id")
+            params['document_id'] = document_id
+        if domain:
+            conditions.append("v." + DOMAIN_FILTER)
+            params['domain'] = domain.strip()
+        try:
+            return DataService._list_page(
+                VISUAL_LIST_SELECT, VISUAL_LIST_KEYS, ['type', 'visual_id'], conditions, params, limit, after
+            )
+        except Exception as e:
+            logger.error(f"Error listing visual entities: {str(e)}")
+            raise
+
+    @staticmethod
+    def time_series_row(row) -> Dict:
+        """Observation row as a dict, with period mapped to year for existing consumers"""
+        row_dict = dict(row._mapping)
+        row_dict['year'] = row_dict['period']
+        return row_dict
+
+    @staticmethod
+    def get_time_series_data(indicator_id: str, include_raw: bool = False) -> Dict:
+        """
+        Get time series data for specific indicator.
+        Charts come from the ingest-time rollups; raw observations are read only
+        for raw_data (returned when include_raw is True) or when the rollups are
+        missing. Everything is read in one transaction pinned to one data generation.
+        """
         try:
             logger.info(f"Fetching time series data for indicator {indicator_id}")
+            params = {'indicator_id': indicator_id}
             
-            # Check if the indicator exists
-            indicator_query = """
-            SELECT i.indicator_id, i.name, i.unit, d.title as document_title
-            FROM indicators i
-            LEFT JOIN documents d ON i.document_id = d.document_id
-            WHERE i.indicator_id = :indicator_id
-            """
-            
-            with db.engine.connect() as connection:
-                indicator_result = connection.execute(text(indicator_query), {'indicator_id': indicator_id})
-                indicator_row = indicator_result.fetchone()
+            with db.engine.connect() as connection, connection.begin():
+                DataService.pin_time_series_tables(connection)
+                indicator_row = connection.execute(text(INDICATOR_INFO_QUERY), params).fetchone()
                 
                 if not indicator_row:
                     raise ValueError(f"Indicator with ID {indicator_id} not found")
                 
                 indicator_info = dict(indicator_row._mapping)
+                rollup = DataService.read_rollups(connection, params).get(indicator_id)
+                raw_rows, skipped_values = [], []
+                if include_raw or rollup is None:
+                    raw_rows = [DataService.time_series_row(row)
+                                for row in connection.execute(text(TIME_SERIES_QUERY), params)]
+                if rollup is None:
+                    skipped_values = [row.value for row in connection.execute(text(SKIPPED_VALUES_QUERY), params)]
+            
+            return DataService.assemble_time_series(indicator_info, rollup, raw_rows, skipped_values, include_raw)
                 
-                # Get observations data - using period instead of year
-                query = """
-                SELECT 
-                    o.observation_id, o.indicator_id, o.visual_id, 
-                    o.value, o.period, o.country, o.unit,
-                    o.metric_type, o.name as observation_name,
-                    i.name as indicator_name, i.unit as indicator_unit,
-                    ve.type as visual_type,
-                    d.title as document_title, d.domain
-                FROM observations o
-                JOIN indicators i ON o.indicator_id = i.indicator_id
-                LEFT JOIN visual_entities ve ON o.visual_id = ve.visual_id
-                LEFT JOIN documents d ON o.document_id = d.document_id
-                WHERE o.indicator_id = :indicator_id
-                AND o.value IS NOT NULL 
-                AND o.value != ''
-                ORDER BY o.period, o.country
-                """
-                
-                result = connection.execute(text(query), {'indicator_id': indicator_id})
-                data = []
-                skipped_values = []
-                
-                for row in result:
-                    try:
-                        row_dict = dict(row._mapping)
-                        original_value = row_dict['value']
-                        if DataService.is_numeric(original_value):
-                            row_dict['value'] = DataService.safe_float_convert(original_value)
-                            row_dict['original_value'] = str(original_value)
-                            # Map period to year for compatibility with existing code
-                            row_dict['year'] = row_dict['period']
-                            data.append(row_dict)
-                        else:
-                            skipped_values.append(str(original_value))
-                    except Exception as row_error:
-                        logger.warning(f"Error processing row: {row_error}")
-                        continue
-                
-                if not data:
-                    return {
-                        'line_data': [],
-                        'bar_data': [],
-                        'pie_data': [],
-                        'raw_data': [],
-                        'years': [],
-                        'countries': [],
-                        'context': [],
-                        'indicator_info': indicator_info,
-                        'skipped_values': list(set(skipped_values))
-                    }
-                
-                # Transform data for visualization - now using period mapped to year
-                years = sorted(list(set([d['period'] for d in data if d['period']])))
-                countries = sorted(list(set([d['country'] for d in data if d['country']])))
-                
-                # Line chart data
-                line_data = []
-                for year in years:
-                    year_data = {'year': year}
-                    year_observations = [d for d in data if d['period'] == year]
+        except Exception as e:
+            logger.error(f"Error fetching time series data: {str(e)}")
+            raise
+
+    @staticmethod
+    def pin_time_series_tables(connection):
+        """
+        Lock the time-series tables for the rest of the transaction (see
+        PIN_TIME_SERIES_TABLES). Postgres only; when a table does not exist yet
+        the read goes ahead unpinned.
+        """
+        if connection.dialect.name != 'postgresql':
+            return
+        try:
+            with connection.begin_nested():
+                connection.execute(text(PIN_TIME_SERIES_TABLES))
+        except SQLAlchemyError as e:
+            logger.warning(f"Time-series tables not pinned: {e}")
+
+    @staticmethod
+    def read_rollups(connection, params: Dict, batch: bool = False) -> Dict[str, Dict]:
+        """
+        Rollup rows of the indicators in params, grouped by group_rollups.
+        Runs in a savepoint, so when the rollup tables do not exist yet the
+        enclosing transaction carries on and every indicator falls back to the
+        raw observations.
+        """
+        queries = (
+            (SERIES_SUMMARY_BATCH_QUERY, PERIOD_COUNTRY_MEANS_BATCH_QUERY, COUNTRY_MEANS_BATCH_QUERY) if batch
+            else (SERIES_SUMMARY_QUERY, PERIOD_COUNTRY_MEANS_QUERY, COUNTRY_MEANS_QUERY)
+        )
+        try:
+            with connection.begin_nested():
+                summary_rows, line_rows, bar_rows = (
+                    [dict(row._mapping) for row in connection.execute(text(query), params)] for query in queries
+                )
+        except SQLAlchemyError as e:
+            logger.warning(f"Indicator aggregates unavailable, computing live: {e}")
+            return {}
+        return DataService.group_rollups(summary_rows, line_rows, bar_rows)
+
+    @staticmethod
+    def group_rollups(summary_rows: List[Dict], line_rows: List[Dict], bar_rows: List[Dict]) -> Dict[str, Dict]:
+        """{indicator_id: {'summary', 'line_rows', 'bar_rows'}} for indicators with a summary row"""
+        rollups = {row['indicator_id']: {'summary': row, 'line_rows': [], 'bar_rows': []} for row in summary_rows}
+        for key, rows in (('line_rows', line_rows), ('bar_rows', bar_rows)):
+            for row in rows:
+                if row['indicator_id'] in rollups:
+                    rollups[row['indicator_id']][key].append(row)
+        return rollups
+
+    @staticmethod
+    def aggregate_payload(summary: Dict, line_rows: List[Dict], bar_rows: List[Dict]) -> Dict:
+        """Chart payloads, years, context and skipped values from one indicator's rollup rows"""
+        line_means = {(row['period'], row['country']): row['mean'] for row in line_rows}
+        bar_means = {row['country']: row['mean'] for row in bar_rows}
+        charts = ChartBuilder.build_from_aggregates(line_means, bar_means, summary['years'], summary['context'])
+        return {**charts, 'skipped_values': summary['skipped_values']}
+
+    @staticmethod
+    def assemble_time_series(indicator_info: Dict, rollup: Optional[Dict], raw_rows: List[Dict],
+                             skipped_values: List[str], include_raw: bool) -> Dict:
+        """
+        Time-series payload for one indicator, shared by the single, batch and
+        async reads. Charts come from the rollup (see group_rollups) when there
+        is one, otherwise from raw_rows and skipped_values.
+        """
+        if rollup is None:
+            payload = DataService.build_time_series_payload(indicator_info, raw_rows, skipped_values)
+            if not include_raw:
+                del payload['raw_data']
+            return payload
+        
+        payload = {**DataService.aggregate_payload(**rollup), 'indicator_info': indicator_info}
+        if include_raw:
+            payload['raw_data'] = raw_rows
+        return payload
+
+    @staticmethod
+    def get_time_series_aggregates(indicator_id: str) -> Optional[Dict]:
+        """
+        Chart payloads, years, context and skipped values from the rollup tables.
+        Returns None when the rollups have not been built for this indicator yet.
+        """
+        with db.engine.connect() as connection, connection.begin():
+            DataService.pin_time_series_tables(connection)
+            rollup = DataService.read_rollups(connection, {'indicator_id': indicator_id}).get(indicator_id)
+        return None if rollup is None else DataService.aggregate_payload(**rollup)
+
+    @staticmethod
+    def get_time_series_from_observations(indicator_info: Dict, include_raw: bool = False) -> Dict:
+        """Build the time-series payload from raw observations (fallback before the first rollup)"""
+        params = {'indicator_id': indicator_info['indicator_id']}
+        with db.engine.connect() as connection:
+            result = connection.execute(text(TIME_SERIES_QUERY), params)
+            data = [DataService.time_series_row(row) for row in result]
+            
+            skipped_result = connection.execute(text(SKIPPED_VALUES_QUERY), params)
+            skipped_values = [row.value for row in skipped_result]
+        
+        return DataService.assemble_time_series(indicator_info, None, data, skipped_values, include_raw)
+
+    @staticmethod
+    def build_time_series_payload(indicator_info: Dict, data: List[Dict], skipped_values: List[str]) -> Dict:
+        """Assemble the time-series response for one indicator's numeric rows"""
+        # Build line, bar and pie payloads in a single grouped pass
+        charts = ChartBuilder.build(data)
+        
+        return {
+            'line_data': charts['line_data'],
+            'bar_data': charts['bar_data'],
+            'pie_data': charts['pie_data'],
+            'raw_data': data,
+            'years': charts['years'],
+            'countries': charts['countries'],
+            'context': charts['context'],
+            'indicator_info': indicator_info,
+            'skipped_values': skipped_values
+        }
+
+    @staticmethod
+    def stream_time_series_data(indicator_id: str, batch_size: int = STREAM_BATCH_SIZE) -> Iterator[Dict]:
+        """
+        Stream time series data for one indicator as records.
+        Yields {'record': 'row', 'data': row} for every numeric observation, then a
+        single {'record': 'summary', 'data': ...} trailer holding the chart payloads,
+        indicator_info and skipped_values. Rows are read through a server-side cursor
+        and the charts are accumulated per batch, so memory does not grow with the
+        number of observations.
+        Raises ValueError before anything is yielded when the indicator does not exist.
+        """
+        with db.engine.connect() as connection:
+            indicator_row = connection.execute(text(INDICATOR_INFO_QUERY), {'indicator_id': indicator_id}).fetchone()
+        
+        if not indicator_row:
+            raise ValueError(f"Indicator with ID {indicator_id} not found")
+        
+        indicator_info = dict(indicator_row._mapping)
+        
+        def records():
+            accumulator = ChartAccumulator()
+            try:
+                with db.engine.connect() as connection:
+                    result = connection.execution_options(
+                        stream_results=True, max_row_buffer=batch_size
+                    ).execute(text(TIME_SERIES_QUERY), {'indicator_id': indicator_id})
                     
-                    for obs in year_observations:
-                        if obs['country']:
-                            if obs['country'] in year_data:
-                                year_data[obs['country']] = (year_data[obs['country']] + obs['value']) / 2
-                            else:
-                                year_data[obs['country']] = obs['value']
+                    for partition in result.partitions(batch_size):
+                        batch = [DataService.time_series_row(row) for row in partition]
+                        for row_dict in batch:
+                            yield {'record': 'row', 'data': row_dict}
+                        accumulator.add(batch)
                     
-                    if len(year_data) > 1:
-                        line_data.append(year_data)
-                
-                # Bar chart data
-                country_totals = {}
-                country_counts = {}
-                
-                for item in data:
-                    if item['country'] and item['value'] is not None:
-                        if item['country'] not in country_totals:
-                            country_totals[item['country']] = 0
-                            country_counts[item['country']] = 0
-                        country_totals[item['country']] += item['value']
-                        country_counts[item['country']] += 1
-                
-                bar_data = []
-                for country in countries:
-                    if country in country_totals and country_counts[country] > 0:
-                        avg_value = country_totals[country] / country_counts[country]
-                        bar_data.append({
-                            'country': country,
-                            'value': round(avg_value, 2),
-                            'name': country
-                        })
-                
-                # Pie chart data
-                pie_data = []
-                if years and bar_data:
-                    sorted_bar_data = sorted(bar_data, key=lambda x: abs(x['value']), reverse=True)[:10]
-                    for item in sorted_bar_data:
-                        if item['value'] != 0:
-                            pie_data.append({
-                                'name': item['country'],
-                                'value': abs(item['value'])
-                            })
-                
-                # Get context
-                context = {}
-                for item in data:
-                    if item['visual_id'] and item['visual_id'] not in context:
-                        context[item['visual_id']] = {
-                            'visual_type': item['visual_type'],
-                            'document_title': item['document_title'],
-                            'domain': item['domain']
-                        }
-                
-                return {
-                    'line_data': line_data,
-                    'bar_data': bar_data,
-                    'pie_data': pie_data,
-                    'raw_data': data,
-                    'years': years,
-                    'countries': countries,
-                    'context': list(context.values()),
+                    skipped_result = connection.execute(text(SKIPPED_VALUES_QUERY), {'indicator_id': indicator_id})
+                    skipped_values = [row.value for row in skipped_result]
+            except Exception as e:
+                logger.error(f"Error streaming time series data: {str(e)}")
+                raise
+            
+            logger.info(f"Streamed {accumulator.row_count} rows for indicator {indicator_id}")
+            yield {
+                'record': 'summary',
+                'data': {
+                    **accumulator.result(),
                     'indicator_info': indicator_info,
-                    'skipped_values': list(set(skipped_values))
+                    'skipped_values': skipped_values,
+                    'row_count': accumulator.row_count
+                }
+            }
+        
+        return records()
+
+    @staticmethod
+    def get_time_series_batch(indicator_ids: List[str], include_raw: bool = False) -> Dict:
+        """
+        Get time series data for several indicators in one transaction, read and
+        assembled like get_time_series_data. Returns {'series': {indicator_id: payload},
+        'missing': [unknown ids]}
+        """
+        try:
+            indicator_ids = list(dict.fromkeys(indicator_ids))
+            logger.info(f"Fetching time series data for {len(indicator_ids)} indicators")
+            
+            params = {'indicator_ids': indicator_ids}
+            with db.engine.connect() as connection, connection.begin():
+                DataService.pin_time_series_tables(connection)
+                indicator_infos = {
+                    row.indicator_id: dict(row._mapping)
+                    for row in connection.execute(text(INDICATOR_INFO_BATCH_QUERY), params)
                 }
+                rollups = DataService.read_rollups(connection, params, batch=True)
                 
+                # Raw rows only where they are returned or the rollups are missing
+                raw_ids = [i for i in indicator_infos if include_raw or i not in rollups]
+                live_ids = [i for i in indicator_infos if i not in rollups]
+                rows_by_indicator = defaultdict(list)
+                if raw_ids:
+                    for row in connection.execute(text(TIME_SERIES_BATCH_QUERY), {'indicator_ids': raw_ids}):
+                        row_dict = DataService.time_series_row(row)
+                        rows_by_indicator[row_dict['indicator_id']].append(row_dict)
+                skipped_by_indicator = defaultdict(list)
+                if live_ids:
+                    for row in connection.execute(text(SKIPPED_VALUES_BATCH_QUERY), {'indicator_ids': live_ids}):
+                        skipped_by_indicator[row.indicator_id].append(row.value)
+            
+            series = {
+                indicator_id: DataService.assemble_time_series(
+                    indicator_infos[indicator_id],
+                    rollups.get(indicator_id),
+                    rows_by_indicator.get(indicator_id, []),
+                    skipped_by_indicator.get(indicator_id, []),
+                    include_raw
+                )
+                for indicator_id in indicator_ids
+                if indicator_id in indicator_infos
+            }
+            return {
+                'series': series,
+                'missing': [i for i in indicator_ids if i not in indicator_infos]
+            }
         except Exception as e:
-            logger.error(f"Error fetching time series data: {str(e)}")
+            logger.error(f"Error fetching batch time series data: {str(e)}")
             raise
 
     @staticmethod
-    def get_dashboard_summary() -> Dict:
-        """Get summary statistics for dashboard"""
+    def get_dashboard_summary(debug: bool = False) -> Dict:
+        """
+        Get summary statistics for dashboard from the ingest-time rollup.
+        With debug=True the result carries per-query 'timings' in milliseconds.
+        """
+        started = time.perf_counter()
         try:
-            queries = {
-                'total_indicators': "SELECT COUNT(DISTINCT indicator_id) as count FROM indicators",
-                'total_documents': "SELECT COUNT(DISTINCT document_id) as count FROM documents",
-                'total_visuals': "SELECT COUNT(DISTINCT visual_id) as count FROM visual_entities",
-                'total_observations': "SELECT COUNT(DISTINCT observation_id) as count FROM observations",
-                'domains': "SELECT domain, COUNT(*) as count FROM documents GROUP BY domain",
-                'visual_types': "SELECT type, COUNT(*) as count FROM visual_entities GROUP BY type"
+            query = """
+            SELECT total_indicators, total_documents, total_visuals, total_observations,
+                   domains, visual_types
+            FROM dashboard_summary
+            WHERE id = 1
+            """
+            with db.engine.connect() as connection:
+                row = connection.execute(text(query)).fetchone()
+        except Exception as e:
+            logger.warning(f"dashboard_summary unavailable, computing live: {e}")
+            row = None
+
+        if row is None:
+            return DataService.compute_dashboard_summary(debug)
+
+        summary = {
+            'total_indicators': {'count': row.total_indicators},
+            'total_documents': {'count': row.total_documents},
+            'total_visuals': {'count': row.total_visuals},
+            'total_observations': {'count': row.total_observations},
+            'domains': row.domains,
+            'visual_types': row.visual_types
+        }
+        if debug:
+            summary['timings'] = {'dashboard_summary': round((time.perf_counter() - started) * 1000, 3)}
+        return summary
+
+    @staticmethod
+    def _run_summary_query(engine, key: str, query: str):
+        """Run one summary query on its own pooled connection; returns (value, elapsed ms)"""
+        started = time.perf_counter()
+        try:
+            with engine.connect() as connection:
+                result = connection.execute(text(query))
+                if key in SUMMARY_LIST_KEYS:
+                    value = [dict(row._mapping) for row in result]
+                else:
+                    row = result.fetchone()
+                    value = dict(row._mapping) if row else {'count': 0}
+        except Exception as e:
+            logger.warning(f"Error executing query for {key}: {e}")
+            value = [] if key in SUMMARY_LIST_KEYS else {'count': 0}
+        return value, round((time.perf_counter() - started) * 1000, 3)
+
+    @staticmethod
+    def compute_dashboard_summary(debug: bool = False) -> Dict:
+        """
+        Compute summary statistics from the live tables.
+        The queries are independent, so they run concurrently and the latency
+        is bounded by the slowest one rather than their sum.
+        """
+        try:
+            started = time.perf_counter()
+            # Worker threads have no app context; hand them the engine itself
+            engine = db.engine
+            futures = {
+                key: _summary_executor.submit(DataService._run_summary_query, engine, key, query)
+                for key, query in SUMMARY_QUERIES.items()
             }
             
             summary = {}
+            timings = {}
+            for key, future in futures.items():
+                summary[key], timings[key] = future.result()
             
-            with db.engine.connect() as connection:
-                for key, query in queries.items():
-                    try:
-                        result = connection.execute(text(query))
-                        if key in ['domains', 'visual_types']:
-                            summary[key] = [dict(row._mapping) for row in result]
-                        else:
-                            row = result.fetchone()
-                            summary[key] = dict(row._mapping) if row else {'count': 0}
-                    except Exception as e:
-                        logger.warning(f"Error executing query for {key}: {e}")
-                        summary[key] = {'count': 0} if key not in ['domains', 'visual_types'] else []
-                        
+            if debug:
+                timings['total'] = round((time.perf_counter() - started) * 1000, 3)
+                summary['timings'] = timings
             return summary
         except Exception as e:
             logger.error(f"Error fetching dashboard summary: {str(e)}")
@@ -258,20 +628,8 @@ SELECT DISTINCT indicator_id, name, unit, document_id FROM indicators ORDER BY n
     def get_related_visualizations(indicator_id: str) -> List[Dict]:
         """Get visual entities related to an indicator"""
         try:
-            query = """
-            SELECT DISTINCT
-                ve.visual_id, ve.type, ve.document_id,
-                d.title as document_title, d.domain,
-                COUNT(o.observation_id) as observation_count
-            FROM visual_entities ve
-            JOIN observations o ON ve.visual_id = o.visual_id
-            JOIN documents d ON ve.document_id = d.document_id
-            WHERE o.indicator_id = :indicator_id
-            GROUP BY ve.visual_id, ve.type, ve.document_id, d.title, d.domain
-            """
-            
             with db.engine.connect() as connection:
-                result = connection.execute(text(query), {'indicator_id': indicator_id})
+                result = connection.execute(text(RELATED_VISUALIZATIONS_QUERY), {'indicator_id': indicator_id})
                 return [dict(row._mapping) for row in result]
         except Exception as e:
             logger.error(f"Error fetching related visuals: {str(e)}")
@@ -296,9 +654,9 @@ SELECT DISTINCT indicator_id, name, unit, document_id FROM indicators ORDER BY n
             ORDER BY document_id, name
             """
             with db.engine.connect() as connection:
-                # Convert single item list to tuple properly
-                params = {'doc_ids': tuple(document_ids) if len(document_ids) > 1 else (document_ids[0],)}
-                result = connection.execute(text(query), params)
+                # Expanding bind renders one placeholder per id on every dialect
+                statement = text(query).bindparams(bindparam('doc_ids', expanding=True))
+                result = connection.execute(statement, {'doc_ids': list(document_ids)})
                 # Filter results to only include allowed indicators
                 return [
                     dict(row._mapping) 
@@ -309,48 +667,38 @@ SELECT DISTINCT indicator_id, name, unit, document_id FROM indicators ORDER BY n
             logger.error(f"Error fetching indicators by documents: {str(e)}")
             raise
     @staticmethod
+    def build_timeline_series(rows) -> List[Dict]:
+        """Label each timeline row as past, present, future or unknown"""
+        def classify_group(obs_name: str, country: str) -> str:
+            text = f"{obs_name or ''} {country or ''}".lower()
+            if "without" in text or "no dividend" in text:
+                return "past"
+            elif "with" in text and "full" in text:
+                return "present"
+            elif "partial" in text or "0.5" in text or "reduced" in text:
+                return "future"
+            else:
+                return "unknown"
+
+        timeline_series = []
+        for row in rows:
+            year_or_label = row.year or row.country or row.observation_name
+            label = classify_group(row.observation_name, row.country)
+            timeline_series.append({
+                "year": year_or_label,
+                "value": row.value,
+                "year_category": label
+            })
+
+        return timeline_series
+
+    @staticmethod
     def get_timeline_series_by_indicator(indicator_id: str) -> List[Dict]:
         """Get timeline or scenario series for a specific indicator"""
         try:
-            query = """
-            SELECT 
-                o.period as year, 
-                o.value, 
-                o.name as observation_name,
-                o.country
-            FROM observations o
-            WHERE o.indicator_id = :indicator_id
-            AND o.value IS NOT NULL
-            ORDER BY o.period
-            """
-
             with db.engine.connect() as connection:
-                result = connection.execute(text(query), {'indicator_id': indicator_id})
-                rows = result.fetchall()
-
-                def classify_group(obs_name: str, country: str) -> str:
-                    text = f"{obs_name or ''} {country or ''}".lower()
-                    if "without" in text or "no dividend" in text:
-                        return "past"
-                    elif "with" in text and "full" in text:
-                        return "present"
-                    elif "partial" in text or "0.5" in text or "reduced" in text:
-                        return "future"
-                    else:
-                        return "unknown"
-
-                timeline_series = []
-                for row in rows:
-                    year_or_label = row.year or row.country or row.observation_name
-                    label = classify_group(row.observation_name, row.country)
-                    if DataService.is_numeric(row.value):
-                        timeline_series.append({
-                            "year": year_or_label,
-                            "value": float(row.value),
-                            "year_category": label
-                        })
-
-                return timeline_series
+                result = connection.execute(text(TIMELINE_SERIES_QUERY), {'indicator_id': indicator_id})
+                return DataService.build_timeline_series(result.fetchall())
 
         except Exception as e:
             logger.error(f"Error fetching timeline series: {str(e)}")
@@ -360,49 +708,42 @@ SELECT DISTINCT indicator_id, name, unit, document_id FROM indicators ORDER BY n
 
  
 
+    @staticmethod
+    def build_scenario_series(rows) -> Dict[str, List[Dict]]:
+        """Group scenario rows into past, present and future by their label"""
+        def classify_scenario(scenario_label: str) -> str:
+            label = scenario_label.lower()
+            if "without" in label:
+                return "past"
+            elif "0.5" in label or "partial" in label or "reduced" in label:
+                return "future"
+            elif "with" in label or "full" in label:
+                return "present"
+            return "unknown"
+
+        scenario_series = {"past": [], "present": [], "future": []}
+
+        for row in rows:
+            category = classify_scenario(row.scenario)
+            if category in scenario_series:
+                scenario_series[category].append({
+                    "scenario": row.scenario,
+                    "value": row.value,
+                    "indicator_name": row.indicator_name,
+                    "visual_id": row.visual_id
+                })
+
+        return scenario_series
+
     @staticmethod
     def get_scenario_series_by_document(document_id: str) -> Dict[str, List[Dict]]:
         """Get scenario-series grouped by past, present, future based on country label"""
         try:
-            query = """
-            SELECT 
-                o.value::numeric AS value,
-                o.country AS scenario,  -- label like 'with_dividend'
-                i.name AS indicator_name,
-                o.visual_id
-            FROM observations o
-            JOIN indicators i ON o.indicator_id = i.indicator_id
-            WHERE i.document_id = :document_id
-            ORDER BY o.visual_id, scenario;
-            """
-            
             with db.engine.connect() as connection:
-                result = connection.execute(text(query), {"document_id": document_id})
+                result = connection.execute(text(SCENARIO_SERIES_QUERY), {"document_id": document_id})
                 rows = result.fetchall()
 
-            def classify_scenario(scenario_label: str) -> str:
-                label = scenario_label.lower()
-                if "without" in label:
-                    return "past"
-                elif "0.5" in label or "partial" in label or "reduced" in label:
-                    return "future"
-                elif "with" in label or "full" in label:
-                    return "present"
-                return "unknown"
-
-            scenario_series = {"past": [], "present": [], "future": []}
-
-            for row in rows:
-                category = classify_scenario(row.scenario)
-                if category in scenario_series:
-                    scenario_series[category].append({
-                        "scenario": row.scenario,
-                        "value": float(row.value),
-                        "indicator_name": row.indicator_name,
-                        "visual_id": row.visual_id
-                    })
-
-            return scenario_series
+            return DataService.build_scenario_series(rows)
 
         except Exception as e:
             logger.error(f"Error fetching scenario series: {str(e)}")
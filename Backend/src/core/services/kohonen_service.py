@@ -1,92 +1,128 @@
-from typing import List, Dict, Optional, Tuple
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple
 from src.core.db import db
 from sqlalchemy import text
 import logging
 import numpy as np
 import pandas as pd
-from sklearn.preprocessing import StandardScaler
-from minisom import MiniSom
-import json
 import base64
-from io import BytesIO
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend
-import matplotlib.pyplot as plt
-import seaborn as sns
 from collections import defaultdict
+from src.core.cache import response_cache
+from src.core.services.som_image import image_cache, render_map
+from src.core.services.som_registry import SomModelKey, som_registry
+from src.core.services.som_jobs import JobQueueFull, som_jobs
+from src.core.services.som_metrics import cluster_stability, co_clustering, som_metrics
+from src.core.services.som_training import SOM_ENGINES, train_som_model
+
+# MiniSom is imported where a map is built, keeping it off the app's import path
+if TYPE_CHECKING:
+    from minisom import MiniSom
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def convert_for_json(obj):
-    """
-    Convert NumPy and Pandas types to JSON-serializable types
-    """
-    if obj is None:
-        return None
-    elif isinstance(obj, (np.integer, np.int64, np.int32)):
-        return int(obj)
-    elif isinstance(obj, (np.floating, np.float64, np.float32)):
-        if np.isnan(obj) or np.isinf(obj):
-            return None
-        return float(obj)
-    elif isinstance(obj, np.bool_):
-        return bool(obj)
-    elif isinstance(obj, np.ndarray):
-        return [convert_for_json(item) for item in obj.tolist()]
-    elif isinstance(obj, (pd.Series, pd.Index)):
-        return [convert_for_json(item) for item in obj.tolist()]
-    elif isinstance(obj, pd.DataFrame):
-        return [convert_for_json(row) for row in obj.to_dict('records')]
-    elif isinstance(obj, dict):
-        return {str(key): convert_for_json(value) for key, value in obj.items()}
-    elif isinstance(obj, (list, tuple)):
-        return [convert_for_json(item) for item in obj]
-    elif pd.isna(obj):
-        return None
-    else:
-        return obj
+# Map parameters used when a request does not override them
+DEFAULT_MAP_SIZE = (6, 6)
+DEFAULT_ITERATIONS = 500
+DEFAULT_SIGMA = 1.0
+DEFAULT_LEARNING_RATE = 0.5
+DEFAULT_SEED = 42
+DEFAULT_ENGINE = 'online'
+# Maps per ensemble; member i uses seed DEFAULT_SEED + i
+DEFAULT_ENSEMBLE_SIZE = 4
+# Incremental refresh: fine-tuning steps per changed country (capped at the
+# model's iterations) and the learning-rate fraction used for them
+REFRESH_ITERATIONS_PER_ROW = 20
+REFRESH_LEARNING_RATE_SCALE = 0.2
+# Warm starts allowed in a row before the next refresh trains from scratch
+MAX_CHAINED_REFRESHES = 3
+# Rendered map images: colormap per map type and default longer side in pixels
+MAP_COLORMAPS = {'distance': 'viridis', 'hit': 'Blues'}
+DEFAULT_IMAGE_SIZE = 480
+
+# SOM input: latest numeric value per (country, indicator) from this period on
+SOM_MIN_PERIOD = '2018'
+SOM_STREAM_BATCH_SIZE = 5000
+# Share of countries an indicator must cover, then share of the kept
+# indicators a country must cover, to enter the SOM matrix
+MIN_INDICATOR_COVERAGE = 0.5
+MIN_COUNTRY_COVERAGE = 0.5
+
+SOM_OBSERVATION_FILTER = """
+    o.value_num IS NOT NULL
+    AND o.country IS NOT NULL
+    AND o.country <> ''
+    AND i.name IS NOT NULL
+    AND o.period >= :min_period
+"""
+
+SOM_COUNTRIES_QUERY = f"""
+SELECT DISTINCT o.country
+FROM observations o
+JOIN indicators i ON i.indicator_id = o.indicator_id
+WHERE {SOM_OBSERVATION_FILTER}
+ORDER BY o.country
+"""
+
+SOM_INDICATORS_QUERY = f"""
+SELECT DISTINCT i.name AS indicator_name
+FROM observations o
+JOIN indicators i ON i.indicator_id = o.indicator_id
+WHERE {SOM_OBSERVATION_FILTER}
+ORDER BY indicator_name
+"""
+
+# Periods are 'YYYY' or 'YYYYQn', so text order is chronological
+SOM_LATEST_VALUES_QUERY = f"""
+SELECT DISTINCT ON (o.country, i.name)
+    o.country, i.name AS indicator_name, o.value_num AS value
+FROM observations o
+JOIN indicators i ON i.indicator_id = o.indicator_id
+WHERE {SOM_OBSERVATION_FILTER}
+ORDER BY o.country, i.name, o.period DESC, o.observation_id DESC
+"""
 
 class KohonenService:
     @staticmethod
-    def generate_som_visualization(map_type: str = 'distance') -> Optional[str]:
-        """Generate SOM visualization as base64 encoded image"""
-        try:
-            # Get fresh data and train SOM
-            df = KohonenService.get_economic_data_for_som()
-            if df.empty:
-                return None
+    def render_som_map(map_type: str = 'distance', map_size: Tuple[int, int] = DEFAULT_MAP_SIZE,
+                       iterations: int = DEFAULT_ITERATIONS, engine: str = DEFAULT_ENGINE,
+                       size: int = DEFAULT_IMAGE_SIZE, image_format: str = 'png') -> Optional[Tuple[bytes, str]]:
+        """
+        Encoded U-matrix ('distance') or hit map ('hit') image and its ETag.
+        Images are rendered straight from the map arrays through a colormap
+        lookup table and cached by (model, map type, size, format), so repeat
+        requests skip both training and encoding. None without usable data.
+        """
+        dataset, key = KohonenService.resolve_som_model(map_size, iterations, engine=engine)
+        if key is None:
+            return None
 
-            normalized_data, countries, indicators, pivot_df = KohonenService.prepare_som_matrix(df)
-            if normalized_data.size == 0:
-                return None
+        # Resolved first: with incremental refresh on, the served map may be a refreshed key
+        weights, key, _, _ = KohonenService.get_or_refresh(dataset, key, som_registry.incremental)
+        cache_key = (key.digest, map_type, int(size), image_format)
+        etag = '-'.join(str(part) for part in cache_key)
+        body = image_cache.get(cache_key)
+        if body is not None:
+            return body, etag
+
+        if map_type == 'hit':
+            grid = som_metrics(weights, dataset[0])['hit_map']
+        else:
+            grid = KohonenService.som_from_weights(weights, key).distance_map()
 
-            som = KohonenService.train_som(normalized_data)
-
-            plt.figure(figsize=(8, 6))
-
-            if map_type == 'distance':
-                plt.imshow(som.distance_map().T, cmap='viridis', origin='lower')
-                plt.colorbar(label='Distance')
-                plt.title('SOM Distance Map (U-Matrix)')
-            elif map_type == 'hit':
-                hit_map = np.zeros((som._weights.shape[0], som._weights.shape[1]))
-                win_map = som.win_map(normalized_data)
-                for position, vectors in win_map.items():
-                    i, j = position
-                    hit_map[i, j] = len(vectors)
-                plt.imshow(hit_map.T, cmap='Blues', origin='lower')
-                plt.colorbar(label='Hit Frequency')
-                plt.title('SOM Hit Frequency Map')
-
-            # Convert to base64
-            buffer = BytesIO()
-            plt.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
-            buffer.seek(0)
-            image_base64 = base64.b64encode(buffer.getvalue()).decode()
-            plt.close()
+        body = render_map(grid, MAP_COLORMAPS[map_type], size, image_format)
+        image_cache.set(cache_key, body)
+        return body, etag
 
+    @staticmethod
+    def generate_som_visualization(map_type: str = 'distance', map_size: Tuple[int, int] = DEFAULT_MAP_SIZE,
+                                   iterations: int = DEFAULT_ITERATIONS, engine: str = DEFAULT_ENGINE) -> Optional[str]:
+        """Generate SOM visualization as base64 encoded image"""
+        try:
+            rendered = KohonenService.render_som_map(map_type, map_size, iterations, engine)
+            if rendered is None:
+                return None
+            image_base64 = base64.b64encode(rendered[0]).decode()
             return f"data:image/png;base64,{image_base64}"
 
         except Exception as e:
@@ -97,115 +133,122 @@ class KohonenService:
     """
     
     @staticmethod
-    def get_economic_data_for_som() -> pd.DataFrame:
+    def get_economic_data_for_som(batch_size: int = SOM_STREAM_BATCH_SIZE) -> pd.DataFrame:
         """
-        Get economic data from the database for SOM analysis
-        Uses the same data access patterns as DataService
+        Latest numeric value per (country, indicator) as a wide float32 matrix:
+        countries as rows, indicators as columns, NaN where nothing was observed.
+        The latest-value pick happens in SQL (DISTINCT ON); rows are read through
+        a server-side cursor straight into a matrix preallocated from the label
+        lists, so memory is bounded by countries × indicators, not by row count.
         """
         try:
             logger.info("Fetching economic data for Kohonen SOM analysis")
-            
-            # Query to get all numeric observations with their indicators
-            query = """
-            SELECT 
-                o.country,
-                i.name as indicator_name,
-                i.category,
-                o.value,
-                o.year,
-                i.unit
-            FROM observations o
-            JOIN indicators i ON o.indicator_id = i.id
-            WHERE o.value IS NOT NULL 
-            AND o.value != ''
-            AND o.country IS NOT NULL
-            AND o.country != ''
-            AND o.year >= 2018  -- Focus on recent data
-            ORDER BY o.country, i.name, o.year DESC
-            LIMIT 1000  -- Limit for testing
-            """
+            params = {'min_period': SOM_MIN_PERIOD}
             
             with db.engine.connect() as connection:
-                result = connection.execute(text(query))
-                data = []
-                
-                for row in result:
-                    row_dict = dict(row._mapping)
-                    
-                    # Use DataService's numeric validation
-                    from src.core.services.data_service import DataService
-                    if DataService.is_numeric(row_dict['value']):
-                        row_dict['value'] = DataService.safe_float_convert(row_dict['value'])
-                        data.append(row_dict)
-                
-                logger.info(f"Retrieved {len(data)} valid economic observations")
-                
-                if not data:
+                countries = [row.country for row in connection.execute(text(SOM_COUNTRIES_QUERY), params)]
+                indicators = [row.indicator_name for row in connection.execute(text(SOM_INDICATORS_QUERY), params)]
+                if not countries or not indicators:
                     logger.warning("No valid economic data found for SOM analysis")
                     return pd.DataFrame()
                 
-                df = pd.DataFrame(data)
-                
-                # Take the most recent value for each country-indicator combination
-                df_latest = df.sort_values('year').groupby(['country', 'indicator_name']).tail(1)
+                country_index = {country: i for i, country in enumerate(countries)}
+                indicator_index = {indicator: j for j, indicator in enumerate(indicators)}
+                matrix = np.full((len(countries), len(indicators)), np.nan, dtype=np.float32)
                 
-                logger.info(f"Processed data: {len(df_latest)} country-indicator combinations")
-                logger.info(f"Countries: {df_latest['country'].nunique()}")
-                logger.info(f"Indicators: {df_latest['indicator_name'].nunique()}")
+                result = connection.execution_options(
+                    stream_results=True, max_row_buffer=batch_size
+                ).execute(text(SOM_LATEST_VALUES_QUERY), params)
                 
-                return df_latest
+                observations = 0
+                for partition in result.partitions(batch_size):
+                    rows = [country_index[row.country] for row in partition]
+                    columns = [indicator_index[row.indicator_name] for row in partition]
+                    matrix[rows, columns] = [row.value for row in partition]
+                    observations += len(partition)
+            
+            logger.info(f"Retrieved {observations} latest observations: "
+                        f"{len(countries)} countries × {len(indicators)} indicators")
+            
+            matrix_df = pd.DataFrame(matrix, index=countries, columns=indicators, copy=False)
+            matrix_df.attrs['observations'] = observations
+            return matrix_df
                 
         except Exception as e:
             logger.error(f"Error fetching economic data for SOM: {str(e)}")
             raise
 
     @staticmethod
-    def prepare_som_matrix(df: pd.DataFrame) -> Tuple[np.ndarray, List[str], List[str], pd.DataFrame]:
+    def prepare_som_matrix(matrix_df: pd.DataFrame) -> Tuple[np.ndarray, List[str], List[str], pd.DataFrame]:
         """
-        Prepare data matrix for SOM training
-        Returns: (normalized_data, countries, indicators, pivot_df)
+        Prepare data matrix for SOM training from get_economic_data_for_som output.
+        Indicators observed for fewer than MIN_INDICATOR_COVERAGE of countries
+        are dropped, then countries holding fewer than MIN_COUNTRY_COVERAGE of
+        the remaining indicators, repeated on what is left until both hold, so
+        every kept indicator has values among the kept countries; gaps left
+        are filled with column means and the matrix is standardised, all in
+        float32.
+        Returns: (normalized_data, countries, indicators, pivot_df); what was
+        dropped is reported in pivot_df.attrs['coverage'], and which cells
+        were filled in pivot_df.attrs['missing'].
         """
         try:
-            if df.empty:
+            if matrix_df.empty:
                 logger.warning("Empty dataframe provided for SOM matrix preparation")
                 return np.array([]), [], [], pd.DataFrame()
             
-            # Create pivot table: countries as rows, indicators as columns
-            pivot_df = df.pivot_table(
-                index='country',
-                columns='indicator_name', 
-                values='value',
-                aggfunc='mean'  # Average if multiple values
-            )
-            
-            # Fill missing values with column means
-            pivot_df = pivot_df.fillna(pivot_df.mean())
-            
-            # Remove countries or indicators with too many missing values
-            # Keep only countries with at least 50% data coverage
-            country_coverage = pivot_df.notna().sum(axis=1) / len(pivot_df.columns)
-            valid_countries = country_coverage[country_coverage >= 0.5].index
-            pivot_df = pivot_df.loc[valid_countries]
+            values = matrix_df.to_numpy(dtype=np.float32)
+            present = ~np.isnan(values)
+            
+            # Dropping countries lowers the coverage of indicators they held, so
+            # alternate the two filters until neither drops anything more
+            keep_indicators = np.ones(values.shape[1], dtype=bool)
+            keep_countries = np.ones(values.shape[0], dtype=bool)
+            while True:
+                indicator_coverage = (present[keep_countries].mean(axis=0) if keep_countries.any()
+                                      else np.zeros(values.shape[1]))
+                indicators_left = keep_indicators & (indicator_coverage >= MIN_INDICATOR_COVERAGE)
+                country_coverage = (present[:, indicators_left].mean(axis=1) if indicators_left.any()
+                                    else np.zeros(len(values)))
+                countries_left = keep_countries & (country_coverage >= MIN_COUNTRY_COVERAGE)
+                if (indicators_left == keep_indicators).all() and (countries_left == keep_countries).all():
+                    break
+                keep_indicators, keep_countries = indicators_left, countries_left
+            
+            coverage = {
+                'observations': int(matrix_df.attrs.get('observations', present.sum())),
+                'countries_total': int(values.shape[0]),
+                'indicators_total': int(values.shape[1]),
+                'min_indicator_coverage': MIN_INDICATOR_COVERAGE,
+                'min_country_coverage': MIN_COUNTRY_COVERAGE,
+                'dropped_indicators': [str(ind) for ind in matrix_df.columns[~keep_indicators]],
+                'dropped_countries': [str(c) for c in matrix_df.index[~keep_countries]]
+            }
             
-            # Keep only indicators with at least 50% data coverage
-            indicator_coverage = pivot_df.notna().sum(axis=0) / len(pivot_df.index)
-            valid_indicators = indicator_coverage[indicator_coverage >= 0.5].index
-            pivot_df = pivot_df[valid_indicators]
+            countries = list(matrix_df.index[keep_countries])
+            indicators = list(matrix_df.columns[keep_indicators])
+            logger.info(f"SOM matrix prepared: {len(countries)} countries × {len(indicators)} indicators "
+                        f"({len(coverage['dropped_countries'])} countries, "
+                        f"{len(coverage['dropped_indicators'])} indicators dropped for low coverage)")
             
-            # Final fill of any remaining NaN values
-            pivot_df = pivot_df.fillna(pivot_df.mean())
+            if not countries or not indicators:
+                empty = pd.DataFrame()
+                empty.attrs['coverage'] = coverage
+                empty.attrs['missing'] = np.zeros((0, 0), dtype=bool)
+                return np.array([]), [], [], empty
             
-            logger.info(f"SOM matrix prepared: {pivot_df.shape[0]} countries × {pivot_df.shape[1]} indicators")
+            # Fill the remaining gaps with column means, in place
+            values = values[np.ix_(keep_countries, keep_indicators)]
+            missing = np.isnan(values)
+            if missing.any():
+                values[missing] = np.take(np.nanmean(values, axis=0), np.nonzero(missing)[1])
             
-            if pivot_df.empty:
-                return np.array([]), [], [], pd.DataFrame()
+            pivot_df = pd.DataFrame(values, index=countries, columns=indicators, copy=False)
+            pivot_df.attrs['coverage'] = coverage
+            pivot_df.attrs['missing'] = missing
             
-            # Normalize the data
-            scaler = StandardScaler()
-            normalized_data = scaler.fit_transform(pivot_df.values)
-            
-            countries = list(pivot_df.index)
-            indicators = list(pivot_df.columns)
+            mean, scale = KohonenService.standardisation(values)
+            normalized_data = (values - mean) / scale
             
             logger.info(f"Data normalized for SOM training")
             
@@ -216,29 +259,35 @@ class KohonenService:
             raise
 
     @staticmethod
-    def train_som(normalized_data: np.ndarray, map_size: Tuple[int, int] = (6, 6), 
-                  iterations: int = 500) -> MiniSom:
+    def standardisation(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Column (mean, scale) used to normalise a gap-filled matrix, like
+        StandardScaler: unit variance, constant columns scaled by 1 (left at 0)
+        """
+        scale = values.std(axis=0)
+        scale[scale == 0] = 1.0
+        return values.mean(axis=0), scale
+
+    @staticmethod
+    def train_som(normalized_data: np.ndarray, map_size: Tuple[int, int] = DEFAULT_MAP_SIZE,
+                  iterations: int = DEFAULT_ITERATIONS, sigma: float = DEFAULT_SIGMA,
+                  learning_rate: float = DEFAULT_LEARNING_RATE, random_seed: int = DEFAULT_SEED,
+                  engine: str = DEFAULT_ENGINE) -> 'MiniSom':
         """
-        Train the Self-Organizing Map
+        Train the Self-Organizing Map.
+        engine='online' runs MiniSom.train for `iterations` single-sample updates.
+        engine='batch' runs train_batch_som with `iterations` as the epoch cap,
+        stopping early once quantization error plateaus; learning_rate is unused.
         """
         try:
             if normalized_data.size == 0:
                 logger.warning("Empty data provided for SOM training")
                 return None
             
-            logger.info(f"Training SOM with map size {map_size} for {iterations} iterations")
-            
-            # Create SOM
-            som = MiniSom(
-                map_size[0], map_size[1], 
-                normalized_data.shape[1],
-                sigma=1.0, 
-                learning_rate=0.5,
-                random_seed=42
-            )
+            logger.info(f"Training SOM ({engine}) with map size {map_size} for {iterations} iterations")
             
-            # Train SOM
-            som.train(normalized_data, iterations)
+            # Create and train SOM
+            som = train_som_model(normalized_data, map_size, iterations, sigma, learning_rate, random_seed, engine)
             
             logger.info("SOM training completed successfully")
             return som
@@ -248,9 +297,198 @@ class KohonenService:
             raise
 
     @staticmethod
-    def calculate_som_quality_metrics(som: MiniSom, normalized_data: np.ndarray) -> Dict:
+    def load_som_dataset(generation: int):
         """
-        Calculate SOM quality metrics
+        Prepared (normalized_data, countries, indicators, pivot_df) for a data
+        generation, built once and shared through the model registry.
+        None when there is no economic data at all.
+        """
+        def load():
+            df = KohonenService.get_economic_data_for_som()
+            if df.empty:
+                return None
+            prepared = KohonenService.prepare_som_matrix(df)
+            # Raw matrix for the next generation's incremental refresh to diff against
+            som_registry.save_snapshot(generation, prepared[3].values, prepared[1], prepared[2],
+                                       prepared[3].attrs['missing'])
+            return prepared
+
+        return som_registry.dataset(generation, load)
+
+    @staticmethod
+    def som_from_weights(weights: np.ndarray, key: SomModelKey) -> 'MiniSom':
+        """MiniSom wrapper around registry weights, ready for winner/distance_map"""
+        from minisom import MiniSom
+
+        som = MiniSom(
+            key.rows, key.cols, weights.shape[2],
+            sigma=key.sigma,
+            learning_rate=key.learning_rate,
+            random_seed=key.seed
+        )
+        som._weights = weights
+        return som
+
+    @staticmethod
+    def resolve_som_model(map_size: Tuple[int, int] = DEFAULT_MAP_SIZE, iterations: int = DEFAULT_ITERATIONS,
+                          sigma: float = DEFAULT_SIGMA, learning_rate: float = DEFAULT_LEARNING_RATE,
+                          seed: int = DEFAULT_SEED, engine: str = DEFAULT_ENGINE
+                          ) -> Tuple[Optional[tuple], Optional[SomModelKey]]:
+        """(dataset, registry key) for the current data generation; key is None without usable data"""
+        generation = response_cache.current_generation()
+        dataset = KohonenService.load_som_dataset(generation)
+        if dataset is None or dataset[0].size == 0:
+            return dataset, None
+        key = SomModelKey(generation, int(map_size[0]), int(map_size[1]), int(iterations),
+                          float(sigma), float(learning_rate), int(seed), engine)
+        return dataset, key
+
+    @staticmethod
+    def get_trained_som(map_size: Tuple[int, int] = DEFAULT_MAP_SIZE, iterations: int = DEFAULT_ITERATIONS,
+                        sigma: float = DEFAULT_SIGMA, learning_rate: float = DEFAULT_LEARNING_RATE,
+                        seed: int = DEFAULT_SEED, engine: str = DEFAULT_ENGINE
+                        ) -> Tuple[Optional['MiniSom'], Optional[tuple], Optional[SomModelKey], bool]:
+        """
+        Trained SOM for the current data generation: (som, dataset, key, trained).
+        The map is trained at most once per key and then served from the registry.
+        With incremental refresh enabled a warm-started map may be served instead,
+        under its own key. som is None when the dataset is missing (None) or empty.
+        """
+        dataset, key = KohonenService.resolve_som_model(map_size, iterations, sigma, learning_rate, seed, engine)
+        if key is None:
+            return None, dataset, None, False
+
+        weights, key, trained, _ = KohonenService.get_or_refresh(dataset, key, som_registry.incremental)
+        return KohonenService.som_from_weights(weights, key), dataset, key, trained
+
+    @staticmethod
+    def get_or_refresh(dataset: tuple, key: SomModelKey, incremental: bool
+                       ) -> Tuple[np.ndarray, SomModelKey, bool, Dict]:
+        """
+        (weights, key, trained, report) for a from-scratch key. A full map
+        already in the registry always wins. Otherwise, when incremental and
+        warm_start_base finds a base, the map is warm-started and stored under
+        the refreshed key that is returned; failing that it is trained fully.
+        """
+        base = None
+        if incremental and som_registry.get(key) is None:
+            base = KohonenService.warm_start_base(dataset, key)
+            if base is not None:
+                key = key._replace(refreshes=base[0].refreshes + 1)
+
+        report = {'mode': 'current'}
+
+        def train():
+            if base is not None:
+                weights, made = KohonenService.warm_start_weights(dataset, key, base)
+                report.update(made)
+                return weights
+            som = KohonenService.train_som(dataset[0], (key.rows, key.cols), key.iterations,
+                                           key.sigma, key.learning_rate, key.seed, key.engine)
+            report['mode'] = 'full'
+            return som.get_weights()
+
+        weights, trained = som_registry.get_or_train(key, train)
+        return weights, key, trained, report
+
+    @staticmethod
+    def warm_start_base(dataset: tuple, key: SomModelKey) -> Optional[Tuple[SomModelKey, np.ndarray, tuple]]:
+        """
+        (base key, base weights, snapshot) to warm-start key from: the same map
+        on the previous generation, preferring a full training over a refreshed
+        one. None, so the caller trains fully, for the batch engine (its maps
+        are not fine-tuned with the online update), without a previous map or
+        snapshot, when the indicator set changed, or when the only base has
+        already been refreshed MAX_CHAINED_REFRESHES times in a row.
+        """
+        if key.engine != 'online':
+            return None
+        previous = som_registry.previous_generation(key.generation)
+        if previous is None:
+            return None
+        snapshot = som_registry.load_snapshot(previous)
+        if snapshot is None:
+            return None
+        if [str(indicator) for indicator in dataset[2]] != snapshot[2]:
+            logger.info("Indicator set changed since the last generation; full SOM retrain")
+            return None
+
+        for refreshes in range(MAX_CHAINED_REFRESHES):
+            base_key = key._replace(generation=previous, refreshes=refreshes)
+            base_weights = som_registry.get(base_key)
+            if base_weights is not None:
+                return base_key, base_weights, snapshot
+        return None
+
+    @staticmethod
+    def warm_start_weights(dataset: tuple, key: SomModelKey, base: tuple) -> Tuple[np.ndarray, Dict]:
+        """
+        Incremental refresh after a reload, from a warm_start_base result. The
+        base map is moved from the previous generation's normalised space into
+        the current one (the column means and scales both differ), then
+        fine-tuned only on the countries whose input row changed or appeared,
+        for REFRESH_ITERATIONS_PER_ROW steps each at a reduced learning rate.
+        Rows are compared before gap filling, so a country is not touched just
+        because the column means used to fill its gaps moved.
+        BMUs are recomputed for those countries only.
+        """
+        base_key, base_weights, snapshot = base
+        normalized_data, countries, indicators, pivot_df = dataset
+        old_values, old_countries, old_indicators, old_missing = snapshot
+
+        old_mean, old_scale = KohonenService.standardisation(np.asarray(old_values, dtype=np.float32))
+        new_mean, new_scale = KohonenService.standardisation(pivot_df.values)
+        start = (np.asarray(base_weights, dtype=np.float64) * old_scale + old_mean - new_mean) / new_scale
+
+        old_rows = {country: i for i, country in enumerate(old_countries)}
+        raw = np.where(pivot_df.attrs['missing'], np.nan, pivot_df.values)
+        old_raw = np.where(old_missing, np.nan, old_values)
+        touched = [
+            i for i, country in enumerate(countries)
+            if str(country) not in old_rows
+            or not np.allclose(raw[i], old_raw[old_rows[str(country)]], equal_nan=True)
+        ]
+        removed = sorted(set(old_countries) - {str(country) for country in countries})
+
+        weights = start
+        steps = 0
+        moves = []
+        if touched:
+            rows = normalized_data[touched]
+            steps = min(key.iterations, REFRESH_ITERATIONS_PER_ROW * len(touched))
+            som = KohonenService.som_from_weights(
+                start.copy(), key._replace(learning_rate=key.learning_rate * REFRESH_LEARNING_RATE_SCALE)
+            )
+            som.train(rows, steps)
+            weights = som.get_weights()
+
+            before = som_metrics(start, rows)['bmu'].tolist()
+            after = som_metrics(weights, rows)['bmu'].tolist()
+            moves = [
+                {'country': str(countries[i]), 'from': old if str(countries[i]) in old_rows else None, 'to': new}
+                for i, old, new in zip(touched, before, after)
+            ]
+
+        logger.info(f"SOM warm-started from generation {base_key.generation} "
+                    f"(refresh {key.refreshes} of {MAX_CHAINED_REFRESHES}): "
+                    f"{len(touched)} changed countries, {steps} fine-tuning steps")
+        return weights, {
+            'mode': 'incremental',
+            'base_generation': base_key.generation,
+            'base_model_id': base_key.digest,
+            'chained_refreshes': key.refreshes,
+            'changed_countries': len(touched),
+            'removed_countries': removed,
+            'fine_tune_iterations': steps,
+            'bmu_changes': moves
+        }
+
+    @staticmethod
+    def calculate_som_quality_metrics(som: 'MiniSom', normalized_data: np.ndarray,
+                                      metrics: Optional[Dict] = None) -> Dict:
+        """
+        Calculate SOM quality metrics. Pass the som_metrics result when the
+        caller already has it, so the distance matrix is built only once.
         """
         try:
             if som is None or normalized_data.size == 0:
@@ -260,28 +498,10 @@ class KohonenService:
                     'training_quality': 'poor'
                 }
             
-            # Calculate quantization error
-            quantization_error = som.quantization_error(normalized_data)
-            
-            # Calculate topographic error (simplified version)
-            topographic_error = 0.0
-            for data_point in normalized_data:
-                winner = som.winner(data_point)
-                # Find second best matching unit
-                distances = []
-                for i in range(som._weights.shape[0]):
-                    for j in range(som._weights.shape[1]):
-                        if (i, j) != winner:
-                            dist = np.linalg.norm(data_point - som._weights[i, j])
-                            distances.append(((i, j), dist))
-                
-                if distances:
-                    second_winner = min(distances, key=lambda x: x[1])[0]
-                    # Check if winner and second winner are neighbors
-                    if abs(winner[0] - second_winner[0]) + abs(winner[1] - second_winner[1]) > 1:
-                        topographic_error += 1
-            
-            topographic_error /= len(normalized_data)
+            if metrics is None:
+                metrics = som_metrics(som._weights, normalized_data)
+            quantization_error = metrics['quantization_error']
+            topographic_error = metrics['topographic_error']
             
             # Determine training quality
             if quantization_error < 0.5 and topographic_error < 0.1:
@@ -308,9 +528,9 @@ class KohonenService:
             }
 
     @staticmethod
-    def perform_cluster_analysis(som: MiniSom, normalized_data: np.ndarray, 
+    def perform_cluster_analysis(som: 'MiniSom', normalized_data: np.ndarray, 
                                 countries: List[str], indicators: List[str], 
-                                pivot_df: pd.DataFrame) -> Dict:
+                                pivot_df: pd.DataFrame, metrics: Optional[Dict] = None) -> Dict:
         """
         Perform cluster analysis on SOM results
         """
@@ -319,11 +539,12 @@ class KohonenService:
                 return {'clusters': {}, 'regional_data': [], 'cluster_stats': {}}
             
             # Get SOM positions for each country
+            if metrics is None:
+                metrics = som_metrics(som._weights, normalized_data)
             regional_data = []
             position_to_countries = defaultdict(list)
             
-            for i, data_point in enumerate(normalized_data):
-                winner = som.winner(data_point)
+            for i, winner in enumerate(metrics['bmu'].tolist()):
                 country = countries[i]
                 
                 # Get indicator values for this country
@@ -380,143 +601,252 @@ class KohonenService:
             return {'clusters': {}, 'regional_data': [], 'cluster_stats': {}}
 
     @staticmethod
-    def get_kohonen_analysis() -> Dict:
+    def build_analysis_data(som: 'MiniSom', dataset: tuple, key: SomModelKey, trained: bool,
+                            metrics: Optional[Dict] = None) -> Dict:
+        """Analysis payload for one trained map; pass som_metrics output if already computed"""
+        normalized_data, countries, indicators, pivot_df = dataset
+        
+        # Step 4: Generate SOM visualizations
+        distance_map = som.distance_map().T.tolist()
+        
+        # BMUs, hit map and errors all come from one distance matrix
+        if metrics is None:
+            metrics = som_metrics(som._weights, normalized_data)
+        hit_map = metrics['hit_map'].T.tolist()
+        
+        # Step 5: Calculate quality metrics
+        quality_metrics = KohonenService.calculate_som_quality_metrics(som, normalized_data, metrics)
+        
+        # Step 6: Perform cluster analysis
+        cluster_analysis = KohonenService.perform_cluster_analysis(
+            som, normalized_data, countries, indicators, pivot_df, metrics
+        )
+        
+        # Step 7: Create the response data structure that matches frontend expectations
+        return {
+            'som_analysis': {
+                'distance_map': distance_map,
+                'hit_map': hit_map,
+                'map_size': [int(som._weights.shape[0]), int(som._weights.shape[1])],
+                'training_iterations': int(key.iterations),
+                'quantization_error': quality_metrics['quantization_error'],
+                'topographic_error': quality_metrics['topographic_error']
+            },
+            'regional_data': cluster_analysis['regional_data'],
+            'clusters': cluster_analysis['clusters'],
+            'indicators': [str(ind) for ind in indicators],
+            'summary': {
+                'total_countries': len(countries),
+                'total_indicators': len(indicators),
+                'data_coverage': len(countries) * len(indicators),
+                'training_quality': quality_metrics['training_quality']
+            },
+            'coverage': pivot_df.attrs.get('coverage'),
+            'model': {**key.as_dict(), 'trained': trained}
+        }
+
+    @staticmethod
+    def get_kohonen_analysis(map_size: Tuple[int, int] = DEFAULT_MAP_SIZE,
+                             iterations: int = DEFAULT_ITERATIONS, engine: str = DEFAULT_ENGINE) -> Dict:
         """
         Main method to get complete Kohonen analysis with proper data structure
         """
         try:
             logger.info("Starting Kohonen analysis")
             
-            # Step 1: Get economic data
-            df = KohonenService.get_economic_data_for_som()
-            if df.empty:
+            # Steps 1-3: Prepared data and trained SOM, shared through the registry
+            som, dataset, key, trained = KohonenService.get_trained_som(map_size, iterations, engine=engine)
+            if dataset is None:
                 return {
                     'status': 'error',
                     'message': 'No economic data available for analysis'
                 }
-            
-            # Step 2: Prepare SOM matrix
-            normalized_data, countries, indicators, pivot_df = KohonenService.prepare_som_matrix(df)
-            if normalized_data.size == 0:
+            if som is None:
                 return {
                     'status': 'error',
-                    'message': 'Insufficient data for SOM analysis'
+                    'message': 'Insufficient data for SOM analysis',
+                    'coverage': dataset[3].attrs.get('coverage')
                 }
             
-            # Step 3: Train SOM
-            map_size = (6, 6)
-            iterations = 500
-            som = KohonenService.train_som(normalized_data, map_size, iterations)
-            if som is None:
+            # Steps 4-7: Maps, quality metrics, clusters and response structure
+            # NumPy values are left for the app's JSON provider to encode
+            result_data = KohonenService.build_analysis_data(som, dataset, key, trained)
+            
+            logger.info("Kohonen analysis completed successfully")
+            
+            return {
+                'status': 'success',
+                'data': result_data
+            }
+            
+        except Exception as e:
+            logger.error(f"Error in Kohonen analysis: {str(e)}")
+            return {
+                'status': 'error',
+                'message': f'Analysis failed: {str(e)}'
+            }
+
+    @staticmethod
+    def get_kohonen_ensemble(map_size: Tuple[int, int] = DEFAULT_MAP_SIZE, iterations: int = DEFAULT_ITERATIONS,
+                             engine: str = DEFAULT_ENGINE, ensemble_size: int = DEFAULT_ENSEMBLE_SIZE) -> Dict:
+        """
+        Analyse ensemble_size maps that differ only in seed and report how
+        stable the country clusters are across them. Members missing from the
+        registry are queued as ordinary SOM jobs, in parallel on the worker
+        pool, and the result is 'pending' with those jobs; repeat the request
+        once they finish. With every member trained, returns the full analysis
+        of the member with the lowest quantization error, plus per-member
+        errors, the country co-clustering matrix and per-country stability.
+        """
+        try:
+            logger.info(f"Starting Kohonen ensemble analysis with {ensemble_size} maps")
+            
+            dataset, base_key = KohonenService.resolve_som_model(map_size, iterations, engine=engine)
+            if dataset is None:
+                return {
+                    'status': 'error',
+                    'message': 'No economic data available for analysis'
+                }
+            if base_key is None:
                 return {
                     'status': 'error',
-                    'message': 'Failed to train SOM'
+                    'message': 'Insufficient data for SOM analysis',
+                    'coverage': dataset[3].attrs.get('coverage')
                 }
+            normalized_data, countries = dataset[0], dataset[1]
             
-            # Step 4: Generate SOM visualizations
-            distance_map = som.distance_map().T.tolist()
+            keys = [base_key._replace(seed=base_key.seed + i) for i in range(ensemble_size)]
+            jobs = som_jobs.submit_many(keys, normalized_data)
+            if jobs:
+                return {
+                    'status': 'pending',
+                    'message': f'{len(jobs)} of {ensemble_size} ensemble maps still training; repeat the request for the result',
+                    'jobs': jobs
+                }
             
-            # Hit map
-            hit_map = np.zeros((som._weights.shape[0], som._weights.shape[1]))
-            for data_point in normalized_data:
-                winner = som.winner(data_point)
-                hit_map[winner] += 1
-            hit_map = hit_map.T.tolist()
+            member_weights = [som_registry.get(key) for key in keys]
+            if any(weights is None for weights in member_weights):
+                raise RuntimeError('Ensemble maps were removed from the registry before they could be read')
+            member_metrics = [som_metrics(weights, normalized_data) for weights in member_weights]
             
-            # Step 5: Calculate quality metrics
-            quality_metrics = KohonenService.calculate_som_quality_metrics(som, normalized_data)
+            best = int(np.argmin([metrics['quantization_error'] for metrics in member_metrics]))
+            together = co_clustering([metrics['bmu_index'] for metrics in member_metrics])
+            stability = cluster_stability(together)
             
-            # Step 6: Perform cluster analysis
-            cluster_analysis = KohonenService.perform_cluster_analysis(
-                som, normalized_data, countries, indicators, pivot_df
+            som = KohonenService.som_from_weights(member_weights[best], keys[best])
+            result_data = KohonenService.build_analysis_data(
+                som, dataset, keys[best], False, member_metrics[best]
             )
-            
-            # Step 7: Create the response data structure that matches frontend expectations
-            result_data = {
-                'som_analysis': {
-                    'distance_map': distance_map,
-                    'hit_map': hit_map,
-                    'map_size': [int(som._weights.shape[0]), int(som._weights.shape[1])],
-                    'training_iterations': int(iterations),
-                    'quantization_error': quality_metrics['quantization_error'],
-                    'topographic_error': quality_metrics['topographic_error']
-                },
-                'regional_data': cluster_analysis['regional_data'],
-                'clusters': cluster_analysis['clusters'],
-                'indicators': [str(ind) for ind in indicators],
-                'summary': {
-                    'total_countries': len(countries),
-                    'total_indicators': len(indicators),
-                    'data_coverage': len(countries) * len(indicators),
-                    'training_quality': quality_metrics['training_quality']
-                }
+            result_data['ensemble'] = {
+                'size': ensemble_size,
+                'best_seed': keys[best].seed,
+                'members': [
+                    {
+                        'seed': key.seed,
+                        'model_id': key.digest,
+                        'quantization_error': metrics['quantization_error'],
+                        'topographic_error': metrics['topographic_error']
+                    }
+                    for key, metrics in zip(keys, member_metrics)
+                ],
+                'countries': [str(country) for country in countries],
+                'co_clustering': np.round(together, 4),
+                'country_stability': {str(country): round(float(score), 4) for country, score in zip(countries, stability)},
+                'mean_stability': float(stability.mean())
             }
             
-            # Step 8: Convert all data to JSON-safe types
-            clean_data = convert_for_json(result_data)
-            
-            result = {
+            logger.info("Kohonen ensemble analysis completed successfully")
+            return {
                 'status': 'success',
-                'data': clean_data
+                'data': result_data
             }
             
-            # Test JSON serialization
-            json.dumps(result)
-            logger.info("Kohonen analysis completed successfully")
+        except JobQueueFull as e:
+            return {
+                'status': 'busy',
+                'message': str(e)
+            }
+        except Exception as e:
+            logger.error(f"Error in Kohonen ensemble analysis: {str(e)}")
+            return {
+                'status': 'error',
+                'message': f'Ensemble analysis failed: {str(e)}'
+            }
+
+    @staticmethod
+    def refresh_som(map_size: Tuple[int, int] = DEFAULT_MAP_SIZE, iterations: int = DEFAULT_ITERATIONS,
+                    engine: str = DEFAULT_ENGINE) -> Dict:
+        """
+        Bring the map for these parameters up to the current data generation,
+        warm-starting from the previous generation's map where possible. A
+        warm-started map is stored under its own refreshed key (returned as
+        'model'); the from-scratch key for these parameters is left untouched.
+        """
+        try:
+            dataset, key = KohonenService.resolve_som_model(map_size, iterations, engine=engine)
+            if dataset is None:
+                return {
+                    'status': 'error',
+                    'message': 'No data available for refresh'
+                }
+            if key is None:
+                return {
+                    'status': 'error',
+                    'message': 'Insufficient data for refresh'
+                }
             
-            return result
+            _, key, trained, report = KohonenService.get_or_refresh(dataset, key, incremental=True)
+            
+            return {
+                'status': 'success',
+                'message': 'SOM is up to date' if not trained else f"SOM refreshed ({report['mode']})",
+                'refresh': report,
+                'model': {**key.as_dict(), 'trained': trained}
+            }
             
         except Exception as e:
-            logger.error(f"Error in Kohonen analysis: {str(e)}")
+            logger.error(f"Error refreshing SOM: {str(e)}")
             return {
                 'status': 'error',
-                'message': f'Analysis failed: {str(e)}'
+                'message': f'Refresh failed: {str(e)}'
             }
 
     @staticmethod
-    def retrain_som(map_size: Tuple[int, int] = (6, 6), iterations: int = 500) -> Dict:
+    def retrain_som(map_size: Tuple[int, int] = DEFAULT_MAP_SIZE, iterations: int = DEFAULT_ITERATIONS,
+                    engine: str = DEFAULT_ENGINE) -> Dict:
         """
-        Retrain SOM with new parameters
+        Retrain SOM with new parameters. The trained map is kept in the registry,
+        so analysis and visualization requests with the same parameters reuse it.
         """
         try:
             logger.info(f"Retraining SOM with map_size={map_size}, iterations={iterations}")
             
-            # Get fresh data
-            df = KohonenService.get_economic_data_for_som()
-            if df.empty:
+            som, dataset, key, trained = KohonenService.get_trained_som(map_size, iterations, engine=engine)
+            if dataset is None:
                 return {
                     'status': 'error',
                     'message': 'No data available for retraining'
                 }
-            
-            # Prepare data
-            normalized_data, countries, indicators, pivot_df = KohonenService.prepare_som_matrix(df)
-            if normalized_data.size == 0:
-                return {
-                    'status': 'error',
-                    'message': 'Insufficient data for retraining'
-                }
-            
-            # Train with new parameters
-            som = KohonenService.train_som(normalized_data, map_size, iterations)
             if som is None:
                 return {
                     'status': 'error',
-                    'message': 'Failed to retrain SOM'
+                    'message': 'Insufficient data for retraining'
                 }
             
-            logger.info("SOM retrained successfully")
+            logger.info("SOM retrained successfully" if trained else "SOM already trained for these parameters")
             
             result = {
                 'status': 'success',
                 'message': 'SOM retrained successfully',
                 'new_parameters': {
-                    'map_size': [int(map_size[0]), int(map_size[1])],
-                    'iterations': int(iterations)
-                }
+                    'map_size': [int(key.rows), int(key.cols)],
+                    'iterations': int(key.iterations),
+                    'engine': key.engine
+                },
+                'model': {**key.as_dict(), 'trained': trained}
             }
             
-            return convert_for_json(result)
+            return result
             
         except Exception as e:
             logger.error(f"Error retraining SOM: {str(e)}")
@@ -525,3 +855,61 @@ class KohonenService:
                 'message': f'Retraining failed: {str(e)}'
             }
 
+    @staticmethod
+    def submit_training_job(map_size: Tuple[int, int] = DEFAULT_MAP_SIZE, iterations: int = DEFAULT_ITERATIONS,
+                            engine: str = DEFAULT_ENGINE) -> Dict:
+        """
+        Queue SOM training in a worker process instead of the request. Once the
+        job succeeds, get_kohonen_analysis with the same parameters is served
+        from the registry.
+        """
+        try:
+            dataset, key = KohonenService.resolve_som_model(map_size, iterations, engine=engine)
+            if key is None:
+                return {
+                    'status': 'error',
+                    'message': 'Insufficient data for SOM training'
+                }
+            
+            job = som_jobs.submit(key, dataset[0])
+            return {
+                'status': 'success',
+                'job': job
+            }
+            
+        except JobQueueFull as e:
+            return {
+                'status': 'busy',
+                'message': str(e)
+            }
+        except Exception as e:
+            logger.error(f"Error submitting SOM job: {str(e)}")
+            return {
+                'status': 'error',
+                'message': f'Job submission failed: {str(e)}'
+            }
+
+    @staticmethod
+    def get_training_job_result(job_id: str) -> Optional[Dict]:
+        """
+        Analysis for a finished job, or a status dict saying why there is none
+        yet; None when the job id is unknown.
+        """
+        job = som_jobs.get(job_id)
+        if job is None:
+            return None
+        if job['status'] != 'succeeded':
+            return {
+                'status': 'pending' if job['status'] in ('queued', 'running') else job['status'],
+                'message': f"Job is {job['status']}",
+                'job': job
+            }
+        
+        key = som_jobs.job_key(job_id)
+        if key.generation != response_cache.current_generation():
+            return {
+                'status': 'stale',
+                'message': 'Data was reloaded after this job was trained; submit a new job',
+                'job': job
+            }
+        return KohonenService.get_kohonen_analysis((key.rows, key.cols), key.iterations, key.engine)
@@ -0,0 +1,125 @@
+from collections import OrderedDict
+from typing import Optional, Tuple
+import io
+import struct
+import threading
+import zlib
+import numpy as np
+
+# Anchor colours (RGB, 0-255) sampled from Matplotlib's maps; the 256-entry
+# lookup tables are linear interpolations between them
+COLORMAP_ANCHORS = {
+    'viridis': [
+        (68, 1, 84), (72, 40, 120), (62, 74, 137), (49, 104, 142), (38, 130, 142),
+        (31, 158, 137), (53, 183, 121), (110, 206, 88), (181, 222, 43), (253, 231, 37)
+    ],
+    'Blues': [
+        (247, 251, 255), (222, 235, 247), (198, 219, 239), (158, 202, 225), (107, 174, 214),
+        (66, 146, 198), (33, 113, 181), (8, 81, 156), (8, 48, 107)
+    ]
+}
+
+IMAGE_FORMATS = ('png', 'webp')
+
+_luts = {}
+
+
+def colormap_lut(name: str) -> np.ndarray:
+    """(256, 3) uint8 lookup table for a colormap in COLORMAP_ANCHORS"""
+    lut = _luts.get(name)
+    if lut is None:
+        anchors = np.asarray(COLORMAP_ANCHORS[name], dtype=np.float64)
+        positions = np.linspace(0.0, 1.0, len(anchors))
+        steps = np.linspace(0.0, 1.0, 256)
+        lut = np.stack([np.interp(steps, positions, anchors[:, c]) for c in range(3)], axis=1)
+        lut = _luts[name] = np.rint(lut).astype(np.uint8)
+    return lut
+
+
+def colorize(grid: np.ndarray, colormap: str, cell: int) -> np.ndarray:
+    """
+    (H, W, 3) uint8 image of a map grid, laid out like imshow(grid.T, origin='lower'):
+    map rows run left to right, map columns bottom to top. Each neuron
+    becomes a cell x cell block (nearest-neighbour upscaling).
+    """
+    values = np.asarray(grid, dtype=np.float64).T[::-1]
+    finite = np.isfinite(values)
+    low = values[finite].min() if finite.any() else 0.0
+    high = values[finite].max() if finite.any() else 0.0
+    span = high - low if high > low else 1.0
+    scaled = np.where(finite, (values - low) / span, 0.0)
+    pixels = colormap_lut(colormap)[np.rint(scaled * 255).astype(np.uint8)]
+    return np.repeat(np.repeat(pixels, cell, axis=0), cell, axis=1)
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff)
+
+
+def encode_png(pixels: np.ndarray) -> bytes:
+    """Minimal 8-bit RGB PNG encoder (zlib only)"""
+    height, width = pixels.shape[:2]
+    # Filter type 0 (None) in front of every scanline
+    raw = np.zeros((height, width * 3 + 1), dtype=np.uint8)
+    raw[:, 1:] = pixels.reshape(height, width * 3)
+    return b''.join([
+        b'\x89PNG\r\n\x1a\n',
+        _png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)),
+        _png_chunk(b'IDAT', zlib.compress(raw.tobytes(), 6)),
+        _png_chunk(b'IEND', b'')
+    ])
+
+
+def encode_webp(pixels: np.ndarray) -> bytes:
+    """Lossless WebP; needs Pillow, which is only imported when WebP is asked for"""
+    from PIL import Image
+    buffer = io.BytesIO()
+    Image.fromarray(pixels, 'RGB').save(buffer, format='WEBP', lossless=True)
+    return buffer.getvalue()
+
+
+def render_map(grid: np.ndarray, colormap: str, size: int, image_format: str = 'png') -> bytes:
+    """Encoded image of grid, about size pixels along the longer map side"""
+    cell = max(1, size // max(grid.shape))
+    pixels = colorize(grid, colormap, cell)
+    return encode_webp(pixels) if image_format == 'webp' else encode_png(pixels)
+
+
+class ImageCache:
+    """Size-bounded LRU of rendered images; keys include the model key, so entries never go stale"""
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0}
+
+    def get(self, key: Tuple) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return body
+
+    def set(self, key: Tuple, body: bytes):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= len(self._entries.pop(key))
+            self._entries[key] = body
+            self._bytes += len(body)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, 'entries': len(self._entries), 'bytes': self._bytes, 'max_bytes': self.max_bytes}
+
+
+image_cache = ImageCache()
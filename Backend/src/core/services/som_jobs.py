@@ -0,0 +1,360 @@
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+import json
+import logging
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+import numpy as np
+from src.core.services.som_registry import SomModelKey, som_registry
+from src.core.services.som_training import TrainingCancelled, train_som_model
+
+try:
+    import fcntl
+except ImportError:  # Not POSIX: only threads within one process are serialised
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ('queued', 'running', 'cancelling')
+JOB_ID = re.compile(r'[0-9a-f]{32}')
+
+# Per job under the jobs directory: the record (written by web workers only),
+# progress (written by the training process only) and the cancel flag
+RECORD_SUFFIX = '.json'
+PROGRESS_SUFFIX = '.progress'
+CANCEL_SUFFIX = '.cancel'
+
+
+class JobQueueFull(Exception):
+    """Raised by submit and submit_many when max_pending jobs are already queued or running"""
+
+
+def read_json(path: str) -> Optional[Dict]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_json(path: str, data: Dict):
+    """Replace path atomically, so readers in other processes never see a partial file"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def run_training_job(job_id: str, data: np.ndarray, key: SomModelKey, jobs_dir: Optional[str]) -> np.ndarray:
+    """
+    Worker-process entry point: train the map for key and return its weights.
+    The start time and progress go to <job_id>.progress under jobs_dir; once
+    <job_id>.cancel exists the run stops before it starts or at the next
+    progress step. With jobs_dir=None nothing is reported.
+    """
+    if jobs_dir is not None:
+        progress_path = os.path.join(jobs_dir, job_id + PROGRESS_SUFFIX)
+        cancel_path = os.path.join(jobs_dir, job_id + CANCEL_SUFFIX)
+        if os.path.exists(cancel_path):
+            raise TrainingCancelled(job_id)
+        started_at = time.time()
+        write_json(progress_path, {'started_at': started_at, 'done': 0})
+
+    def progress(done: int, total: int):
+        if os.path.exists(cancel_path):
+            raise TrainingCancelled(job_id)
+        write_json(progress_path, {'started_at': started_at, 'done': done})
+
+    som = train_som_model(data, (key.rows, key.cols), key.iterations, key.sigma,
+                          key.learning_rate, key.seed, key.engine,
+                          progress=progress if jobs_dir is not None else None)
+    return np.asarray(som.get_weights())
+
+
+class SomJobQueue:
+    """
+    Background SOM training on a ProcessPoolExecutor, so large maps do not run
+    inside an HTTP request. Finished weights go into the model registry, where
+    the analysis and visualization endpoints pick them up by key.
+
+    Concurrency is bounded twice: max_workers training processes per web
+    worker, and at most max_pending jobs queued or running on the host before
+    submit refuses new work.
+
+    Job records are JSON files in a jobs/ directory next to the registry's
+    models, so any web worker on the host can report, list or cancel a job,
+    whichever worker accepted it. Writers hold an flock on the directory.
+    The accepting worker owns the future; if it exits before the job ends,
+    the job is reported as failed.
+    """
+
+    def __init__(self):
+        self.max_workers = os.cpu_count() or 1
+        self.max_pending = 16
+        self.max_finished = 100
+        self.jobs_dir = None
+
+        # Futures of the jobs this process accepted, by job id
+        self._futures = {}
+        # Re-entrant: Future.cancel runs done callbacks (which lock) synchronously
+        self._lock = threading.RLock()
+        self._lock_depth = 0
+        self._executor = None
+
+    def init_app(self, app):
+        self.max_workers = app.config.get('SOM_JOB_WORKERS', self.max_workers)
+        self.max_pending = app.config.get('SOM_JOB_MAX_PENDING', self.max_pending)
+        # Needs som_registry.init_app to have run
+        self.jobs_dir = os.path.join(som_registry.model_dir, 'jobs')
+        os.makedirs(self.jobs_dir, exist_ok=True)
+        app.extensions['som_jobs'] = self
+
+    def _pool(self):
+        """Executor, started on first submit"""
+        if self._executor is None:
+            # spawn, not fork: the web process is threaded and holds DB connections
+            context = multiprocessing.get_context('spawn')
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+        return self._executor
+
+    @contextmanager
+    def _store(self):
+        """Hold the job store against other threads and, through the flock, other workers"""
+        with self._lock:
+            lock_file = None
+            if self._lock_depth == 0 and fcntl is not None:
+                lock_file = open(os.path.join(self.jobs_dir, '.lock'), 'w')
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if lock_file is not None:
+                    lock_file.close()
+
+    def _path(self, job_id: str, suffix: str) -> str:
+        return os.path.join(self.jobs_dir, job_id + suffix)
+
+    def _save(self, job: Dict):
+        write_json(self._path(job['job_id'], RECORD_SUFFIX), job)
+
+    def _delete(self, job_id: str):
+        for suffix in (RECORD_SUFFIX, PROGRESS_SUFFIX, CANCEL_SUFFIX):
+            try:
+                os.remove(self._path(job_id, suffix))
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def _owner_alive(pid: int) -> bool:
+        if pid == os.getpid() or os.name != 'posix':
+            return True
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    def _load(self, job_id: str) -> Optional[Dict]:
+        """Job record, or None; an active job whose owner has exited is marked failed"""
+        if not JOB_ID.fullmatch(job_id):
+            return None
+        job = read_json(self._path(job_id, RECORD_SUFFIX))
+        if job is not None and job['status'] in ACTIVE_STATUSES and not self._owner_alive(job['owner']):
+            job.update(status='failed', error='Worker process exited before the job finished',
+                       finished_at=time.time())
+            self._save(job)
+        return job
+
+    def _jobs(self) -> List[Dict]:
+        """Every job on the host, oldest first"""
+        job_ids = [name[:-len(RECORD_SUFFIX)] for name in os.listdir(self.jobs_dir) if name.endswith(RECORD_SUFFIX)]
+        jobs = [job for job in map(self._load, job_ids) if job is not None]
+        return sorted(jobs, key=lambda job: job['submitted_at'])
+
+    def _active(self) -> List[Dict]:
+        return [job for job in self._jobs() if job['status'] in ACTIVE_STATUSES]
+
+    def _prune(self):
+        finished = [job for job in self._jobs() if job['status'] not in ACTIVE_STATUSES]
+        for job in finished[:max(0, len(finished) - self.max_finished)]:
+            self._delete(job['job_id'])
+
+    def _active_job(self, key: SomModelKey) -> Optional[Dict]:
+        for job in self._active():
+            if SomModelKey(**job['key']) == key:
+                return job
+        return None
+
+    def _new_job(self, key: SomModelKey) -> Dict:
+        return {
+            'job_id': uuid.uuid4().hex,
+            'key': key._asdict(),
+            'status': 'queued',
+            'total': int(key.iterations),
+            'submitted_at': time.time(),
+            'started_at': None,
+            'finished_at': None,
+            'error': None,
+            'owner': os.getpid()
+        }
+
+    def _start(self, key: SomModelKey, data: np.ndarray) -> Dict:
+        """Queue a new job for key on the pool; the caller holds the store and has checked the cap"""
+        job = self._new_job(key)
+        self._save(job)
+        future = self._pool().submit(run_training_job, job['job_id'], data, key, self.jobs_dir)
+        self._futures[job['job_id']] = future
+        self._prune()
+        future.add_done_callback(lambda future, job_id=job['job_id']: self._finish(job_id, key, future))
+        logger.info(f"Queued SOM job {job['job_id']} for model {key.digest}")
+        return job
+
+    def submit(self, key: SomModelKey, data: np.ndarray) -> Dict:
+        """
+        Queue training for key. A key that is already queued or running returns
+        that job; a key already in the registry returns a finished job at once.
+        Raises JobQueueFull when max_pending jobs are active.
+        """
+        with self._store():
+            job = self._active_job(key)
+            if job is not None:
+                return self._describe(job)
+
+            if som_registry.get(key) is not None:
+                job = self._new_job(key)
+                job.update(status='succeeded', started_at=job['submitted_at'], finished_at=job['submitted_at'])
+                self._save(job)
+                self._prune()
+                return self._describe(job)
+
+            if len(self._active()) >= self.max_pending:
+                raise JobQueueFull(f"{self.max_pending} SOM jobs already queued or running")
+
+            return self._describe(self._start(key, data))
+
+    def _finish(self, job_id: str, key: SomModelKey, future):
+        try:
+            weights = future.result()
+            som_registry.put(key, weights)
+            status, error = 'succeeded', None
+        except (CancelledError, TrainingCancelled):
+            status, error = 'cancelled', None
+        except Exception as e:
+            logger.error(f"SOM job {job_id} failed: {str(e)}")
+            status, error = 'failed', str(e)
+
+        with self._store():
+            self._futures.pop(job_id, None)
+            job = read_json(self._path(job_id, RECORD_SUFFIX))
+            if job is not None:
+                progress = read_json(self._path(job_id, PROGRESS_SUFFIX)) or {}
+                job.update(status=status, error=error, finished_at=time.time(),
+                           started_at=progress.get('started_at', job['started_at']))
+                self._save(job)
+            try:
+                os.remove(self._path(job_id, CANCEL_SUFFIX))
+            except FileNotFoundError:
+                pass
+        logger.info(f"SOM job {job_id} {status}")
+
+    def _describe(self, job: Dict) -> Dict:
+        progress = read_json(self._path(job['job_id'], PROGRESS_SUFFIX)) or {}
+        status = job['status']
+        # Written by the training process itself, so it is the real start whether or not anyone polls
+        started_at = job['started_at'] or progress.get('started_at')
+        if started_at is not None and status == 'queued':
+            status = 'running'
+
+        done = job['total'] if status == 'succeeded' else int(progress.get('done', 0))
+        key = SomModelKey(**job['key'])
+        return {
+            'job_id': job['job_id'],
+            'status': status,
+            'model': key.as_dict(),
+            'progress': {
+                'done': done,
+                'total': job['total'],
+                'percent': round(100.0 * done / job['total'], 1) if job['total'] else 100.0
+            },
+            'submitted_at': job['submitted_at'],
+            'started_at': started_at,
+            'finished_at': job['finished_at'],
+            'error': job['error']
+        }
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._store():
+            job = self._load(job_id)
+            return self._describe(job) if job is not None else None
+
+    def job_key(self, job_id: str) -> Optional[SomModelKey]:
+        with self._store():
+            job = self._load(job_id)
+            return SomModelKey(**job['key']) if job is not None else None
+
+    def list_jobs(self) -> List[Dict]:
+        with self._store():
+            return [self._describe(job) for job in reversed(self._jobs())]
+
+    def cancel(self, job_id: str) -> Optional[Dict]:
+        """
+        Cancel a queued job outright when this worker accepted it; otherwise
+        flag it, and the training process stops before it starts or at its
+        next progress step
+        """
+        with self._store():
+            job = self._load(job_id)
+            if job is None:
+                return None
+            if job['status'] in ('queued', 'running'):
+                future = self._futures.get(job_id)
+                if future is not None and future.cancel():
+                    job = self._load(job_id)
+                else:
+                    open(self._path(job_id, CANCEL_SUFFIX), 'w').close()
+                    job['status'] = 'cancelling'
+                    self._save(job)
+            return self._describe(job)
+
+    def submit_many(self, keys: List[SomModelKey], data: np.ndarray) -> List[Dict]:
+        """
+        Queue training for every key not yet in the registry, all or nothing:
+        keys already queued or running join that job, and JobQueueFull is
+        raised before queueing anything when the new jobs would take the queue
+        past max_pending. Returns the jobs of the keys still missing from the
+        registry, in order; an empty list means every map is trained.
+        """
+        with self._store():
+            # Checked under the store: a job puts its weights before it is marked finished
+            missing = [key for key in keys if som_registry.get(key) is None]
+            joined = {key: self._active_job(key) for key in missing}
+            new = [key for key, job in joined.items() if job is None]
+            if new and len(self._active()) + len(new) > self.max_pending:
+                raise JobQueueFull(f"{len(new)} more SOM jobs would exceed the limit of {self.max_pending}")
+            return [self._describe(joined[key] or self._start(key, data)) for key in missing]
+
+    def stats(self) -> Dict:
+        with self._store():
+            counts = {}
+            for job in self._jobs():
+                counts[job['status']] = counts.get(job['status'], 0) + 1
+            return {
+                'jobs': counts,
+                'max_workers': self.max_workers,
+                'max_pending': self.max_pending,
+                'pool_started': self._executor is not None,
+                'pid': os.getpid()
+            }
+
+
+som_jobs = SomJobQueue()
@@ -0,0 +1,100 @@
+from typing import Dict
+import numpy as np
+
+
+def neuron_distances(weights: np.ndarray, data: np.ndarray) -> np.ndarray:
+    """
+    Euclidean distance from every sample to every neuron as one
+    (n_samples, n_neurons) matrix; neurons are in row-major map order,
+    the same order MiniSom.winner unravels.
+    Uses |x|² - 2x·w + |w|² so memory stays at n_samples × n_neurons
+    instead of n_samples × n_neurons × n_features.
+    """
+    flat = np.asarray(weights, dtype=np.float64).reshape(-1, weights.shape[-1])
+    data = np.asarray(data, dtype=np.float64)
+    squared = (
+        np.einsum('ij,ij->i', data, data)[:, None]
+        - 2.0 * data @ flat.T
+        + np.einsum('ij,ij->i', flat, flat)[None, :]
+    )
+    # Rounding can push an exact match slightly below zero
+    np.maximum(squared, 0.0, out=squared)
+    return np.sqrt(squared, out=squared)
+
+
+def som_metrics(weights: np.ndarray, data: np.ndarray) -> Dict:
+    """
+    BMU, second BMU, hit map, quantization error and topographic error for a
+    trained map, all taken from a single neuron_distances matrix.
+
+    bmu / second_bmu are (n_samples, 2) map coordinates and bmu_index the
+    row-major neuron index; hit_map has the map's (rows, cols) shape.
+    Topographic error counts samples whose two best units are not
+    4-neighbours, as calculate_som_quality_metrics always has.
+    """
+    rows, cols = weights.shape[0], weights.shape[1]
+    if data.size == 0:
+        return {
+            'bmu': np.zeros((0, 2), dtype=int),
+            'bmu_index': np.zeros(0, dtype=int),
+            'second_bmu': np.zeros((0, 2), dtype=int),
+            'hit_map': np.zeros((rows, cols)),
+            'quantization_error': 0.0,
+            'topographic_error': 0.0
+        }
+
+    distances = neuron_distances(weights, data)
+    samples = np.arange(len(distances))
+
+    best = distances.argmin(axis=1)
+    quantization_error = float(distances[samples, best].mean())
+
+    if distances.shape[1] > 1:
+        distances[samples, best] = np.inf
+        second = distances.argmin(axis=1)
+    else:
+        second = best
+
+    bmu = np.column_stack(np.unravel_index(best, (rows, cols)))
+    second_bmu = np.column_stack(np.unravel_index(second, (rows, cols)))
+    hops = np.abs(bmu - second_bmu).sum(axis=1)
+    topographic_error = float((hops > 1).mean()) if distances.shape[1] > 1 else 0.0
+
+    hit_map = np.bincount(best, minlength=rows * cols).reshape(rows, cols).astype(float)
+
+    return {
+        'bmu': bmu,
+        'bmu_index': best,
+        'second_bmu': second_bmu,
+        'hit_map': hit_map,
+        'quantization_error': quantization_error,
+        'topographic_error': topographic_error
+    }
+
+
+def co_clustering(labels: np.ndarray) -> np.ndarray:
+    """
+    Fraction of maps in which each pair of samples shares a BMU, from a
+    (n_maps, n_samples) array of bmu_index labels. The diagonal is 1.
+    """
+    labels = np.asarray(labels)
+    together = np.zeros((labels.shape[1], labels.shape[1]))
+    for run in labels:
+        together += run[:, None] == run[None, :]
+    return together / len(labels)
+
+
+def cluster_stability(together: np.ndarray) -> np.ndarray:
+    """
+    Per-sample stability from a co_clustering matrix: the co-clustering
+    fraction averaged over the sample's partners, weighted by that same
+    fraction. 1.0 means the sample lands with the same partners on every map
+    (or alone on every map); values near 1/n_maps mean its partners change
+    from map to map.
+    """
+    partners = together - np.eye(len(together))
+    weight = partners.sum(axis=1)
+    score = np.ones(len(together))
+    shared = weight > 0
+    score[shared] = (partners[shared] ** 2).sum(axis=1) / weight[shared]
+    return score
@@ -0,0 +1,251 @@
+from collections import OrderedDict
+from typing import Callable, List, NamedTuple, Optional, Tuple
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SomModelKey(NamedTuple):
+    """
+    Everything a trained map depends on; equal keys mean identical weights.
+    refreshes is 0 for a map trained from scratch and n for one warm-started
+    n times in a row from earlier generations, so refreshed maps never share
+    a key with a full training.
+    """
+    generation: int
+    rows: int
+    cols: int
+    iterations: int
+    sigma: float
+    learning_rate: float
+    seed: int
+    engine: str = 'online'
+    refreshes: int = 0
+
+    @property
+    def digest(self) -> str:
+        return hashlib.sha256(json.dumps(list(self)).encode()).hexdigest()[:32]
+
+    def as_dict(self) -> dict:
+        return {**self._asdict(), 'map_size': [self.rows, self.cols], 'model_id': self.digest}
+
+
+class SomRegistry:
+    """
+    Trained SOM weights keyed by SomModelKey. The data generation is part of the
+    key, so a reload invalidates every model built from the old data.
+
+    Tiers: a small in-memory LRU per process, plus .npy files under SOM_MODEL_DIR
+    shared by every worker on the host. Files are memory-mapped read-only on
+    first use, so a worker only pages in the maps it actually serves.
+
+    The prepared input matrix is kept per generation as well, so analysis,
+    visualization and retrain requests stop re-querying and re-pivoting. Each
+    generation's raw pivot is also snapshotted to disk, and the newest older
+    generation is kept as the base for incremental refreshes.
+    """
+
+    def __init__(self):
+        self.max_models = 32
+        self.model_dir = None
+        self.incremental = False
+
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+        self._train_locks = {}
+        self._dataset = None
+        self._dataset_generation = None
+        self._dataset_lock = threading.Lock()
+        self._stats = {'memory_hits': 0, 'disk_hits': 0, 'trained': 0, 'evictions': 0}
+
+    def init_app(self, app):
+        self.max_models = app.config.get('SOM_MODEL_CACHE_SIZE', self.max_models)
+        self.model_dir = app.config.get('SOM_MODEL_DIR') or os.path.join(app.instance_path, 'som_models')
+        self.incremental = app.config.get('SOM_INCREMENTAL_REFRESH', self.incremental)
+        os.makedirs(self.model_dir, exist_ok=True)
+        app.extensions['som_registry'] = self
+
+    def _generation_dir(self, generation: int) -> str:
+        return os.path.join(self.model_dir, str(generation))
+
+    def _model_file(self, key: SomModelKey) -> str:
+        return os.path.join(self._generation_dir(key.generation), f"{key.digest}.npy")
+
+    def _generations_on_disk(self) -> List[int]:
+        if not self.model_dir:
+            return []
+        return sorted(int(name) for name in os.listdir(self.model_dir) if name.isdigit())
+
+    def _prune(self, generation: int):
+        """
+        Forget models trained on older generations. On disk the newest
+        generation before this one survives as the warm-start base; newer
+        generations are left alone, since another worker may already be on them.
+        """
+        with self._lock:
+            for key in [k for k in self._models if k.generation < generation]:
+                del self._models[key]
+        older = [g for g in self._generations_on_disk() if g < generation]
+        for g in older[:-1]:
+            shutil.rmtree(self._generation_dir(g), ignore_errors=True)
+
+    def previous_generation(self, generation: int) -> Optional[int]:
+        """Newest generation on disk older than generation, if any"""
+        older = [g for g in self._generations_on_disk() if g < generation]
+        return older[-1] if older else None
+
+    def save_snapshot(self, generation: int, values: np.ndarray, countries: List, indicators: List,
+                      missing: np.ndarray):
+        """
+        Persist a generation's gap-filled country x indicator matrix, and the
+        mask of the cells that were filled, for later diffs
+        """
+        if not self.model_dir:
+            return
+        directory = self._generation_dir(generation)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, np.ascontiguousarray(missing, dtype=bool))
+            os.replace(tmp_path, os.path.join(directory, 'missing.npy'))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, np.ascontiguousarray(values, dtype=np.float64))
+            os.replace(tmp_path, os.path.join(directory, 'snapshot.npy'))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'countries': [str(c) for c in countries], 'indicators': [str(i) for i in indicators]}, f)
+            os.replace(tmp_path, os.path.join(directory, 'snapshot.json'))
+        except OSError as e:
+            logger.warning(f"Could not write SOM data snapshot: {e}")
+
+    def load_snapshot(self, generation: int) -> Optional[Tuple[np.ndarray, List[str], List[str], np.ndarray]]:
+        """(values, countries, indicators, missing) saved for generation, or None"""
+        if not self.model_dir:
+            return None
+        directory = self._generation_dir(generation)
+        try:
+            with open(os.path.join(directory, 'snapshot.json')) as f:
+                labels = json.load(f)
+            values = np.load(os.path.join(directory, 'snapshot.npy'), mmap_mode='r')
+            missing = np.load(os.path.join(directory, 'missing.npy'), mmap_mode='r')
+        except (OSError, ValueError):
+            return None
+        return values, labels['countries'], labels['indicators'], missing
+
+    def _remember(self, key: SomModelKey, weights: np.ndarray):
+        with self._lock:
+            self._models[key] = weights
+            self._models.move_to_end(key)
+            while len(self._models) > self.max_models:
+                self._models.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def _read_disk(self, key: SomModelKey) -> Optional[np.ndarray]:
+        try:
+            return np.load(self._model_file(key), mmap_mode='r')
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, key: SomModelKey, weights: np.ndarray):
+        directory = self._generation_dir(key.generation)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, np.ascontiguousarray(weights))
+            # Atomic rename so other workers never map a partial file
+            os.replace(tmp_path, self._model_file(key))
+        except OSError as e:
+            logger.warning(f"Could not write SOM model file: {e}")
+
+    def get(self, key: SomModelKey) -> Optional[np.ndarray]:
+        """Weights for key, or None; disk hits come back as a read-only memmap"""
+        with self._lock:
+            weights = self._models.get(key)
+            if weights is not None:
+                self._models.move_to_end(key)
+                self._stats['memory_hits'] += 1
+                return weights
+
+        if self.model_dir:
+            weights = self._read_disk(key)
+            if weights is not None:
+                self._remember(key, weights)
+                with self._lock:
+                    self._stats['disk_hits'] += 1
+                return weights
+        return None
+
+    def put(self, key: SomModelKey, weights: np.ndarray):
+        self._remember(key, weights)
+        if self.model_dir:
+            self._write_disk(key, weights)
+
+    def get_or_train(self, key: SomModelKey, train: Callable[[], np.ndarray]):
+        """
+        Return (weights, trained). Concurrent requests for the same key in this
+        process wait for a single training run instead of each starting one.
+        """
+        weights = self.get(key)
+        if weights is not None:
+            return weights, False
+
+        with self._lock:
+            train_lock = self._train_locks.setdefault(key, threading.Lock())
+        try:
+            with train_lock:
+                weights = self.get(key)
+                if weights is not None:
+                    return weights, False
+                weights = train()
+                self.put(key, weights)
+                with self._lock:
+                    self._stats['trained'] += 1
+                return weights, True
+        finally:
+            # Also when train() raises, so failed keys do not leave locks behind;
+            # only our own lock, a later caller may have registered a new one
+            with self._lock:
+                if self._train_locks.get(key) is train_lock:
+                    del self._train_locks[key]
+
+    def dataset(self, generation: int, load: Callable):
+        """Prepared SOM input for generation, built by load() once per generation"""
+        with self._dataset_lock:
+            if self._dataset_generation != generation:
+                self._dataset = load()
+                self._dataset_generation = generation
+                self._prune(generation)
+            return self._dataset
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+        with self._dataset_lock:
+            self._dataset = None
+            self._dataset_generation = None
+        for g in self._generations_on_disk():
+            shutil.rmtree(self._generation_dir(g), ignore_errors=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **self._stats,
+                'models': len(self._models),
+                'max_models': self.max_models,
+                'dataset_generation': self._dataset_generation,
+                'model_dir': self.model_dir,
+                'pid': os.getpid()
+            }
+
+
+som_registry = SomRegistry()
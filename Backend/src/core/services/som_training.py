@@ -0,0 +1,55 @@
+from typing import TYPE_CHECKING, Callable, Optional, Tuple
+import numpy as np
+from src.core.services.batch_som import train_batch_som
+
+if TYPE_CHECKING:
+    from minisom import MiniSom
+
+# 'online' is MiniSom.train; 'batch' is the NumPy batch trainer in batch_som
+SOM_ENGINES = ('online', 'batch')
+
+# Progress callbacks fire about this many times per training run
+PROGRESS_STEPS = 100
+
+
+class TrainingCancelled(Exception):
+    """Raised from a progress callback to abandon a training run"""
+
+
+def train_som_model(data: np.ndarray, map_size: Tuple[int, int], iterations: int, sigma: float,
+                    learning_rate: float, random_seed: int, engine: str = 'online',
+                    progress: Optional[Callable[[int, int], None]] = None) -> 'MiniSom':
+    """
+    Train a SOM with the given engine and return the MiniSom holding its weights.
+
+    progress(done, total) is called as training advances (iterations for
+    'online', epochs for 'batch'); it may raise TrainingCancelled to stop.
+    Without a callback the online engine runs MiniSom.train unchanged; with one
+    it runs the same sequential update loop in steps, so weights are identical.
+    Kept free of Flask and database imports so job worker processes load fast.
+    """
+    if engine not in SOM_ENGINES:
+        raise ValueError(f"Unknown SOM engine: {engine}")
+    from minisom import MiniSom
+
+    som = MiniSom(
+        map_size[0], map_size[1],
+        data.shape[1],
+        sigma=sigma,
+        learning_rate=learning_rate,
+        random_seed=random_seed
+    )
+
+    if engine == 'batch':
+        som._weights, _ = train_batch_som(data, map_size, iterations, sigma, random_seed, progress=progress)
+    elif progress is None:
+        som.train(data, iterations)
+    else:
+        # MiniSom.train with random_order=False: sample t % n at decay step t
+        step = max(1, iterations // PROGRESS_STEPS)
+        for t in range(iterations):
+            sample = data[t % len(data)]
+            som.update(sample, som.winner(sample), t, iterations)
+            if (t + 1) % step == 0 or t + 1 == iterations:
+                progress(t + 1, iterations)
+    return som
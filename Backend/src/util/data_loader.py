@@ -1,74 +1,319 @@
 # src/core/utils/load_data.py
+import numpy as np
 import pandas as pd
-import psycopg2
+import hashlib
+import io
 import os
+import time
 from pathlib import Path
+from src.core.db import db
+from src.util.numeric_classifier import classify_many
 
-def load_csv_data():
-    # Database connection
-    conn = psycopg2.connect(
-        dbname="test_hmi",
-        user="postgres",
-        password="db123",
-        host="localhost",
-        port="5432"
-    )
-    cursor = conn.cursor()
+# Parse outcome stored next to every raw observation value
+VALUE_STATUS_NUMERIC = "numeric"
+VALUE_STATUS_EMPTY = "empty"
+VALUE_STATUS_NON_NUMERIC = "non_numeric"
+
+CREATE_VALUE_STATUS_TYPE = """
+    DO $$ BEGIN
+        CREATE TYPE value_status AS ENUM ('numeric', 'empty', 'non_numeric');
+    EXCEPTION
+        WHEN duplicate_object THEN NULL;
+    END $$;
+"""
+
+# Column definitions per table; create_table_query renders them under any name
+TABLE_COLUMNS = {
+    "documents": """
+        document_id TEXT PRIMARY KEY,
+        title TEXT,
+        domain TEXT,
+        source TEXT
+    """,
+    "indicators": """
+        indicator_id TEXT PRIMARY KEY,
+        name TEXT,
+        unit TEXT,
+        visual_id TEXT,
+        document_id TEXT
+    """,
+    "visual_entities": """
+        visual_id TEXT PRIMARY KEY,
+        document_id TEXT,
+        type TEXT,
+        indicator_id TEXT
+    """,
+    "observations": """
+        observation_id TEXT PRIMARY KEY,
+        indicator_id TEXT,
+        visual_id TEXT,
+        value TEXT,
+        value_num DOUBLE PRECISION,
+        value_status value_status,
+        period TEXT,
+        country TEXT,
+        document_id TEXT,
+        unit TEXT,
+        metric_type TEXT,
+        name TEXT
+    """
+}
+
+# Primary key column of every table, also the first column of its CSV
+TABLE_KEYS = {
+    "documents": "document_id",
+    "indicators": "indicator_id",
+    "visual_entities": "visual_id",
+    "observations": "observation_id"
+}
 
-    # Drop and recreate tables to ensure consistency
-    cursor.execute("DROP TABLE IF EXISTS observations CASCADE")
-    cursor.execute("DROP TABLE IF EXISTS visual_entities CASCADE")
-    cursor.execute("DROP TABLE IF EXISTS indicators CASCADE")
-    cursor.execute("DROP TABLE IF EXISTS documents CASCADE")
-    conn.commit()
-
-    # Create table SQLs - updated structure
-    create_queries = {
-        "documents": """
-            CREATE TABLE IF NOT EXISTS documents (
-                document_id TEXT PRIMARY KEY,
-                title TEXT,
-                domain TEXT,
-                source TEXT
-            );
-        """,
-        "indicators": """
-            CREATE TABLE IF NOT EXISTS indicators (
-                indicator_id TEXT PRIMARY KEY,
-                name TEXT,
-                unit TEXT,
-                visual_id TEXT,
-                document_id TEXT
-            );
-        """,
-        "visual_entities": """
-            CREATE TABLE IF NOT EXISTS visual_entities (
-                visual_id TEXT PRIMARY KEY,
-                document_id TEXT,
-                type TEXT,
-                indicator_id TEXT
-            );
-        """,
-        "observations": """
-            CREATE TABLE IF NOT EXISTS observations (
-                observation_id TEXT PRIMARY KEY,
-                indicator_id TEXT,
-                visual_id TEXT,
-                value TEXT,
-                period TEXT,
-                country TEXT,
-                document_id TEXT,
-                unit TEXT,
-                metric_type TEXT,
-                name TEXT
-            );
-        """
+# Secondary indexes matching the filters and sort order of the hot read queries
+TABLE_INDEXES = {
+    "observations": {
+        "idx_observations_indicator_period_country": "(indicator_id, period, country)",
+        "idx_observations_document_id": "(document_id)",
+        "idx_observations_visual_id": "(visual_id)"
+    },
+    "indicators": {
+        "idx_indicators_document_id": "(document_id)",
+        # Keyset pagination and DISTINCT ON order of the indicator listing
+        "idx_indicators_name_key": "((COALESCE(name, '')), indicator_id)"
+    },
+    "visual_entities": {
+        "idx_visual_entities_document_id": "(document_id)",
+        "idx_visual_entities_type_key": "((COALESCE(type, '')), visual_id)"
+    },
+    "documents": {
+        "idx_documents_title_key": "((COALESCE(title, '')), document_id)"
     }
+}
 
-    for name, query in create_queries.items():
-        cursor.execute(query)
-    conn.commit()
+CREATE_MANIFEST_TABLE = """
+    CREATE TABLE IF NOT EXISTS load_manifest (
+        table_name TEXT PRIMARY KEY,
+        file_hash TEXT,
+        chunk_hashes TEXT[],
+        loaded_at TIMESTAMPTZ DEFAULT now()
+    );
+"""
+
+# Single-row rollup read by /api/dashboard-summary, refreshed after every ingest
+CREATE_DASHBOARD_SUMMARY_TABLE = """
+    CREATE TABLE IF NOT EXISTS dashboard_summary (
+        id INTEGER PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+        total_indicators BIGINT,
+        total_documents BIGINT,
+        total_visuals BIGINT,
+        total_observations BIGINT,
+        domains JSONB,
+        visual_types JSONB,
+        refreshed_at TIMESTAMPTZ DEFAULT now()
+    );
+"""
+
+# Source tables are placeholders (see rollup_sources) so a load can build the
+# rollups from its shadow tables before they are swapped in
+REFRESH_DASHBOARD_SUMMARY = """
+    INSERT INTO dashboard_summary (
+        id, total_indicators, total_documents, total_visuals, total_observations,
+        domains, visual_types, refreshed_at
+    )
+    SELECT
+        1,
+        (SELECT COUNT(DISTINCT indicator_id) FROM {indicators}),
+        (SELECT COUNT(DISTINCT document_id) FROM {documents}),
+        (SELECT COUNT(DISTINCT visual_id) FROM {visual_entities}),
+        (SELECT COUNT(DISTINCT observation_id) FROM {observations}),
+        (SELECT COALESCE(jsonb_agg(jsonb_build_object('domain', domain, 'count', count)), '[]'::jsonb)
+         FROM (SELECT domain, COUNT(*) AS count FROM {documents} GROUP BY domain) d),
+        (SELECT COALESCE(jsonb_agg(jsonb_build_object('type', type, 'count', count)), '[]'::jsonb)
+         FROM (SELECT type, COUNT(*) AS count FROM {visual_entities} GROUP BY type) v),
+        now()
+    ON CONFLICT (id) DO UPDATE SET
+        total_indicators = EXCLUDED.total_indicators,
+        total_documents = EXCLUDED.total_documents,
+        total_visuals = EXCLUDED.total_visuals,
+        total_observations = EXCLUDED.total_observations,
+        domains = EXCLUDED.domains,
+        visual_types = EXCLUDED.visual_types,
+        refreshed_at = EXCLUDED.refreshed_at
+"""
+
+# Per-indicator rollups read by get_time_series_data instead of raw observations.
+# Only numeric rows count; empty periods/countries are left out like ChartBuilder does.
+CREATE_INDICATOR_AGGREGATE_TABLES = """
+    CREATE TABLE IF NOT EXISTS indicator_period_country (
+        indicator_id TEXT NOT NULL,
+        period TEXT NOT NULL,
+        country TEXT NOT NULL,
+        value_sum DOUBLE PRECISION NOT NULL,
+        value_count BIGINT NOT NULL,
+        value_mean DOUBLE PRECISION NOT NULL,
+        PRIMARY KEY (indicator_id, period, country)
+    );
+    CREATE TABLE IF NOT EXISTS indicator_country_stats (
+        indicator_id TEXT NOT NULL,
+        country TEXT NOT NULL,
+        value_sum DOUBLE PRECISION NOT NULL,
+        value_count BIGINT NOT NULL,
+        value_mean DOUBLE PRECISION NOT NULL,
+        PRIMARY KEY (indicator_id, country)
+    );
+    CREATE TABLE IF NOT EXISTS indicator_series_summary (
+        indicator_id TEXT PRIMARY KEY,
+        years JSONB NOT NULL,
+        context JSONB NOT NULL,
+        skipped_values JSONB NOT NULL
+    );
+"""
+
+# Means are summed in numeric: exact, so rounding matches pandas' compensated sum.
+# Numeric has no infinity before Postgres 14, so groups holding ±Infinity
+# (e.g. "1e400" in the CSV) are averaged in double precision, giving ±Infinity
+# or NaN as pandas does; the FILTER keeps those rows out of the numeric cast.
+VALUE_MEAN = """
+    CASE WHEN COUNT(*) FILTER (WHERE value_num IN ('Infinity', '-Infinity')) > 0
+         THEN SUM(value_num) / COUNT(*)
+         ELSE (SUM(value_num::numeric) FILTER (WHERE value_num NOT IN ('Infinity', '-Infinity'))
+               / COUNT(*))::double precision
+    END"""
+
+# DELETE rather than TRUNCATE so readers keep seeing the old rollups until commit.
+REFRESH_INDICATOR_AGGREGATES = f"""
+    DELETE FROM indicator_period_country;
+    INSERT INTO indicator_period_country (indicator_id, period, country, value_sum, value_count, value_mean)
+    SELECT indicator_id, period, country, SUM(value_num), COUNT(*), {VALUE_MEAN}
+    FROM {{observations}}
+    WHERE value_num IS NOT NULL
+    AND indicator_id IS NOT NULL
+    AND NULLIF(period, '') IS NOT NULL
+    AND NULLIF(country, '') IS NOT NULL
+    GROUP BY indicator_id, period, country;
+
+    DELETE FROM indicator_country_stats;
+    INSERT INTO indicator_country_stats (indicator_id, country, value_sum, value_count, value_mean)
+    SELECT indicator_id, country, SUM(value_num), COUNT(*), {VALUE_MEAN}
+    FROM {{observations}}
+    WHERE value_num IS NOT NULL
+    AND indicator_id IS NOT NULL
+    AND NULLIF(country, '') IS NOT NULL
+    GROUP BY indicator_id, country;
+
+    DELETE FROM indicator_series_summary;
+    WITH years AS (
+        SELECT indicator_id, jsonb_agg(DISTINCT period) AS years
+        FROM {{observations}}
+        WHERE value_num IS NOT NULL AND NULLIF(period, '') IS NOT NULL
+        GROUP BY indicator_id
+    ), skipped AS (
+        SELECT indicator_id, jsonb_agg(DISTINCT value) AS skipped_values
+        FROM {{observations}}
+        WHERE value_status = 'non_numeric'
+        GROUP BY indicator_id
+    ), ordered AS (
+        -- Same order as the raw time-series query, so context is listed first-seen first
+        SELECT indicator_id, visual_id, document_id,
+               ROW_NUMBER() OVER (PARTITION BY indicator_id ORDER BY period, country, observation_id) AS position
+        FROM {{observations}}
+        WHERE value_num IS NOT NULL
+    ), first_seen AS (
+        SELECT DISTINCT ON (indicator_id, visual_id) indicator_id, visual_id, document_id, position
+        FROM ordered
+        WHERE NULLIF(visual_id, '') IS NOT NULL
+        ORDER BY indicator_id, visual_id, position
+    ), context AS (
+        SELECT f.indicator_id,
+               jsonb_agg(jsonb_build_object(
+                   'visual_type', ve.type, 'document_title', d.title, 'domain', d.domain
+               ) ORDER BY f.position) AS context
+        FROM first_seen f
+        LEFT JOIN {{visual_entities}} ve ON f.visual_id = ve.visual_id
+        LEFT JOIN {{documents}} d ON f.document_id = d.document_id
+        GROUP BY f.indicator_id
+    )
+    INSERT INTO indicator_series_summary (indicator_id, years, context, skipped_values)
+    SELECT i.indicator_id,
+           COALESCE(y.years, '[]'::jsonb),
+           COALESCE(c.context, '[]'::jsonb),
+           COALESCE(s.skipped_values, '[]'::jsonb)
+    FROM {{indicators}} i
+    LEFT JOIN years y ON y.indicator_id = i.indicator_id
+    LEFT JOIN skipped s ON s.indicator_id = i.indicator_id
+    LEFT JOIN context c ON c.indicator_id = i.indicator_id;
+
+    ANALYZE indicator_period_country;
+    ANALYZE indicator_country_stats;
+    ANALYZE indicator_series_summary;
+"""
+
+# Taken after the renames, just before commit: time-series reads pin the source
+# tables and then these (PIN_TIME_SERIES_TABLES in data_service), so a read
+# never sees rollups from a different generation than the rows it read
+LOCK_INDICATOR_AGGREGATES = """
+    LOCK TABLE indicator_series_summary, indicator_period_country, indicator_country_stats
+    IN ACCESS EXCLUSIVE MODE
+"""
+
+# Bumped whenever ingest changes data; response caches and SOM models key on it
+CREATE_DATA_GENERATION_TABLE = """
+    CREATE TABLE IF NOT EXISTS data_generation (
+        id INTEGER PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+        generation BIGINT NOT NULL DEFAULT 0,
+        updated_at TIMESTAMPTZ DEFAULT now()
+    );
+"""
+
+BUMP_DATA_GENERATION = """
+    INSERT INTO data_generation (id, generation, updated_at)
+    VALUES (1, 1, now())
+    ON CONFLICT (id) DO UPDATE
+    SET generation = data_generation.generation + 1,
+        updated_at = now()
+"""
 
+SHADOW_SUFFIX = "_shadow"
+
+def create_table_query(table, name=None):
+    return f"CREATE TABLE IF NOT EXISTS {name or table} ({TABLE_COLUMNS[table]});"
+
+def index_queries(table, target=None, suffix=""):
+    return [
+        f"CREATE INDEX IF NOT EXISTS {name}{suffix} ON {target or table} {columns}"
+        for name, columns in TABLE_INDEXES.get(table, {}).items()
+    ]
+
+CREATE_TABLE_QUERIES = {table: create_table_query(table) for table in TABLE_COLUMNS}
+CREATE_INDEX_QUERIES = [query for table in TABLE_INDEXES for query in index_queries(table)]
+
+def get_connection():
+    """
+    A raw DBAPI connection checked out of the app's shared engine pool.
+    close() returns it to the pool. Must be called inside an app context.
+    """
+    return db.engine.raw_connection()
+
+# Bulk loads run longer than the web statement_timeout allows
+DISABLE_STATEMENT_TIMEOUT = "SET LOCAL statement_timeout = 0"
+
+def copy_from_buffer(cursor, sql, buffer):
+    """Run COPY ... FROM STDIN with either psycopg 3 or psycopg2"""
+    if hasattr(cursor, 'copy'):
+        with cursor.copy(sql) as copy:
+            copy.write(buffer.getvalue())
+    else:
+        cursor.copy_expert(sql, buffer)
+
+# Rows per COPY chunk; bounds loader memory regardless of file size
+COPY_CHUNK_SIZE = 50000
+
+CSV_FILES = {
+    "documents": "documents.csv",
+    "indicators": "indicators.csv",
+    "visual_entities": "visual-entities.csv",
+    "observations": "observations.csv"
+}
+
+def get_data_path():
     # Get the correct path to the data folder
     current_file_path = Path(__file__).resolve()
     backend_path = current_file_path.parent.parent.parent
@@ -76,63 +321,338 @@ def load_csv_data():
     
     if not csv_path.exists():
         raise FileNotFoundError(f"Data directory not found at: {csv_path}")
+    return csv_path
 
-    csv_files = {
-        "documents": "documents.csv",
-        "indicators": "indicators.csv",
-        "visual_entities": "visual-entities.csv",
-        "observations": "observations.csv"
-    }
-
-    def insert_df(df, table):
-        # Convert all column names to lowercase to avoid case sensitivity issues
-        df.columns = df.columns.str.lower()
-        
-        # Handle column mapping for each table
-        if table == "documents":
-            # Ensure all required columns exist
-            required_columns = ['document_id', 'title', 'domain', 'source']
-            for col in required_columns:
-                if col not in df.columns:
-                    raise ValueError(f"Missing required column '{col}' in documents.csv")
-            
-        elif table == "observations":
-            if 'year' in df.columns and 'period' not in df.columns:
-                df = df.rename(columns={'year': 'period'})
-        
-        columns = ', '.join(df.columns)
-        placeholders = ', '.join(['%s'] * len(df.columns))
-        sql = f"INSERT INTO {table} ({columns}) VALUES ({placeholders}) ON CONFLICT DO NOTHING"
+def prepare_frame(df, table):
+    """Clean a raw CSV frame into the column layout of its table"""
+    # Convert all column names to lowercase to avoid case sensitivity issues
+    df.columns = df.columns.str.lower()
+    
+    # Handle column mapping for each table
+    if table == "documents":
+        # Ensure all required columns exist
+        required_columns = ['document_id', 'title', 'domain', 'source']
+        for col in required_columns:
+            if col not in df.columns:
+                raise ValueError(f"Missing required column '{col}' in documents.csv")
+        df['source'] = df['source'].astype(str).str.replace('DIW Weekly Report ', '')
         
-        data = [tuple(row) for row in df.values]
-        cursor.executemany(sql, data)
-        conn.commit()
+    elif table == "observations":
+        if 'year' in df.columns and 'period' not in df.columns:
+            df = df.rename(columns={'year': 'period'})
+        # Parse values once at ingest so readers never re-parse text
+        df['value_num'], df['value_status'] = parse_values(df['value'])
+    
+    return df
 
-    # Load and insert each CSV with error handling
-    for table, filename in csv_files.items():
-        file_path = csv_path / filename
-        try:
+def parse_values(values):
+    """Return (value_num, value_status) series for a column of raw values"""
+    values = pd.Series(values, dtype=object)
+    floats, mask = classify_many(values)
+    empty = values.isna().to_numpy() | (values.astype(str).str.strip() == '').to_numpy()
+
+    value_num = pd.Series(floats, index=values.index, dtype=object).where(mask, None)
+    value_status = pd.Series(
+        np.where(mask, VALUE_STATUS_NUMERIC, np.where(empty, VALUE_STATUS_EMPTY, VALUE_STATUS_NON_NUMERIC)),
+        index=values.index,
+        dtype=object
+    )
+    return value_num, value_status
+
+def hash_file(file_path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def hash_chunk(chunk):
+    return hashlib.sha256(pd.util.hash_pandas_object(chunk, index=False).values.tobytes()).hexdigest()
+
+def copy_chunk(cursor, table, target, chunk):
+    """
+    COPY one prepared chunk into a temporary staging table, then merge it
+    into target with INSERT ... SELECT ... ON CONFLICT DO NOTHING.
+    """
+    staging = f"staging_{table}"
+    cursor.execute(f"DROP TABLE IF EXISTS {staging}")
+    cursor.execute(f"CREATE TEMP TABLE {staging} (LIKE {target}) ON COMMIT DROP")
+    # Preserves file order so the first row per key wins, as with row-by-row inserts
+    cursor.execute(f"ALTER TABLE {staging} ADD COLUMN load_order BIGSERIAL")
+
+    columns = ', '.join(chunk.columns)
+    buffer = io.StringIO()
+    chunk.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    copy_from_buffer(cursor, f"COPY {staging} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+    cursor.execute(f"""
+        INSERT INTO {target} ({columns})
+        SELECT {columns} FROM {staging}
+        ORDER BY load_order
+        ON CONFLICT DO NOTHING
+    """)
+
+def build_shadow_table(cursor, table, file_path, previous_chunks, chunksize=COPY_CHUNK_SIZE):
+    """
+    Fill {table}_shadow from a CSV, streamed in fixed-size chunks.
+    Chunks whose hash matches the previous load are copied server-side from
+    the live table by key; only changed chunks are parsed and sent over COPY.
+    A reused chunk must copy exactly one live row per CSV row, otherwise it is
+    rolled back and loaded over COPY instead.
+    Returns the new chunk hashes, or [] when some rows lost to a duplicate key:
+    the live row for such a key can come from another chunk, so the next load
+    must not reuse any chunk of this file.
+    """
+    shadow = table + SHADOW_SUFFIX
+    key = TABLE_KEYS[table]
+    cursor.execute(f"DROP TABLE IF EXISTS {shadow}")
+    cursor.execute(create_table_query(table, shadow))
+    cursor.execute(f"SELECT * FROM {shadow} LIMIT 0")
+    shadow_columns = ', '.join(column[0] for column in cursor.description)
+
+    started = time.perf_counter()
+    rows = 0
+    chunk_hashes = []
+    reused = 0
+    for index, chunk in enumerate(pd.read_csv(file_path, dtype=str, chunksize=chunksize)):
+        chunk_hash = hash_chunk(chunk)
+        chunk_hashes.append(chunk_hash)
+        rows += len(chunk)
+
+        if index < len(previous_chunks) and previous_chunks[index] == chunk_hash:
+            chunk.columns = chunk.columns.str.lower()
+            cursor.execute("SAVEPOINT reuse_chunk")
+            cursor.execute(f"""
+                INSERT INTO {shadow} ({shadow_columns})
+                SELECT {shadow_columns} FROM {table}
+                WHERE {key} = ANY(%s)
+                ON CONFLICT DO NOTHING
+            """, (chunk[key].dropna().unique().tolist(),))
+            if cursor.rowcount == len(chunk):
+                cursor.execute("RELEASE SAVEPOINT reuse_chunk")
+                reused += 1
+                continue
+            cursor.execute("ROLLBACK TO SAVEPOINT reuse_chunk")
+        copy_chunk(cursor, table, shadow, prepare_frame(chunk, table))
+
+    # Build indexes after the bulk insert so they are created in one pass
+    for query in index_queries(table, target=shadow, suffix=SHADOW_SUFFIX):
+        cursor.execute(query)
+    cursor.execute(f"ANALYZE {shadow}")
+
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    print(f"   {table}: {rows} rows, {len(chunk_hashes) - reused}/{len(chunk_hashes)} chunks loaded "
+          f"in {elapsed:.2f}s ({rows / elapsed:,.0f} rows/sec)")
+
+    cursor.execute(f"SELECT COUNT(*) FROM {shadow}")
+    if cursor.fetchone()[0] != rows:
+        print(f"   {table}: duplicate or missing keys, next load will not reuse chunks")
+        return []
+    return chunk_hashes
+
+def swap_in_shadow(cursor, table):
+    """Replace the live table with its shadow; callers commit all swaps together"""
+    shadow = table + SHADOW_SUFFIX
+    cursor.execute("SELECT to_regclass(%s)", (table,))
+    if cursor.fetchone()[0] is not None:
+        cursor.execute(f"ALTER TABLE {table} RENAME TO {table}_old")
+        # No CASCADE: a view or foreign key on the live table fails the load
+        # instead of being dropped with it
+        cursor.execute(f"DROP TABLE {table}_old")
+    cursor.execute(f"ALTER TABLE {shadow} RENAME TO {table}")
+
+    # Restore canonical constraint and index names for the next reload
+    cursor.execute(f"ALTER TABLE {table} RENAME CONSTRAINT {shadow}_pkey TO {table}_pkey")
+    for name in TABLE_INDEXES.get(table, {}):
+        cursor.execute(f"ALTER INDEX {name}{SHADOW_SUFFIX} RENAME TO {name}")
+
+def rollup_sources(shadowed=()):
+    """Table each rollup reads per source: the shadow for tables being reloaded, else the live one"""
+    return {table: table + SHADOW_SUFFIX if table in shadowed else table for table in CSV_FILES}
+
+def missing_tables(cursor, sources=None):
+    """Source tables that do not exist yet, e.g. because their CSV was never loaded"""
+    missing = []
+    for table, name in (sources or rollup_sources()).items():
+        cursor.execute("SELECT to_regclass(%s)", (name,))
+        if cursor.fetchone()[0] is None:
+            missing.append(table)
+    return missing
+
+def refresh_dashboard_summary(cursor, sources=None):
+    """
+    Recompute the dashboard rollup from sources (see rollup_sources); runs inside
+    the loader transaction. While a source table is missing the rollup is emptied
+    instead, so the tables that did load are still committed and the endpoint
+    computes the summary live until the next complete load.
+    """
+    sources = sources or rollup_sources()
+    cursor.execute(CREATE_DASHBOARD_SUMMARY_TABLE)
+    missing = missing_tables(cursor, sources)
+    if missing:
+        print(f"⚠️ Dashboard summary not refreshed, missing tables: {', '.join(missing)}")
+        cursor.execute("DELETE FROM dashboard_summary")
+        return
+    cursor.execute(REFRESH_DASHBOARD_SUMMARY.format(**sources))
+
+def refresh_indicator_aggregates(cursor, sources=None):
+    """
+    Rebuild the per-indicator rollups from sources; runs inside the loader transaction.
+    Emptied like the dashboard summary while a source table is missing, so
+    time series are computed from observations until then.
+    """
+    sources = sources or rollup_sources()
+    started = time.perf_counter()
+    cursor.execute(CREATE_INDICATOR_AGGREGATE_TABLES)
+    missing = missing_tables(cursor, sources)
+    if missing:
+        print(f"⚠️ Indicator aggregates not refreshed, missing tables: {', '.join(missing)}")
+        cursor.execute("DELETE FROM indicator_period_country; DELETE FROM indicator_country_stats; "
+                       "DELETE FROM indicator_series_summary")
+        return
+    cursor.execute(REFRESH_INDICATOR_AGGREGATES.format(**sources))
+    print(f"   indicator aggregates refreshed in {time.perf_counter() - started:.2f}s")
+
+def create_indexes(cursor):
+    for query in CREATE_INDEX_QUERIES:
+        cursor.execute(query)
+    cursor.execute("ANALYZE observations")
+    cursor.execute("ANALYZE indicators")
+
+def load_csv_data(incremental=True):
+    """
+    Load the CSVs without ever dropping a table readers can see.
+    Every changed table is rebuilt as a shadow table and all of them are
+    swapped in by rename inside one transaction. In incremental mode, files
+    whose hash is unchanged are skipped and unchanged chunks are reused;
+    incremental=False rebuilds every table from its CSV.
+    Returns {table: 'loaded' | 'unchanged' | 'missing'}.
+    """
+    started = time.perf_counter()
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute(DISABLE_STATEMENT_TIMEOUT)
+        cursor.execute(CREATE_VALUE_STATUS_TYPE)
+        cursor.execute(CREATE_MANIFEST_TABLE)
+        cursor.execute(CREATE_DASHBOARD_SUMMARY_TABLE)
+        cursor.execute(CREATE_DATA_GENERATION_TABLE)
+        cursor.execute(CREATE_INDICATOR_AGGREGATE_TABLES)
+        cursor.execute("SELECT table_name, file_hash, chunk_hashes FROM load_manifest")
+        manifest = {row[0]: {'file_hash': row[1], 'chunk_hashes': row[2] or []} for row in cursor.fetchall()}
+
+        csv_path = get_data_path()
+        status = {}
+        loaded = {}
+        for table, filename in CSV_FILES.items():
+            file_path = csv_path / filename
             if not file_path.exists():
                 print(f"⚠️ Warning: {filename} not found at {file_path}")
+                status[table] = 'missing'
+                continue
+
+            file_hash = hash_file(file_path)
+            previous = manifest.get(table) if incremental else None
+            cursor.execute("SELECT to_regclass(%s)", (table,))
+            live_exists = cursor.fetchone()[0] is not None
+
+            if previous and live_exists and previous['file_hash'] == file_hash:
+                status[table] = 'unchanged'
                 continue
-                
-            df = pd.read_csv(file_path)
-            
-            # Clean data
-            if table == "documents":
-                # Check if source column exists before processing
-                if 'source' in df.columns:
-                    df['source'] = df['source'].astype(str).str.replace('DIW Weekly Report ', '')
-                else:
-                    raise ValueError("'source' column not found in documents.csv")
-            
-            insert_df(df, table)
-            print(f"✅ Loaded {filename} into {table} table")
-            
-        except Exception as e:
-            print(f"❌ Error loading {filename}: {str(e)}")
-            conn.rollback()
-
-    cursor.close()
-    conn.close()
-    print("✅ All data loaded successfully!")
\ No newline at end of file
+
+            previous_chunks = previous['chunk_hashes'] if previous and live_exists else []
+            loaded[table] = (file_hash, build_shadow_table(cursor, table, file_path, previous_chunks))
+            status[table] = 'loaded'
+            print(f"✅ Loaded {filename} into {table} shadow table")
+
+        # Rollups are built from the shadow tables before the swap, so the
+        # ACCESS EXCLUSIVE locks taken by the renames are held only for the
+        # swap itself; readers keep seeing the old rollups until commit
+        sources = rollup_sources(loaded)
+        cursor.execute("SELECT COUNT(*) FROM dashboard_summary")
+        if loaded or cursor.fetchone()[0] == 0:
+            refresh_dashboard_summary(cursor, sources)
+        cursor.execute("SELECT EXISTS (SELECT 1 FROM indicator_series_summary)")
+        refreshed = bool(loaded) or not cursor.fetchone()[0]
+        if refreshed:
+            refresh_indicator_aggregates(cursor, sources)
+
+        # One transaction: readers see either every old table or every new one
+        for table, (file_hash, chunk_hashes) in loaded.items():
+            swap_in_shadow(cursor, table)
+            cursor.execute("""
+                INSERT INTO load_manifest (table_name, file_hash, chunk_hashes, loaded_at)
+                VALUES (%s, %s, %s, now())
+                ON CONFLICT (table_name) DO UPDATE
+                SET file_hash = EXCLUDED.file_hash,
+                    chunk_hashes = EXCLUDED.chunk_hashes,
+                    loaded_at = EXCLUDED.loaded_at
+            """, (table, file_hash, chunk_hashes))
+        if refreshed:
+            cursor.execute(LOCK_INDICATOR_AGGREGATES)
+        if loaded:
+            cursor.execute(BUMP_DATA_GENERATION)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+    print(f"✅ Data load finished in {time.perf_counter() - started:.2f}s: {status}")
+    return status
+
+def migrate_value_columns():
+    """
+    Add and backfill value_num / value_status on an existing observations table,
+    then refresh the rollups and bump the data generation in the same transaction
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute(DISABLE_STATEMENT_TIMEOUT)
+        cursor.execute(CREATE_VALUE_STATUS_TYPE)
+        cursor.execute("ALTER TABLE observations ADD COLUMN IF NOT EXISTS value_num DOUBLE PRECISION")
+        cursor.execute("ALTER TABLE observations ADD COLUMN IF NOT EXISTS value_status value_status")
+
+        # Parse each distinct raw value once and join the results back
+        cursor.execute("SELECT DISTINCT value FROM observations WHERE value IS NOT NULL")
+        distinct_values = [value for (value,) in cursor.fetchall()]
+        value_num, value_status = parse_values(distinct_values)
+        parsed = pd.DataFrame({'value': distinct_values, 'value_num': value_num, 'value_status': value_status})
+        cursor.execute("""
+            CREATE TEMP TABLE value_map (value TEXT, value_num DOUBLE PRECISION, value_status value_status)
+            ON COMMIT DROP
+        """)
+        buffer = io.StringIO()
+        # \N marks NULL so empty strings survive the round trip
+        parsed.to_csv(buffer, index=False, header=False, na_rep='\\N')
+        buffer.seek(0)
+        copy_from_buffer(cursor, "COPY value_map FROM STDIN WITH (FORMAT csv, NULL '\\N')", buffer)
+        cursor.execute("""
+            UPDATE observations o
+            SET value_num = m.value_num, value_status = m.value_status
+            FROM value_map m
+            WHERE o.value = m.value
+        """)
+        cursor.execute("""
+            UPDATE observations
+            SET value_num = NULL, value_status = 'empty'
+            WHERE value IS NULL
+        """)
+        # Rollups and cached responses were built from the old values
+        refresh_indicator_aggregates(cursor)
+        refresh_dashboard_summary(cursor)
+        cursor.execute(LOCK_INDICATOR_AGGREGATES)
+        cursor.execute(CREATE_DATA_GENERATION_TABLE)
+        cursor.execute(BUMP_DATA_GENERATION)
+        conn.commit()
+        print(f"✅ Migrated {len(parsed)} distinct observation values")
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
\ No newline at end of file
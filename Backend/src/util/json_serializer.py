@@ -1,130 +1,127 @@
+"""
+Single-pass JSON encoding for API responses.
+
+NumPy, pandas, Decimal and datetime values are converted inside the encoder's
+default hook while the payload is written, so callers hand over their data
+as-is instead of walking it into plain Python types first. orjson is used when
+it is installed (NumPy arrays are then written natively); otherwise the
+standard library encoder does the same job more slowly. Either way NaN and
+infinity come out as null, dates as ISO 8601 strings and Decimals as numbers.
+
+FastJSONProvider plugs this into Flask, so jsonify and current_app.json use it
+in every blueprint.
+"""
 import json
+import logging
+import math
+from datetime import date, datetime, time
+from decimal import Decimal
 import numpy as np
 import pandas as pd
-from decimal import Decimal
-from datetime import datetime, date
-import logging
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # standard library fallback below
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
-class CustomJSONEncoder(json.JSONEncoder):
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def json_default(obj):
     """
-    Custom JSON encoder that handles NumPy, Pandas, and other non-serializable types
+    Convert one value the encoder cannot write itself. The result is encoded
+    again, so containers may still hold NumPy or pandas values.
     """
+    if isinstance(obj, np.ndarray):
+        # orjson only writes contiguous arrays of plain numeric dtypes natively
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return obj.to_numpy()
+    if isinstance(obj, pd.DataFrame):
+        return obj.to_dict('records')
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (datetime, date, time)):
+        # pd.Timestamp under orjson; every date type under the stdlib encoder
+        return None if obj is pd.NaT else obj.isoformat()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, bytes):
+        return obj.decode('utf-8', errors='ignore')
+    if pd.api.types.is_scalar(obj) and pd.isna(obj):
+        return None
+
+    logger.warning(f"Converting unknown type {type(obj)} to string: {obj}")
+    return str(obj)
+
+
+def _finite_float(value, _repr=float.__repr__) -> str:
+    return _repr(value) if math.isfinite(value) else 'null'
+
+
+class StdlibEncoder(json.JSONEncoder):
+    """json.JSONEncoder with json_default and NaN / infinity written as null"""
+
     def default(self, obj):
-        try:
-            # Handle NumPy types
-            if isinstance(obj, np.integer):
-                return int(obj)
-            elif isinstance(obj, np.floating):
-                if np.isnan(obj) or np.isinf(obj):
-                    return None
-                return float(obj)
-            elif isinstance(obj, np.ndarray):
-                return obj.tolist()
-            elif isinstance(obj, np.bool_):
-                return bool(obj)
-            
-            # Handle Pandas types
-            elif isinstance(obj, pd.Series):
-                return obj.tolist()
-            elif isinstance(obj, pd.DataFrame):
-                return obj.to_dict('records')
-            elif isinstance(obj, pd.Timestamp):
-                return obj.isoformat()
-            elif pd.isna(obj):
-                return None
-            
-            # Handle Python types that might cause issues
-            elif isinstance(obj, Decimal):
-                return float(obj)
-            elif isinstance(obj, (datetime, date)):
-                return obj.isoformat()
-            elif isinstance(obj, set):
-                return list(obj)
-            elif isinstance(obj, bytes):
-                return obj.decode('utf-8', errors='ignore')
-            
-            # If all else fails, try to convert to string
-            else:
-                logger.warning(f"Unknown type {type(obj)} for object {obj}, converting to string")
-                return str(obj)
-                
-        except Exception as e:
-            logger.error(f"Error serializing object {obj} of type {type(obj)}: {e}")
-            return str(obj)
-
-def safe_json_serialize(data):
-    """
-    Safely serialize data to JSON, handling all problematic types
-    """
-    try:
-        # First pass: recursively clean the data
-        cleaned_data = deep_clean_for_json(data)
-        
-        # Second pass: use custom encoder
-        json_str = json.dumps(cleaned_data, cls=CustomJSONEncoder, ensure_ascii=False)
-        
-        # Verify it can be loaded back
-        json.loads(json_str)
-        
-        return cleaned_data
-    except Exception as e:
-        logger.error(f"JSON serialization failed: {e}")
-        logger.error(f"Problematic data type: {type(data)}")
-        logger.error(f"Problematic data: {str(data)[:500]}...")
-        raise
-
-def deep_clean_for_json(obj):
+        return json_default(obj)
+
+    def iterencode(self, o, _one_shot=False):
+        # The C encoder has no float hook, so use the pure-Python one with ours
+        string_encoder = json.encoder.encode_basestring_ascii if self.ensure_ascii else json.encoder.encode_basestring
+        return json.encoder._make_iterencode(
+            {} if self.check_circular else None, self.default, string_encoder, self.indent,
+            _finite_float, self.key_separator, self.item_separator, self.sort_keys,
+            self.skipkeys, _one_shot
+        )(o, 0)
+
+
+def dumps_bytes(obj, sort_keys: bool = False, indent: bool = False) -> bytes:
+    """Encode obj as UTF-8 JSON in one pass (compact unless indent)"""
+    if orjson is not None:
+        option = ORJSON_OPTIONS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=json_default, option=option)
+    return json.dumps(
+        obj, cls=StdlibEncoder, ensure_ascii=False, sort_keys=sort_keys,
+        indent=2 if indent else None, separators=(',', ': ') if indent else (',', ':')
+    ).encode('utf-8')
+
+
+def dumps(obj, sort_keys: bool = False) -> str:
+    """dumps_bytes as a str"""
+    return dumps_bytes(obj, sort_keys).decode('utf-8')
+
+
+class FastJSONProvider(DefaultJSONProvider):
     """
-    Recursively clean data structures for JSON serialization
+    Flask JSON provider backed by dumps_bytes. Keys stay sorted like Flask's
+    default provider, so response bodies (and content ETags) keep their shape;
+    non-ASCII text is written as UTF-8 rather than escaped.
     """
-    if obj is None:
-        return None
-    
-    # Handle NumPy types
-    elif isinstance(obj, np.integer):
-        return int(obj)
-    elif isinstance(obj, np.floating):
-        if np.isnan(obj) or np.isinf(obj):
-            return None
-        return float(obj)
-    elif isinstance(obj, np.bool_):
-        return bool(obj)
-    elif isinstance(obj, np.ndarray):
-        return [deep_clean_for_json(item) for item in obj.tolist()]
-    
-    # Handle Pandas types
-    elif isinstance(obj, pd.Series):
-        return [deep_clean_for_json(item) for item in obj.tolist()]
-    elif isinstance(obj, pd.DataFrame):
-        return [deep_clean_for_json(row) for row in obj.to_dict('records')]
-    elif isinstance(obj, pd.Timestamp):
-        return obj.isoformat()
-    elif pd.isna(obj):
-        return None
-    
-    # Handle collections
-    elif isinstance(obj, dict):
-        return {str(key): deep_clean_for_json(value) for key, value in obj.items()}
-    elif isinstance(obj, (list, tuple)):
-        return [deep_clean_for_json(item) for item in obj]
-    elif isinstance(obj, set):
-        return [deep_clean_for_json(item) for item in obj]
-    
-    # Handle other types
-    elif isinstance(obj, Decimal):
-        return float(obj)
-    elif isinstance(obj, (datetime, date)):
-        return obj.isoformat()
-    elif isinstance(obj, bytes):
-        return obj.decode('utf-8', errors='ignore')
-    
-    # Basic types that should be JSON serializable
-    elif isinstance(obj, (str, int, float, bool)):
-        return obj
-    
-    # Last resort: convert to string
-    else:
-        logger.warning(f"Converting unknown type {type(obj)} to string: {obj}")
-        return str(obj)
+
+    def dumps(self, obj, **kwargs) -> str:
+        if orjson is None or kwargs.keys() - {'sort_keys', 'indent', 'separators'}:
+            kwargs.setdefault('sort_keys', self.sort_keys)
+            return json.dumps(obj, cls=StdlibEncoder, **kwargs)
+        return dumps_bytes(obj, kwargs.get('sort_keys', self.sort_keys), bool(kwargs.get('indent'))).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(
+            dumps_bytes(obj, self.sort_keys, indent) + b'\n', mimetype=self.mimetype
+        )
@@ -0,0 +1,60 @@
+import base64
+import json
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Upper bound for ?limit= on every paginated listing
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(values: Sequence) -> str:
+    """Opaque, URL-safe cursor holding the sort key of the last row on a page"""
+    raw = json.dumps(list(values), separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, size: int) -> List:
+    """Inverse of encode_cursor; raises ValueError for anything it did not produce"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return values
+
+
+def keyset_query(select_sql: str, keys: List[str], conditions: List[str], params: Dict,
+                 limit: Optional[int], after: Optional[str], tiebreak: Sequence[str] = ()) -> Tuple[str, Dict]:
+    """
+    Append WHERE / ORDER BY / LIMIT for one keyset page to select_sql.
+    keys are the SQL sort expressions the cursor compares against; they must be
+    non-null (wrap nullable columns in COALESCE) and unique together unless
+    tiebreak columns follow them in the ORDER BY, as with DISTINCT ON.
+    One extra row is fetched so page_rows can tell whether another page exists.
+    """
+    conditions = list(conditions)
+    params = dict(params)
+    if after is not None:
+        for i, value in enumerate(decode_cursor(after, len(keys))):
+            params[f'after_{i}'] = value
+        placeholders = ', '.join(f':after_{i}' for i in range(len(keys)))
+        conditions.append(f"({', '.join(keys)}) > ({placeholders})")
+
+    sql = select_sql
+    if conditions:
+        sql += "\nWHERE " + "\nAND ".join(conditions)
+    sql += "\nORDER BY " + ", ".join([*keys, *tiebreak])
+    if limit is not None:
+        sql += "\nLIMIT :limit"
+        params['limit'] = limit + 1
+    return sql, params
+
+
+def page_rows(rows: List[Dict], key_columns: List[str], limit: Optional[int]) -> Tuple[List[Dict], Optional[str]]:
+    """Drop the look-ahead row and return (rows, next_cursor); next_cursor is None on the last page"""
+    if limit is None or len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    # NULL sort values compare as '' because the keys are COALESCEd in SQL
+    return rows, encode_cursor(['' if rows[-1][c] is None else rows[-1][c] for c in key_columns])
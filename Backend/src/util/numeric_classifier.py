@@ -0,0 +1,55 @@
+import re
+from typing import Iterable, Tuple
+import numpy as np
+import pandas as pd
+
+# Placeholder labels and bare words are never numbers, even when float()
+# would accept them (e.g. "nan", "inf")
+NON_NUMERIC_PATTERN = re.compile(
+    r'^(?:other|n/a|na|null|none|unknown|not available|not applicable|[a-zA-Z]+)$',
+    re.IGNORECASE
+)
+
+
+def is_numeric(value) -> bool:
+    """Check if a value can be converted to float"""
+    return parse_float(value) is not None
+
+
+def parse_float(value, default=None):
+    """Convert a raw value to float in one step, returning default when it is not numeric"""
+    if value is None or value == '':
+        return default
+
+    str_value = str(value).strip()
+    if NON_NUMERIC_PATTERN.match(str_value):
+        return default
+
+    try:
+        return float(str_value)
+    except (ValueError, TypeError):
+        return default
+
+
+def classify_many(values: Iterable) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Classify a whole result set at once.
+    Returns (floats, mask): floats holds the parsed value or NaN, mask marks numeric entries.
+    Each distinct raw value is parsed only once, by parse_float itself, so the
+    batch and row-wise classifiers always agree (float() accepts inputs such
+    as '1_000' or non-ASCII digits that pd.to_numeric rejects).
+    """
+    series = pd.Series(values if isinstance(values, (list, pd.Series, np.ndarray)) else list(values), dtype=object)
+    if series.empty:
+        return np.empty(0, dtype=float), np.zeros(0, dtype=bool)
+
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    parsed = [parse_float(value) for value in uniques]
+    unique_mask = np.fromiter((value is not None for value in parsed), dtype=bool, count=len(parsed))
+    unique_floats = np.fromiter((np.nan if value is None else value for value in parsed),
+                                dtype=float, count=len(parsed))
+
+    # Missing values (code -1) map to the trailing NaN / False slot
+    floats = np.append(unique_floats, np.nan)[codes]
+    mask = np.append(unique_mask, False)[codes]
+    return floats, mask
@@ -0,0 +1,234 @@
+import collections
+import inspect
+import json
+import logging
+import re
+from typing import Dict, List
+import pandas as pd
+from flask import Flask
+from sqlalchemy import event, text
+from src.core.db import db
+from src.core.services.data_service import DataService
+from src.util.data_loader import (
+    CREATE_TABLE_QUERIES, CREATE_INDEX_QUERIES, CREATE_DASHBOARD_SUMMARY_TABLE,
+    CREATE_INDICATOR_AGGREGATE_TABLES, CREATE_DATA_GENERATION_TABLE, CSV_FILES, get_data_path, prepare_frame
+)
+
+logger = logging.getLogger(__name__)
+
+# Words that can follow a table name but are not aliases
+SQL_KEYWORDS = {'where', 'join', 'left', 'right', 'inner', 'on', 'order', 'group', 'limit', 'using', 'set'}
+
+# Constructs the SQLite stand-in cannot run; those statements are only planned on Postgres
+POSTGRES_ONLY = re.compile(r'\bDISTINCT\s+ON\b|\bANY\s*\(', re.IGNORECASE)
+
+SEED_ROLLUP_QUERIES = [
+    "INSERT INTO indicator_series_summary (indicator_id, years, context, skipped_values) "
+    "VALUES (:indicator_id, '[]', '[]', '[]')",
+    "INSERT INTO indicator_period_country (indicator_id, period, country, value_sum, value_count, value_mean) "
+    "VALUES (:indicator_id, '', '', 0, 1, 0)",
+    "INSERT INTO indicator_country_stats (indicator_id, country, value_sum, value_count, value_mean) "
+    "VALUES (:indicator_id, '', 0, 1, 0)"
+]
+
+UNSEED_ROLLUP_QUERIES = [
+    "DELETE FROM indicator_series_summary WHERE indicator_id = :indicator_id",
+    "DELETE FROM indicator_period_country WHERE indicator_id = :indicator_id",
+    "DELETE FROM indicator_country_stats WHERE indicator_id = :indicator_id"
+]
+
+
+def sample_arguments(connection) -> Dict:
+    """Pick real ids so every DataService method reaches its main query"""
+    row = connection.execute(text(
+        "SELECT indicator_id, document_id FROM indicators WHERE document_id IS NOT NULL LIMIT 1"
+    )).fetchone()
+    indicator_id, document_id = (row.indicator_id, row.document_id) if row else ('ind00000', 'dwr-00-00')
+    return {
+        'indicator_id': indicator_id,
+        'indicator_ids': [indicator_id],
+        'document_id': document_id,
+        'document_ids': [document_id],
+        'include_raw': True
+    }
+
+
+def seed_rollups(indicator_id: str) -> bool:
+    """
+    Give the sample indicator one rollup row so the rollup-backed queries are reached.
+    Only done when it has none (readers of that indicator are on the raw fallback
+    anyway); returns whether rows were inserted, for unseed_rollups.
+    """
+    params = {'indicator_id': indicator_id}
+    with db.engine.begin() as connection:
+        exists = connection.execute(text(
+            "SELECT 1 FROM indicator_series_summary WHERE indicator_id = :indicator_id"
+        ), params).fetchone()
+        if exists:
+            return False
+        for query in SEED_ROLLUP_QUERIES:
+            connection.execute(text(query), params)
+    return True
+
+
+def unseed_rollups(indicator_id: str):
+    with db.engine.begin() as connection:
+        for query in UNSEED_ROLLUP_QUERIES:
+            connection.execute(text(query), {'indicator_id': indicator_id})
+
+
+def capture_data_service_statements() -> List[Dict]:
+    """
+    Run every DataService method once and record the queries it sends.
+    Returned generators are exhausted so streamed queries are captured too.
+    """
+    with db.engine.connect() as connection:
+        arguments = sample_arguments(connection)
+    seeded = seed_rollups(arguments['indicator_id'])
+
+    captured = []
+    current = {'method': None}
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        # Transaction control (SAVEPOINT, RELEASE ...) has no plan to check
+        if statement.lstrip().upper().startswith(('SELECT', 'WITH')):
+            captured.append({'method': current['method'], 'statement': statement, 'parameters': parameters})
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        for name, method in inspect.getmembers(DataService, inspect.isfunction):
+            if name.startswith('_'):
+                continue
+            params = inspect.signature(method).parameters
+            if any(p not in arguments and params[p].default is inspect.Parameter.empty for p in params):
+                continue
+            current['method'] = name
+            try:
+                result = method(**{p: arguments[p] for p in params if p in arguments})
+                if inspect.isgenerator(result):
+                    collections.deque(result, maxlen=0)
+            except Exception as e:
+                logger.warning(f"{name} raised during plan capture: {e}")
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+        if seeded:
+            unseed_rollups(arguments['indicator_id'])
+
+    unique = {}
+    for item in captured:
+        unique.setdefault(item['statement'], item)
+    return list(unique.values())
+
+
+def observation_names(statement: str) -> set:
+    """The table name plus every alias it is given in the statement"""
+    aliases = re.findall(r'\bobservations\s+(?:AS\s+)?(\w+)', statement, re.IGNORECASE)
+    return {'observations'} | {a for a in aliases if a.lower() not in SQL_KEYWORDS}
+
+
+def postgres_seq_scans(connection, statement, parameters) -> List[str]:
+    # With sequential scans disabled the planner only picks one when no index applies
+    connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    plan = connection.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    scans = []
+    nodes = [plan[0]['Plan']]
+    while nodes:
+        node = nodes.pop()
+        if node.get('Node Type') == 'Seq Scan' and node.get('Relation Name') == 'observations':
+            scans.append(f"Seq Scan on observations {node.get('Alias', '')}".strip())
+        nodes.extend(node.get('Plans', []))
+    return scans
+
+
+def sqlite_seq_scans(connection, statement, parameters) -> List[str]:
+    names = observation_names(statement)
+    rows = connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+
+    scans = []
+    for row in rows:
+        detail = row[-1]
+        match = re.match(r'SCAN (?:TABLE )?(\w+)(.*)', detail)
+        if match and match.group(1) in names and 'USING' not in match.group(2):
+            scans.append(detail)
+    return scans
+
+
+def check_query_plans() -> List[Dict]:
+    """
+    EXPLAIN every DataService statement against the current database.
+    Each result has status 'ok', 'seq_scan', 'error' (EXPLAIN failed on Postgres,
+    so the statement itself is broken), 'exempt' (Postgres-only syntax such as
+    DISTINCT ON or ANY, not planned on the SQLite stand-in) or 'skipped' (EXPLAIN
+    failed on the SQLite stand-in for any other reason).
+    """
+    statements = capture_data_service_statements()
+    postgres = db.engine.dialect.name == 'postgresql'
+    explain = postgres_seq_scans if postgres else sqlite_seq_scans
+
+    results = []
+    for item in statements:
+        result = {'method': item['method'], 'statement': ' '.join(item['statement'].split())}
+        if not postgres and POSTGRES_ONLY.search(item['statement']):
+            result['status'] = 'exempt'
+            result['detail'] = ['Postgres-only syntax, planned only against Postgres']
+            results.append(result)
+            continue
+        with db.engine.connect() as connection:
+            transaction = connection.begin()
+            try:
+                scans = explain(connection, item['statement'], item['parameters'])
+                result['status'] = 'seq_scan' if scans else 'ok'
+                result['detail'] = scans
+            except Exception as e:
+                result['status'] = 'error' if postgres else 'skipped'
+                result['detail'] = [str(e).splitlines()[0]]
+            finally:
+                transaction.rollback()
+        results.append(result)
+    return results
+
+
+def sqlite_statements(ddl: str) -> List[str]:
+    """Split a Postgres DDL block into statements SQLite accepts"""
+    ddl = ddl.replace('DEFAULT now()', 'DEFAULT CURRENT_TIMESTAMP')
+    return [statement for statement in ddl.split(';') if statement.strip()]
+
+
+def code_point_order(left: str, right: str) -> int:
+    return (left > right) - (left < right)
+
+
+def register_sqlite_collations(dbapi_connection, connection_record):
+    # Postgres' COLLATE "C" sorts by code point; SQLite has no such collation built in
+    dbapi_connection.create_collation('C', code_point_order)
+
+
+def build_sqlite_standin() -> Flask:
+    """In-memory SQLite copy of the schema, rollup tables, indexes and CSV data"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+
+    csv_path = get_data_path()
+    with app.app_context():
+        event.listen(db.engine, 'connect', register_sqlite_collations)
+    with app.app_context(), db.engine.begin() as connection:
+        for query in CREATE_TABLE_QUERIES.values():
+            connection.exec_driver_sql(query)
+        # Empty rollups; capture seeds a row so the rollup-backed queries are reached
+        for ddl in (CREATE_DASHBOARD_SUMMARY_TABLE, CREATE_INDICATOR_AGGREGATE_TABLES, CREATE_DATA_GENERATION_TABLE):
+            for statement in sqlite_statements(ddl):
+                connection.exec_driver_sql(statement)
+        for table, filename in CSV_FILES.items():
+            df = prepare_frame(pd.read_csv(csv_path / filename, dtype=str), table)
+            # Keep the first row per key, like ON CONFLICT DO NOTHING
+            df = df.drop_duplicates(subset=df.columns[0])
+            df.to_sql(table, connection, if_exists='append', index=False)
+        for query in CREATE_INDEX_QUERIES:
+            connection.exec_driver_sql(query)
+        connection.exec_driver_sql("ANALYZE")
+    return app
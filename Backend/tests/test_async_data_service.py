@@ -0,0 +1,42 @@
+import asyncio
+import pytest
+from sqlalchemy import text
+from src.core.db import db
+from src.core.services.async_data_service import AsyncDataService, dispose_async_engine, get_async_engine
+from src.core.services.data_service import DataService
+
+
+def run(coroutine_function):
+    async def wrapper():
+        try:
+            return await coroutine_function()
+        finally:
+            await dispose_async_engine()
+    return asyncio.run(wrapper())
+
+
+@pytest.fixture
+def indicator_ids(postgres):
+    with db.engine.connect() as connection:
+        ids = connection.execute(text(
+            "SELECT indicator_id FROM indicator_series_summary ORDER BY indicator_id LIMIT 10"
+        )).scalars().all()
+    if not ids:
+        pytest.skip("test database has no rollups loaded")
+    return ids
+
+
+def test_async_reads_the_rollups(indicator_ids):
+    async def read():
+        async with get_async_engine().connect() as connection:
+            return await AsyncDataService.read_rollups(connection, {'indicator_id': indicator_ids[0]})
+    assert list(run(read)) == [indicator_ids[0]]
+
+
+@pytest.mark.parametrize('include_raw', [True, False])
+def test_async_matches_sync_payloads(indicator_ids, include_raw):
+    expected = [DataService.get_time_series_data(i, include_raw=include_raw) for i in indicator_ids]
+
+    async def read_all():
+        return [await AsyncDataService.get_time_series_data(i, include_raw=include_raw) for i in indicator_ids]
+    assert run(read_all) == expected
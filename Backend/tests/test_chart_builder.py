@@ -0,0 +1,133 @@
+import math
+import random
+from collections import defaultdict
+import pytest
+from src.core.services.chart_builder import ChartAccumulator, ChartBuilder, PIE_SLICES
+
+
+def observation(period, country, value, visual_id='v1'):
+    return {
+        'period': period,
+        'country': country,
+        'value': value,
+        'visual_id': visual_id,
+        'visual_type': f'type-{visual_id}',
+        'document_title': f'doc-{visual_id}',
+        'domain': 'Economics'
+    }
+
+
+def random_rows(count, seed=0):
+    rng = random.Random(seed)
+    periods = [str(year) for year in range(2000, 2012)] + ['', None]
+    countries = [f'Country {i}' for i in range(15)] + ['', None]
+    return [
+        observation(rng.choice(periods), rng.choice(countries), rng.uniform(-100, 100), f'v{rng.randrange(4)}')
+        for _ in range(count)
+    ]
+
+
+def reference_means(rows, key):
+    """Plain-Python group means, the behaviour the pandas builder must match"""
+    groups = defaultdict(list)
+    for row in rows:
+        group = key(row)
+        if group is not None:
+            groups[group].append(row['value'])
+    return {group: sum(values) / len(values) for group, values in sorted(groups.items())}
+
+
+def test_line_data_uses_true_means_for_many_duplicates():
+    rows = [observation('2020', 'DE', value) for value in (1.0, 2.0, 6.0)]
+    line_data = ChartBuilder.build(rows)['line_data']
+    # Pairwise averaging would give ((1 + 2) / 2 + 6) / 2 = 3.75
+    assert line_data == [{'year': '2020', 'DE': 3.0}]
+
+
+def test_build_matches_reference_means():
+    rows = random_rows(2000)
+    charts = ChartBuilder.build(rows)
+
+    present = lambda value: value not in (None, '')
+    line = reference_means(rows, lambda r: (r['period'], r['country'])
+                           if present(r['period']) and present(r['country']) else None)
+    expected_line = defaultdict(dict)
+    for (period, country), mean in line.items():
+        expected_line[period][country] = mean
+    assert [entry['year'] for entry in charts['line_data']] == sorted(expected_line)
+    for entry in charts['line_data']:
+        period = entry.pop('year')
+        assert entry == pytest.approx(expected_line[period])
+
+    bar = reference_means(rows, lambda r: r['country'] if present(r['country']) else None)
+    assert [item['country'] for item in charts['bar_data']] == list(bar)
+    assert [item['value'] for item in charts['bar_data']] == [round(mean, 2) for mean in bar.values()]
+    assert charts['countries'] == list(bar)
+    assert charts['years'] == sorted({r['period'] for r in rows if present(r['period'])})
+
+
+def test_pie_data_is_top_slices_by_magnitude_without_zeros():
+    rows = [observation('2020', f'C{i:02d}', value) for i, value in enumerate([5, -20, 0, 3, 1, -7, 9, 2, 4, 6, 8, 11])]
+    pie = ChartBuilder.build(rows)['pie_data']
+    assert len(pie) == PIE_SLICES
+    assert [slice_['value'] for slice_ in pie] == [20.0, 11.0, 9.0, 8.0, 7.0, 6.0, 5.0, 4.0, 3.0, 2.0]
+    assert pie[0]['name'] == 'C01'
+    assert all(slice_['value'] != 0 for slice_ in pie)
+
+
+def test_context_lists_each_visual_once_in_first_seen_order():
+    rows = [observation('2020', 'DE', 1.0, 'v2'), observation('2021', 'DE', 2.0, 'v1'),
+            observation('2022', 'DE', 3.0, 'v2'), observation('2022', 'FR', 3.0, '')]
+    assert ChartBuilder.build(rows)['context'] == [
+        {'visual_type': 'type-v2', 'document_title': 'doc-v2', 'domain': 'Economics'},
+        {'visual_type': 'type-v1', 'document_title': 'doc-v1', 'domain': 'Economics'}
+    ]
+
+
+def test_empty_input():
+    assert ChartBuilder.build([]) == {
+        'line_data': [], 'bar_data': [], 'pie_data': [], 'years': [], 'countries': [], 'context': []
+    }
+
+
+@pytest.mark.parametrize('rows, batch_size', [(200, 1), (1000, 7), (3000, 500), (3000, 5000)])
+def test_accumulator_matches_single_pass_build(rows, batch_size):
+    rows = random_rows(rows, seed=batch_size)
+    accumulator = ChartAccumulator()
+    for start in range(0, len(rows), batch_size):
+        accumulator.add(rows[start:start + batch_size])
+
+    expected = ChartBuilder.build(rows)
+    result = accumulator.result()
+    assert accumulator.row_count == len(rows)
+    for key in ('bar_data', 'years', 'countries', 'context'):
+        assert result[key] == expected[key]
+    assert result['pie_data'] == pytest.approx(expected['pie_data'])
+    assert len(result['line_data']) == len(expected['line_data'])
+    for got, want in zip(result['line_data'], expected['line_data']):
+        assert got == pytest.approx(want)
+
+
+def test_build_from_aggregates_matches_raw_build():
+    rows = random_rows(1500, seed=3)
+    expected = ChartBuilder.build(rows)
+
+    present = lambda value: value not in (None, '')
+    line_means = reference_means(rows, lambda r: (r['period'], r['country'])
+                                 if present(r['period']) and present(r['country']) else None)
+    bar_means = reference_means(rows, lambda r: r['country'] if present(r['country']) else None)
+    years = list({r['period'] for r in rows if present(r['period'])})
+    charts = ChartBuilder.build_from_aggregates(line_means, bar_means, years, expected['context'])
+
+    assert charts['years'] == expected['years']
+    assert charts['bar_data'] == expected['bar_data']
+    assert charts['pie_data'] == expected['pie_data']
+    assert charts['countries'] == expected['countries']
+    for got, want in zip(charts['line_data'], expected['line_data']):
+        assert got == pytest.approx(want)
+
+
+def test_infinite_values_do_not_break_the_build():
+    rows = [observation('2020', 'DE', math.inf), observation('2020', 'DE', 1.0), observation('2020', 'FR', 2.0)]
+    charts = ChartBuilder.build(rows)
+    assert charts['line_data'] == [{'year': '2020', 'DE': math.inf, 'FR': 2.0}]
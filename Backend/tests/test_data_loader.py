@@ -0,0 +1,54 @@
+import re
+from sqlalchemy import text
+from src.core.db import db
+from src.core.services.data_service import INDICATOR_INFO_QUERY, DataService
+from src.util.data_loader import (
+    CSV_FILES, REFRESH_DASHBOARD_SUMMARY, REFRESH_INDICATOR_AGGREGATES, SHADOW_SUFFIX,
+    load_csv_data, rollup_sources
+)
+
+
+def test_rollup_sources_use_shadows_only_for_reloaded_tables():
+    sources = rollup_sources({'observations': None})
+    assert sources == {
+        'documents': 'documents',
+        'indicators': 'indicators',
+        'visual_entities': 'visual_entities',
+        'observations': 'observations' + SHADOW_SUFFIX
+    }
+    assert rollup_sources() == {table: table for table in CSV_FILES}
+
+
+def test_rollups_read_only_the_given_sources():
+    sources = {table: table + SHADOW_SUFFIX for table in CSV_FILES}
+    for template in (REFRESH_DASHBOARD_SUMMARY, REFRESH_INDICATOR_AGGREGATES):
+        sql = template.format(**sources)
+        read = set(re.findall(r'\b(?:FROM|JOIN)\s+(\w+)', sql))
+        assert not read & set(CSV_FILES), read
+        assert read & set(sources.values())
+
+
+def test_reload_builds_rollups_matching_observations(postgres):
+    load_csv_data(incremental=False)
+    with db.engine.begin() as connection:
+        # Force a partial reload: observations from its shadow, the rest live
+        connection.execute(text("DELETE FROM load_manifest WHERE table_name = 'observations'"))
+    status = load_csv_data()
+    assert status['observations'] == 'loaded' and status['indicators'] == 'unchanged'
+
+    with db.engine.connect() as connection:
+        assert connection.execute(text("SELECT to_regclass('observations_shadow')")).scalar() is None
+        summary_total = connection.execute(text("SELECT total_observations FROM dashboard_summary")).scalar()
+        assert summary_total == connection.execute(text("SELECT COUNT(*) FROM observations")).scalar()
+        indicator_ids = connection.execute(text(
+            "SELECT DISTINCT o.indicator_id FROM observations o JOIN indicators i ON i.indicator_id = o.indicator_id "
+            "WHERE o.value_num IS NOT NULL ORDER BY o.indicator_id LIMIT 25"
+        )).scalars().all()
+        infos = [dict(connection.execute(text(INDICATOR_INFO_QUERY), {'indicator_id': i}).fetchone()._mapping)
+                 for i in indicator_ids]
+
+    for info in infos:
+        aggregates = DataService.get_time_series_aggregates(info['indicator_id'])
+        live = DataService.get_time_series_from_observations(info, include_raw=False)
+        for key in ('years', 'countries', 'bar_data', 'context'):
+            assert aggregates[key] == live[key], (info['indicator_id'], key)
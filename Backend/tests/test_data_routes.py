@@ -0,0 +1,31 @@
+import pytest
+from sqlalchemy import text
+from src.core.db import db
+
+
+@pytest.mark.parametrize('body', ['[1, 2]', '"ids"', 'null', '3', 'not json'])
+def test_batch_rejects_non_object_bodies(client, body):
+    response = client.post('/api/time-series/batch', data=body, content_type='application/json')
+    assert response.status_code == 400
+    assert response.get_json()['status'] == 'error'
+
+
+@pytest.mark.parametrize('payload', [
+    {}, {'indicator_ids': []}, {'indicator_ids': 'ind1'}, {'indicator_ids': [1]},
+    {'indicator_ids': ['ind1'], 'raw_data': 'no'}, {'indicator_ids': [f'ind{i}' for i in range(101)]}
+])
+def test_batch_validates_its_arguments(client, payload):
+    assert client.post('/api/time-series/batch', json=payload).status_code == 400
+
+
+def test_time_series_returns_raw_data_only_on_request(client, postgres):
+    with db.engine.connect() as connection:
+        indicator_id = connection.execute(text("SELECT indicator_id FROM indicator_series_summary LIMIT 1")).scalar()
+    if indicator_id is None:
+        pytest.skip("test database has no rollups loaded")
+
+    charts = client.get(f'/api/time-series/{indicator_id}').get_json()['data']
+    assert 'raw_data' not in charts and 'line_data' in charts
+    with_raw = client.get(f'/api/time-series/{indicator_id}?raw_data=true').get_json()['data']
+    assert isinstance(with_raw['raw_data'], list)
+    assert {key: value for key, value in with_raw.items() if key != 'raw_data'} == charts
@@ -0,0 +1,96 @@
+import threading
+import pytest
+from sqlalchemy import text
+from src.core.db import db
+from src.core.services.data_service import DataService
+from src.util.data_loader import load_csv_data
+
+
+def rollup_rows():
+    summaries = [
+        {'indicator_id': 'a', 'years': ['2021', '2020'], 'context': [], 'skipped_values': ['n/a']},
+        {'indicator_id': 'b', 'years': [], 'context': [], 'skipped_values': []}
+    ]
+    line_rows = [
+        {'indicator_id': 'a', 'period': '2020', 'country': 'DE', 'mean': 1.0},
+        {'indicator_id': 'a', 'period': '2021', 'country': 'DE', 'mean': 3.0},
+        {'indicator_id': 'c', 'period': '2020', 'country': 'FR', 'mean': 9.0}
+    ]
+    bar_rows = [
+        {'indicator_id': 'a', 'country': 'DE', 'mean': 2.0},
+        {'indicator_id': 'c', 'country': 'FR', 'mean': 9.0}
+    ]
+    return summaries, line_rows, bar_rows
+
+
+def test_group_rollups_partitions_rows_by_indicator():
+    rollups = DataService.group_rollups(*rollup_rows())
+    assert set(rollups) == {'a', 'b'}
+    assert [row['mean'] for row in rollups['a']['line_rows']] == [1.0, 3.0]
+    assert rollups['b'] == {'summary': rollup_rows()[0][1], 'line_rows': [], 'bar_rows': []}
+
+
+def test_assemble_time_series_prefers_the_rollup():
+    rollup = DataService.group_rollups(*rollup_rows())['a']
+    info = {'indicator_id': 'a'}
+    raw_rows = [{'period': '2020', 'country': 'DE', 'value': 1.0, 'visual_id': None}]
+
+    payload = DataService.assemble_time_series(info, rollup, raw_rows, [], include_raw=False)
+    assert payload['years'] == ['2020', '2021']
+    assert payload['bar_data'] == [{'country': 'DE', 'name': 'DE', 'value': 2.0}]
+    assert payload['skipped_values'] == ['n/a']
+    assert payload['indicator_info'] == info
+    assert 'raw_data' not in payload
+
+    payload = DataService.assemble_time_series(info, rollup, raw_rows, [], include_raw=True)
+    assert payload['raw_data'] == raw_rows
+
+
+def test_assemble_time_series_falls_back_to_raw_rows():
+    info = {'indicator_id': 'a'}
+    raw_rows = [{'period': '2020', 'country': 'DE', 'value': value, 'visual_id': None} for value in (1.0, 3.0)]
+    payload = DataService.assemble_time_series(info, None, raw_rows, ['x'], include_raw=False)
+    assert payload['line_data'] == [{'year': '2020', 'DE': 2.0}]
+    assert payload['skipped_values'] == ['x']
+    assert 'raw_data' not in payload
+
+
+@pytest.mark.parametrize('include_raw', [True, False])
+def test_batch_matches_single_reads(postgres, include_raw):
+    with db.engine.connect() as connection:
+        indicator_ids = connection.execute(text(
+            "SELECT indicator_id FROM indicators ORDER BY indicator_id LIMIT 20"
+        )).scalars().all()
+    if not indicator_ids:
+        pytest.skip("test database has no indicators loaded")
+
+    batch = DataService.get_time_series_batch(indicator_ids + ['missing-id'], include_raw=include_raw)
+    assert batch['missing'] == ['missing-id']
+    for indicator_id in indicator_ids:
+        assert batch['series'][indicator_id] == DataService.get_time_series_data(indicator_id, include_raw=include_raw)
+
+
+def test_reload_waits_for_a_pinned_time_series_read(postgres):
+    load_csv_data()
+    with db.engine.begin() as connection:
+        connection.execute(text("DELETE FROM load_manifest WHERE table_name = 'observations'"))
+    status = {}
+
+    def reload():
+        with postgres.app_context():
+            status.update(load_csv_data())
+
+    with db.engine.connect() as connection, connection.begin():
+        DataService.pin_time_series_tables(connection)
+        generation = connection.execute(text("SELECT generation FROM data_generation")).scalar()
+        loader = threading.Thread(target=reload)
+        loader.start()
+        loader.join(timeout=3)
+        # The swap needs the tables this read has pinned
+        assert loader.is_alive()
+        assert connection.execute(text("SELECT generation FROM data_generation")).scalar() == generation
+
+    loader.join(timeout=60)
+    assert not loader.is_alive() and status['observations'] == 'loaded'
+    with db.engine.connect() as connection:
+        assert connection.execute(text("SELECT generation FROM data_generation")).scalar() == generation + 1
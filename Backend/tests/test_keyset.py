@@ -0,0 +1,66 @@
+import pytest
+from sqlalchemy import create_engine, text
+from src.util.keyset import decode_cursor, encode_cursor, keyset_query, page_rows
+
+
+@pytest.mark.parametrize('values', [['Germany', 'ind00001'], ['', 'x'], ['ümlaut/+=', 3], [None]])
+def test_cursor_round_trip(values):
+    cursor = encode_cursor(values)
+    assert '=' not in cursor and '+' not in cursor and '/' not in cursor
+    assert decode_cursor(cursor, len(values)) == values
+
+
+@pytest.mark.parametrize('cursor', ['not a cursor!', encode_cursor(['a']), encode_cursor(['a', 'b', 'c']), 'e30', ''])
+def test_invalid_cursors_raise_value_error(cursor):
+    with pytest.raises(ValueError, match='Invalid cursor'):
+        decode_cursor(cursor, 2)
+
+
+def test_keyset_query_builds_filters_order_and_look_ahead():
+    sql, params = keyset_query(
+        "SELECT name, id FROM things", ["COALESCE(name, '')", "id"], ["kind = :kind"], {'kind': 'a'},
+        limit=10, after=encode_cursor(['b', 5])
+    )
+    assert sql == ("SELECT name, id FROM things\n"
+                   "WHERE kind = :kind\n"
+                   "AND (COALESCE(name, ''), id) > (:after_0, :after_1)\n"
+                   "ORDER BY COALESCE(name, ''), id\n"
+                   "LIMIT :limit")
+    assert params == {'kind': 'a', 'after_0': 'b', 'after_1': 5, 'limit': 11}
+
+
+def test_keyset_query_without_paging_is_unchanged_listing():
+    sql, params = keyset_query("SELECT id FROM things", ["id"], [], {}, limit=None, after=None, tiebreak=["rowid"])
+    assert sql == "SELECT id FROM things\nORDER BY id, rowid"
+    assert params == {}
+
+
+def test_page_rows_drops_the_look_ahead_row():
+    rows = [{'name': 'a', 'id': 1}, {'name': None, 'id': 2}, {'name': 'c', 'id': 3}]
+    page, cursor = page_rows(rows, ['name', 'id'], limit=2)
+    assert page == rows[:2]
+    assert decode_cursor(cursor, 2) == ['', 2]
+    assert page_rows(rows, ['name', 'id'], limit=3) == (rows, None)
+    assert page_rows(rows, ['name', 'id'], limit=None) == (rows, None)
+
+
+def test_paging_visits_every_row_once():
+    engine = create_engine('sqlite://')
+    names = ['b', None, 'a', 'b', '', 'c', None, 'a']
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE things (id INTEGER PRIMARY KEY, name TEXT)"))
+        connection.execute(text("INSERT INTO things (id, name) VALUES (:id, :name)"),
+                           [{'id': i, 'name': name} for i, name in enumerate(names)])
+
+    seen, after = [], None
+    with engine.connect() as connection:
+        while True:
+            sql, params = keyset_query("SELECT id, name FROM things", ["COALESCE(name, '')", "id"], [], {},
+                                       limit=3, after=after)
+            rows = [dict(row._mapping) for row in connection.execute(text(sql), params)]
+            page, after = page_rows(rows, ['name', 'id'], limit=3)
+            seen.extend(row['id'] for row in page)
+            if after is None:
+                break
+    expected = sorted(range(len(names)), key=lambda i: (names[i] or '', i))
+    assert seen == expected
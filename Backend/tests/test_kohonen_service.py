@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+from src.core.services.kohonen_service import KohonenService
+from src.core.services.som_registry import SomModelKey
+
+
+def matrix(rows):
+    return pd.DataFrame(rows, index=[f'C{i}' for i in range(len(rows))], columns=['a', 'b', 'c'], dtype=float)
+
+
+def snapshot(prepared):
+    pivot_df = prepared[3]
+    return pivot_df.values, [str(c) for c in prepared[1]], [str(i) for i in prepared[2]], pivot_df.attrs['missing']
+
+
+def test_warm_start_touches_only_countries_whose_raw_values_changed():
+    old_rows = [[1, np.nan, 3], [2, 5, 1], [3, 6, 2], [4, 7, 3], [5, 8, 4]]
+    # C4 changes indicator b, which moves the mean C0's gap was filled with
+    new_rows = old_rows[:4] + [[5, 80, 4], [6, 9, 5]]
+    old, new = KohonenService.prepare_som_matrix(matrix(old_rows)), KohonenService.prepare_som_matrix(matrix(new_rows))
+    assert new[3].loc['C0', 'b'] != old[3].loc['C0', 'b']
+
+    key = SomModelKey(generation=2, rows=2, cols=2, iterations=100, sigma=1.0, learning_rate=0.5, seed=0, refreshes=1)
+    base = (key._replace(generation=1, refreshes=0), np.random.default_rng(0).random((2, 2, 3)), snapshot(old))
+    _, report = KohonenService.warm_start_weights(new, key, base)
+
+    assert report['changed_countries'] == 2
+    assert [move['country'] for move in report['bmu_changes']] == ['C4', 'C5']
+    assert report['bmu_changes'][1]['from'] is None
+
+
+def test_warm_start_sees_a_filled_gap_that_gains_a_value():
+    old_rows = [[1, np.nan, 3], [2, 5, 1], [3, 6, 2], [4, 7, 3]]
+    new_rows = [[1, 6, 3]] + old_rows[1:]
+    old, new = KohonenService.prepare_som_matrix(matrix(old_rows)), KohonenService.prepare_som_matrix(matrix(new_rows))
+    # The reported value equals the old fill, but it is a real observation now
+    assert old[3].loc['C0', 'b'] == new[3].loc['C0', 'b'] == 6
+
+    key = SomModelKey(generation=2, rows=2, cols=2, iterations=100, sigma=1.0, learning_rate=0.5, seed=0, refreshes=1)
+    base = (key._replace(generation=1, refreshes=0), np.random.default_rng(0).random((2, 2, 3)), snapshot(old))
+    _, report = KohonenService.warm_start_weights(new, key, base)
+    assert [move['country'] for move in report['bmu_changes']] == ['C0']
+
+
+def test_indicators_held_only_by_dropped_countries_are_dropped_too():
+    # d is present for half the countries, but only for C3-C5, which hold one
+    # of the four indicators kept at first and are dropped; d must then go too
+    rows = pd.DataFrame(
+        [[1, 2, 3, np.nan], [2, 3, 1, np.nan], [3, 1, 2, np.nan],
+         [np.nan, np.nan, np.nan, 1], [np.nan, np.nan, np.nan, 2], [np.nan, np.nan, np.nan, 3]],
+        index=[f'C{i}' for i in range(6)], columns=['a', 'b', 'c', 'd']
+    )
+    normalized_data, countries, indicators, pivot_df = KohonenService.prepare_som_matrix(rows)
+
+    assert countries == ['C0', 'C1', 'C2']
+    assert indicators == ['a', 'b', 'c']
+    assert not np.isnan(normalized_data).any()
+    assert pivot_df.attrs['coverage']['dropped_indicators'] == ['d']
+    assert pivot_df.attrs['coverage']['dropped_countries'] == ['C3', 'C4', 'C5']
@@ -0,0 +1,64 @@
+import math
+import numpy as np
+import pytest
+from src.util.numeric_classifier import classify_many, is_numeric, parse_float
+from src.util.data_loader import parse_values
+
+MIXED_VALUES = [
+    '12', '-3.5', ' 4.25 ', '1e3', '1e400', '-1e400', '1_000', '١٢٣', '٣.٥', '+7', '.5',
+    '', '   ', None, np.nan, 'n/a', 'N/A', 'other', 'not available', 'Germany', 'nan', 'inf',
+    '-nan', '12%', '1,5', '3 000', 2.5, 7, '12', None
+]
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('12', 12.0),
+    (' 4.25 ', 4.25),
+    ('1_000', 1000.0),
+    ('١٢٣', 123.0),
+    ('1e400', math.inf),
+    (2.5, 2.5),
+    ('', None),
+    (None, None),
+    ('n/a', None),
+    ('Not Applicable', None),
+    ('Germany', None),
+    ('nan', None),
+    ('inf', None),
+    ('12%', None),
+    ('1,5', None),
+])
+def test_parse_float(value, expected):
+    assert parse_float(value) == expected
+    assert is_numeric(value) == (expected is not None)
+
+
+def test_parse_float_default():
+    assert parse_float('n/a', 0.0) == 0.0
+
+
+def test_classify_many_agrees_with_parse_float_row_by_row():
+    floats, mask = classify_many(MIXED_VALUES)
+    assert len(floats) == len(mask) == len(MIXED_VALUES)
+    for value, parsed, numeric in zip(MIXED_VALUES, floats, mask):
+        expected = parse_float(None if value is np.nan else value)
+        assert numeric == (expected is not None), value
+        if expected is not None:
+            assert parsed == expected or (math.isnan(parsed) and math.isnan(expected)), value
+        else:
+            assert math.isnan(parsed), value
+
+
+def test_classify_many_accepts_generators_and_empty_input():
+    floats, mask = classify_many(value for value in ['1', 'x'])
+    assert mask.tolist() == [True, False]
+    assert floats[0] == 1.0
+
+    floats, mask = classify_many([])
+    assert floats.shape == mask.shape == (0,)
+
+
+def test_parse_values_statuses():
+    value_num, value_status = parse_values(['1.5', '', None, 'n/a', '1_000'])
+    assert value_num.tolist() == [1.5, None, None, None, 1000.0]
+    assert value_status.tolist() == ['numeric', 'empty', 'empty', 'non_numeric', 'numeric']
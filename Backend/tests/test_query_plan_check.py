@@ -0,0 +1,46 @@
+import pytest
+from sqlalchemy import text
+from src.core.db import db
+from src.util.query_plan_check import (
+    POSTGRES_ONLY, build_sqlite_standin, capture_data_service_statements, check_query_plans
+)
+
+
+@pytest.fixture(scope='module')
+def standin():
+    app = build_sqlite_standin()
+    with app.app_context():
+        yield app
+
+
+def test_capture_reaches_streamed_and_rollup_queries(standin):
+    statements = capture_data_service_statements()
+    methods = {item['method'] for item in statements}
+    assert 'stream_time_series_data' in methods
+    rollup_tables = {'indicator_series_summary', 'indicator_period_country', 'indicator_country_stats'}
+    captured_tables = {table for item in statements for table in rollup_tables if table in item['statement']}
+    assert captured_tables == rollup_tables
+    assert all(item['statement'].lstrip().upper().startswith(('SELECT', 'WITH')) for item in statements)
+
+
+def test_capture_removes_its_seeded_rollup_rows(standin):
+    capture_data_service_statements()
+    with db.engine.connect() as connection:
+        assert connection.execute(text("SELECT COUNT(*) FROM indicator_series_summary")).scalar() == 0
+
+
+def test_sqlite_standin_plans_every_portable_statement(standin):
+    results = check_query_plans()
+    statuses = {result['status'] for result in results}
+    assert statuses <= {'ok', 'exempt'}, [r for r in results if r['status'] not in ('ok', 'exempt')]
+    assert all(POSTGRES_ONLY.search(r['statement']) for r in results if r['status'] == 'exempt')
+
+
+@pytest.mark.parametrize('statement, postgres_only', [
+    ("SELECT DISTINCT ON (COALESCE(i.name, '')) i.indicator_id FROM indicators i", True),
+    ("SELECT * FROM observations WHERE indicator_id = ANY(:ids)", True),
+    ("SELECT DISTINCT value FROM observations WHERE indicator_id = :id", False),
+    ("SELECT company FROM t WHERE many = 1", False),
+])
+def test_postgres_only_pattern(statement, postgres_only):
+    assert bool(POSTGRES_ONLY.search(statement)) == postgres_only
@@ -0,0 +1,118 @@
+import pytest
+from flask import Flask, jsonify
+from sqlalchemy import text
+from src.core.cache.response_cache import ResponseCache
+from src.core.db import db
+
+
+def set_generation(generation):
+    with db.engine.begin() as connection:
+        connection.execute(text("UPDATE data_generation SET generation = :generation WHERE id = 1"),
+                           {'generation': generation})
+
+
+@pytest.fixture
+def cache_app(tmp_path):
+    """Flask app with a cached view over a SQLite data_generation table"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'cache.db'}"
+    app.config['RESPONSE_CACHE_SIZE'] = 4
+    app.config['RESPONSE_CACHE_DIR'] = str(tmp_path / 'responses')
+    # Re-read the generation on every request
+    app.config['RESPONSE_CACHE_GENERATION_CHECK'] = 0
+    db.init_app(app)
+    cache = ResponseCache()
+    cache.init_app(app)
+    calls = []
+
+    @app.route('/value/<int:number>')
+    @cache.cached
+    def value(number):
+        calls.append(number)
+        if number == 99:
+            # A reload finishing while the response is being built
+            set_generation(cache._generation + 1)
+        if number == 404:
+            return jsonify({'status': 'error'}), 404
+        return jsonify({'status': 'success', 'number': number, 'calls': len(calls)})
+
+    with app.app_context():
+        with db.engine.begin() as connection:
+            connection.execute(text("CREATE TABLE data_generation (id INTEGER PRIMARY KEY, generation BIGINT NOT NULL)"))
+            connection.execute(text("INSERT INTO data_generation (id, generation) VALUES (1, 1)"))
+        app.cache, app.calls = cache, calls
+        yield app
+
+
+def test_second_request_is_served_from_cache(cache_app):
+    client = cache_app.test_client()
+    first = client.get('/value/1')
+    second = client.get('/value/1')
+    assert first.headers['X-Cache'] == 'MISS' and second.headers['X-Cache'] == 'HIT'
+    assert first.get_json() == second.get_json()
+    assert cache_app.calls == [1]
+
+
+def test_generation_bump_invalidates_entries(cache_app):
+    client = cache_app.test_client()
+    client.get('/value/1')
+    set_generation(2)
+    response = client.get('/value/1')
+    assert response.headers['X-Cache'] == 'MISS'
+    assert cache_app.calls == [1, 1]
+    assert cache_app.cache.stats()['generation'] == 2
+
+
+def test_generation_bump_prunes_disk_tier(cache_app, tmp_path):
+    client = cache_app.test_client()
+    client.get('/value/1')
+    assert [path.name[:2] for path in (tmp_path / 'responses').iterdir()] == ['1-']
+    set_generation(2)
+    client.get('/value/2')
+    names = [path.name for path in (tmp_path / 'responses').iterdir()]
+    assert names and all(name.startswith('2-') for name in names)
+
+
+def test_response_built_across_a_reload_is_not_stored(cache_app):
+    client = cache_app.test_client()
+    assert client.get('/value/99').headers['X-Cache'] == 'MISS'
+    assert client.get('/value/99').headers['X-Cache'] == 'MISS'
+    assert cache_app.calls == [99, 99]
+
+
+def test_set_refuses_a_stale_generation(cache_app):
+    cache = cache_app.cache
+    generation = cache.current_generation(force=True)
+    cache.set('key', (200, 'application/json', b'{}'), generation - 1)
+    assert cache.get('key', generation) is None
+    assert cache.stats()['stores'] == 0
+
+
+def test_disk_tier_is_shared_between_workers(cache_app):
+    cache_app.test_client().get('/value/3')
+    other_worker = ResponseCache()
+    other_worker.init_app(cache_app)
+    generation = other_worker.current_generation(force=True)
+    with cache_app.test_request_context('/value/3'):
+        key = ResponseCache.request_key()
+    status, mimetype, body = other_worker.get(key, generation)
+    assert status == 200 and b'"number":3' in body.replace(b' ', b'')
+    assert other_worker.stats()['disk_hits'] == 1
+
+
+def test_errors_are_not_cached(cache_app):
+    client = cache_app.test_client()
+    client.get('/value/404')
+    assert client.get('/value/404').headers['X-Cache'] == 'MISS'
+
+
+def test_memory_tier_evicts_least_recently_used(cache_app):
+    cache = cache_app.cache
+    cache.disk_path = None
+    client = cache_app.test_client()
+    for number in range(6):
+        client.get(f'/value/{number}')
+    stats = cache.stats()
+    assert stats['entries'] == 4 and stats['evictions'] == 2
+    assert client.get('/value/0').headers['X-Cache'] == 'MISS'
+    assert client.get('/value/5').headers['X-Cache'] == 'HIT'
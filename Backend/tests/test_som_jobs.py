@@ -0,0 +1,191 @@
+import subprocess
+import sys
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from src.core.cache import response_cache
+from src.core.services.kohonen_service import KohonenService
+from src.core.services.som_jobs import ACTIVE_STATUSES, JobQueueFull, SomJobQueue, som_jobs
+from src.core.services.som_registry import SomModelKey, som_registry
+
+DATA = np.random.default_rng(0).random((20, 3))
+
+
+def model_key(iterations=50, seed=0):
+    return SomModelKey(generation=1, rows=2, cols=2, iterations=iterations, sigma=1.0, learning_rate=0.5, seed=seed)
+
+
+def shutdown(queue):
+    if queue._executor is not None:
+        queue._executor.shutdown(wait=True, cancel_futures=True)
+
+
+@pytest.fixture
+def workers(app):
+    """Two job queues on one jobs directory, standing in for two web workers"""
+    queues = SomJobQueue(), SomJobQueue()
+    for queue in queues:
+        queue.init_app(app)
+    yield queues
+    for queue in queues:
+        shutdown(queue)
+    som_registry.clear()
+
+
+def wait_for(queue, job_id, timeout=120):
+    deadline = time.monotonic() + timeout
+    job = queue.get(job_id)
+    while job['status'] in ACTIVE_STATUSES:
+        assert time.monotonic() < deadline, job
+        time.sleep(0.1)
+        job = queue.get(job_id)
+    return job
+
+
+def test_job_is_visible_to_every_worker(workers):
+    first, second = workers
+    key = model_key()
+    job = first.submit(key, DATA)
+    assert job['status'] in ('queued', 'running')
+    assert second.get(job['job_id'])['model']['model_id'] == key.digest
+    assert [listed['job_id'] for listed in second.list_jobs()] == [job['job_id']]
+
+    finished = wait_for(second, job['job_id'])
+    assert finished['status'] == 'succeeded'
+    assert finished['progress']['done'] == finished['progress']['total'] == 50
+    assert second.job_key(job['job_id']) == key
+    assert som_registry.get(key).shape == (2, 2, 3)
+
+    # Cancelling a finished job changes nothing; resubmitting is served from the registry
+    assert second.cancel(job['job_id'])['status'] == 'succeeded'
+    assert second.submit(key, DATA)['status'] == 'succeeded'
+    assert second.stats()['jobs'] == {'succeeded': 2}
+
+
+def test_another_worker_can_cancel_a_job(workers):
+    first, second = workers
+    job = first.submit(model_key(iterations=1_000_000), DATA)
+    assert second.cancel(job['job_id'])['status'] == 'cancelling'
+    assert wait_for(first, job['job_id'])['status'] == 'cancelled'
+    assert second.get(job['job_id'])['status'] == 'cancelled'
+
+
+def test_pending_cap_covers_jobs_from_every_worker(workers):
+    first, second = workers
+    for queue in workers:
+        queue.max_pending = 1
+    job = first.submit(model_key(iterations=1_000_000), DATA)
+
+    # The same key joins the job; any other key is refused on either worker
+    assert second.submit(model_key(iterations=1_000_000), DATA)['job_id'] == job['job_id']
+    with pytest.raises(JobQueueFull):
+        second.submit(model_key(seed=1), DATA)
+    with pytest.raises(JobQueueFull):
+        first.submit_many([model_key(seed=2)], DATA)
+
+    first.cancel(job['job_id'])
+    assert wait_for(first, job['job_id'])['status'] == 'cancelled'
+    assert second.submit(model_key(seed=1), DATA)['status'] in ('queued', 'running')
+
+
+def test_submit_many_queues_only_missing_maps_or_nothing(workers):
+    first, second = workers
+    trained = model_key(seed=5)
+    som_registry.put(trained, np.zeros((2, 2, 3)))
+    running = first.submit(model_key(iterations=1_000_000), DATA)
+
+    for queue in workers:
+        queue.max_pending = 2
+    with pytest.raises(JobQueueFull):
+        second.submit_many([model_key(seed=1), model_key(seed=2)], DATA)
+    assert len(second.list_jobs()) == 1
+
+    jobs = second.submit_many([trained, model_key(iterations=1_000_000), model_key(iterations=1_000_000, seed=1)], DATA)
+    assert [job['model']['seed'] for job in jobs] == [0, 1]
+    assert jobs[0]['job_id'] == running['job_id']
+    for job in jobs:
+        second.cancel(job['job_id'])
+        assert wait_for(second, job['job_id'])['status'] == 'cancelled'
+    assert second.submit_many([trained], DATA) == []
+
+
+def test_job_of_an_exited_worker_is_reported_failed(workers):
+    first, second = workers
+    exited = subprocess.Popen([sys.executable, '-c', 'pass'])
+    exited.wait()
+    job = second._new_job(model_key())
+    job['owner'] = exited.pid
+    second._save(job)
+
+    orphan = first.get(job['job_id'])
+    assert orphan['status'] == 'failed'
+    assert 'exited' in orphan['error']
+    assert first.stats()['jobs'] == {'failed': 1}
+
+
+def test_unknown_and_malformed_job_ids(workers):
+    first, _ = workers
+    assert first.get('0' * 32) is None
+    assert first.get('../jobs') is None
+    assert first.cancel('0' * 32) is None
+
+
+@pytest.fixture
+def som_app(app):
+    """The app with a small synthetic SOM dataset registered for the current data generation"""
+    rng = np.random.default_rng(1)
+    matrix = pd.DataFrame(rng.random((12, 4)), index=[f'C{i}' for i in range(12)], columns=list('abcd'))
+    with app.app_context():
+        som_registry.dataset(response_cache.current_generation(), lambda: KohonenService.prepare_som_matrix(matrix))
+    yield app
+    shutdown(som_jobs)
+    som_jobs._executor = None
+    som_registry.clear()
+
+
+def test_job_endpoints_submit_status_result_cancel(som_app):
+    client = som_app.test_client()
+    body = {"map_size": [2, 2], "iterations": 20}
+
+    response = client.post("/api/kohonen/jobs", json=body)
+    assert response.status_code == 202
+    job_id = response.get_json()["job"]["job_id"]
+    assert client.get(f"/api/kohonen/jobs/{job_id}").get_json()["job"]["job_id"] == job_id
+
+    assert wait_for(som_jobs, job_id)["status"] == "succeeded"
+    result = client.get(f"/api/kohonen/jobs/{job_id}/result")
+    assert result.status_code == 200
+    assert result.get_json()["data"]["model"]["model_id"] == som_jobs.job_key(job_id).digest
+
+    response = client.post("/api/kohonen/jobs", json={"map_size": [2, 2], "iterations": 100000})
+    job_id = response.get_json()["job"]["job_id"]
+    assert client.delete(f"/api/kohonen/jobs/{job_id}").get_json()["job"]["status"] in ("cancelled", "cancelling")
+    assert wait_for(som_jobs, job_id)["status"] == "cancelled"
+    assert client.get(f"/api/kohonen/jobs/{job_id}/result").status_code == 409
+    assert client.get(f"/api/kohonen/jobs/{'0' * 32}").status_code == 404
+
+
+def test_job_endpoint_is_busy_at_the_pending_cap(som_app, monkeypatch):
+    monkeypatch.setattr(som_jobs, 'max_pending', 0)
+    response = som_app.test_client().post("/api/kohonen/jobs", json={"map_size": [2, 2], "iterations": 20})
+    assert response.status_code == 429
+
+
+def test_ensemble_endpoint_queues_members_then_serves_the_result(som_app):
+    client = som_app.test_client()
+    url = "/api/kohonen/ensemble?rows=2&cols=2&iterations=20&models=3"
+
+    response = client.get(url)
+    assert response.status_code == 202
+    jobs = response.get_json()["jobs"]
+    assert sorted(job["model"]["seed"] for job in jobs) == [42, 43, 44]
+    assert [job["job_id"] for job in client.get(url).get_json()["jobs"]] == [job["job_id"] for job in jobs]
+
+    for job in jobs:
+        assert wait_for(som_jobs, job["job_id"])["status"] == "succeeded"
+    response = client.get(url)
+    assert response.status_code == 200
+    ensemble = response.get_json()["data"]["ensemble"]
+    assert [member["seed"] for member in ensemble["members"]] == [42, 43, 44]
+    assert len(ensemble["co_clustering"]) == len(ensemble["countries"]) == 12
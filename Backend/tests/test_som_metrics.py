@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from minisom import MiniSom
+from src.core.services.som_metrics import cluster_stability, co_clustering, neuron_distances, som_metrics
+
+
+def reference_metrics(som, data):
+    """The per-sample loops calculate_som_quality_metrics used before som_metrics"""
+    weights = som.get_weights()
+    topographic_error = 0.0
+    hit_map = np.zeros(weights.shape[:2])
+    for point in data:
+        winner = som.winner(point)
+        hit_map[winner] += 1
+        distances = [((i, j), np.linalg.norm(point - weights[i, j]))
+                     for i in range(weights.shape[0]) for j in range(weights.shape[1]) if (i, j) != winner]
+        if distances:
+            second = min(distances, key=lambda item: item[1])[0]
+            if abs(winner[0] - second[0]) + abs(winner[1] - second[1]) > 1:
+                topographic_error += 1
+    return {
+        'bmu': np.array([som.winner(point) for point in data]),
+        'hit_map': hit_map,
+        'quantization_error': som.quantization_error(data),
+        'topographic_error': topographic_error / len(data)
+    }
+
+
+@pytest.mark.parametrize('rows, cols, samples, features', [(6, 5, 40, 7), (10, 10, 120, 12), (1, 4, 15, 3)])
+def test_som_metrics_match_the_loop_reference(rows, cols, samples, features):
+    rng = np.random.default_rng(rows * cols)
+    data = rng.normal(size=(samples, features))
+    som = MiniSom(rows, cols, features, sigma=1.0, learning_rate=0.5, random_seed=1)
+    som.train_random(data, 200)
+
+    metrics = som_metrics(som.get_weights(), data)
+    expected = reference_metrics(som, data)
+    assert np.array_equal(metrics['bmu'], expected['bmu'])
+    assert np.array_equal(metrics['bmu_index'], np.ravel_multi_index(expected['bmu'].T, (rows, cols)))
+    assert np.array_equal(metrics['hit_map'], expected['hit_map'])
+    assert metrics['quantization_error'] == pytest.approx(expected['quantization_error'], rel=1e-12)
+    assert metrics['topographic_error'] == expected['topographic_error']
+
+
+def test_neuron_distances_match_norms_and_never_go_negative():
+    rng = np.random.default_rng(0)
+    weights = rng.normal(size=(3, 4, 5))
+    data = np.vstack([rng.normal(size=(6, 5)), weights[1, 2]])
+    distances = neuron_distances(weights, data)
+    expected = np.linalg.norm(data[:, None, :] - weights.reshape(-1, 5)[None, :, :], axis=2)
+    assert distances.shape == (7, 12)
+    assert np.allclose(distances, expected)
+    assert distances.min() >= 0.0 and distances[-1, 1 * 4 + 2] == pytest.approx(0.0, abs=1e-6)
+
+
+def test_som_metrics_edge_cases():
+    weights = np.zeros((2, 3, 4))
+    empty = som_metrics(weights, np.zeros((0, 4)))
+    assert empty['hit_map'].shape == (2, 3) and empty['quantization_error'] == 0.0
+
+    single = som_metrics(np.zeros((1, 1, 2)), np.array([[3.0, 4.0]]))
+    assert single['quantization_error'] == pytest.approx(5.0)
+    assert single['topographic_error'] == 0.0 and single['hit_map'].tolist() == [[1.0]]
+
+
+def test_co_clustering_and_stability():
+    labels = np.array([[0, 0, 1], [0, 0, 2], [3, 4, 5]])
+    together = co_clustering(labels)
+    assert np.allclose(together, [[1, 2 / 3, 0], [2 / 3, 1, 0], [0, 0, 1]])
+
+    stability = cluster_stability(together)
+    # Samples 0 and 1 share a unit on two of three maps; sample 2 is always alone
+    assert stability.tolist() == pytest.approx([2 / 3, 2 / 3, 1.0])
+    assert cluster_stability(co_clustering(np.array([[0, 0], [1, 1]]))).tolist() == [1.0, 1.0]
@@ -0,0 +1,110 @@
+import os
+import threading
+import time
+import numpy as np
+import pytest
+from flask import Flask
+from src.core.services.som_registry import SomModelKey, SomRegistry
+
+
+@pytest.fixture
+def registry(tmp_path):
+    app = Flask(__name__)
+    app.config['SOM_MODEL_DIR'] = str(tmp_path / 'som_models')
+    registry = SomRegistry()
+    registry.init_app(app)
+    return registry
+
+
+def model_key(generation, seed=0):
+    return SomModelKey(generation=generation, rows=2, cols=2, iterations=10, sigma=1.0, learning_rate=0.5, seed=seed)
+
+
+def weights(value=0.0):
+    return np.full((2, 2, 3), value)
+
+
+def test_prune_keeps_previous_and_newer_generations(registry):
+    for generation in (1, 2, 3, 5):
+        registry.put(model_key(generation), weights(generation))
+
+    # A worker still on generation 3 must not delete generation 5, which a
+    # faster worker has already moved to, nor the warm-start base 2
+    registry.dataset(3, lambda: 'dataset')
+    assert registry._generations_on_disk() == [2, 3, 5]
+    assert registry.previous_generation(3) == 2
+    assert {key.generation for key in registry._models} == {3, 5}
+    assert registry.get(model_key(5))[0, 0, 0] == 5
+
+
+def test_dataset_is_built_once_per_generation(registry):
+    calls = []
+    assert registry.dataset(1, lambda: calls.append(1) or 'one') == 'one'
+    assert registry.dataset(1, lambda: calls.append(1) or 'again') == 'one'
+    assert registry.dataset(2, lambda: calls.append(2) or 'two') == 'two'
+    assert calls == [1, 2]
+
+
+def test_failed_training_releases_its_lock(registry):
+    key = model_key(1)
+
+    def fail():
+        raise RuntimeError("training failed")
+
+    with pytest.raises(RuntimeError):
+        registry.get_or_train(key, fail)
+    assert registry._train_locks == {}
+
+    trained_weights, trained = registry.get_or_train(key, lambda: weights(1.0))
+    assert trained and trained_weights[0, 0, 0] == 1.0
+    assert registry._train_locks == {}
+
+
+def test_concurrent_requests_share_one_training(registry):
+    key = model_key(1)
+    runs = []
+
+    def train():
+        runs.append(1)
+        time.sleep(0.2)
+        return weights(2.0)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get_or_train(key, train))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(runs) == 1
+    assert sorted(trained for _, trained in results) == [False, False, False, True]
+    assert registry._train_locks == {}
+
+
+def test_models_survive_in_the_disk_tier(registry, tmp_path):
+    registry.put(model_key(1, seed=7), weights(3.0))
+    other_worker = SomRegistry()
+    other_worker.model_dir = registry.model_dir
+    assert other_worker.get(model_key(1, seed=7))[1, 1, 2] == 3.0
+    assert other_worker.get(model_key(1, seed=8)) is None
+
+
+def test_clear_removes_every_generation(registry):
+    registry.put(model_key(1), weights())
+    registry.put(model_key(2), weights())
+    registry.clear()
+    assert registry._generations_on_disk() == []
+    assert registry.get(model_key(2)) is None
+
+
+def test_snapshot_keeps_the_missing_value_mask(registry):
+    values = np.arange(6, dtype=float).reshape(2, 3)
+    missing = np.array([[False, True, False], [False, False, False]])
+    registry.save_snapshot(1, values, ['A', 'B'], ['x', 'y', 'z'], missing)
+
+    loaded_values, countries, indicators, loaded_missing = registry.load_snapshot(1)
+    assert np.array_equal(loaded_values, values) and np.array_equal(loaded_missing, missing)
+    assert (countries, indicators) == (['A', 'B'], ['x', 'y', 'z'])
+
+    # Snapshots written without a mask are not used for diffs
+    os.remove(os.path.join(registry._generation_dir(1), 'missing.npy'))
+    assert registry.load_snapshot(1) is None